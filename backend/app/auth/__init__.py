@@ -7,12 +7,15 @@ from app.auth.jwt import (
     create_access_token,
     create_refresh_token,
     verify_token,
+    verify_token_cached,
     decode_token,
     create_verification_token,
     verify_password,
     get_password_hash,
 )
 from app.auth.dependencies import (
+    MemberContext,
+    get_current_member,
     get_current_user,
     get_current_active_user,
     require_roles,
@@ -23,10 +26,13 @@ __all__ = [
     "create_access_token",
     "create_refresh_token",
     "verify_token",
+    "verify_token_cached",
     "decode_token",
     "create_verification_token",
     "verify_password",
     "get_password_hash",
+    "MemberContext",
+    "get_current_member",
     "get_current_user",
     "get_current_active_user",
     "require_roles",
@@ -3,15 +3,22 @@ Authentication Dependencies
 FastAPI dependencies for authentication and authorization
 """
 
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
 from typing import Optional
+from uuid import UUID
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from uuid import UUID
 
 from app.database import get_db
-from app.models import User, UserRole, Role
-from app.auth.jwt import verify_token
+from app.models import Miembro, User, UserRole, Role
+from app.auth.jwt import verify_token_cached
+from app.auth.token_store import revocation_list
+from app.utils.query_cache import query_cache
 from app.exceptions import (
     AuthenticationError,
     InvalidTokenError,
@@ -23,6 +30,46 @@ from app.exceptions import (
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
+@dataclass(frozen=True, slots=True)
+class MemberContext:
+    """Authenticated member (miembro and its user), detached from the session."""
+    id: UUID
+    user_id: UUID
+    email: str
+    nombre: str
+    voz: str
+    fecha_ingreso: date
+    estado: str
+    telefono: Optional[str]
+    saldo_actual: Decimal
+
+
+def _authenticated_user_id(token: str, db: Session) -> UUID:
+    """
+    Verify an access token and check its family against the revocation list.
+
+    Raises:
+        AuthenticationError: If the token is invalid or revoked
+    """
+    credentials_exception = AuthenticationError("Could not validate credentials")
+    
+    try:
+        verified = verify_token_cached(token, token_type="access")
+    except (InvalidTokenError, Exception):
+        raise credentials_exception
+    
+    # Subject UUID is parsed once per token and cached with it
+    token_user_id = verified.subject_uuid
+    if token_user_id is None:
+        raise AuthenticationError("Invalid token")
+    
+    # In-memory denylist check; syncs from the DB at most every REVOCATION_SYNC_SECONDS
+    revocation_list.maybe_sync(db)
+    if revocation_list.is_revoked(verified.payload.get("fam")):
+        raise AuthenticationError("Token has been revoked")
+    return token_user_id
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
@@ -41,18 +88,7 @@ def get_current_user(
         AuthenticationError: If token is invalid
         UserNotFoundError: If user doesn't exist
     """
-    credentials_exception = AuthenticationError("Could not validate credentials")
-    
-    try:
-        token_data = verify_token(token, token_type="access")
-    except (InvalidTokenError, Exception):
-        raise credentials_exception
-    
-    # Convert token user_id string to UUID for querying
-    try:
-        token_user_id = UUID(token_data.user_id)
-    except (ValueError, TypeError):
-        raise AuthenticationError("Invalid token")
+    token_user_id = _authenticated_user_id(token, db)
     user = db.query(User).filter(User.id == token_user_id).first()
     
     if user is None:
@@ -61,6 +97,54 @@ def get_current_user(
     return user
 
 
+def get_current_member(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> MemberContext:
+    """
+    Get the authenticated member for corista zone endpoints.
+    
+    Loads the user and its miembro in one joined query, selecting only the
+    columns the context needs.
+    
+    Args:
+        token: JWT access token
+        db: Database session
+    
+    Returns:
+        Immutable MemberContext
+    
+    Raises:
+        AuthenticationError: If token is invalid
+        UserNotFoundError: If user doesn't exist
+        HTTPException: 404 if the user has no member profile
+    """
+    token_user_id = _authenticated_user_id(token, db)
+    row = (
+        db.query(
+            User.id.label("user_id"),
+            User.email,
+            User.nombre,
+            Miembro.id,
+            Miembro.voz,
+            Miembro.fecha_ingreso,
+            Miembro.estado,
+            Miembro.telefono,
+            Miembro.saldo_actual,
+        )
+        .outerjoin(Miembro, Miembro.user_id == User.id)
+        .filter(User.id == token_user_id)
+        .first()
+    )
+    
+    if row is None:
+        raise UserNotFoundError("User not found")
+    if row.id is None:
+        raise HTTPException(status_code=404, detail="Member profile not found")
+    
+    return MemberContext(**row._asdict())
+
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -102,6 +186,25 @@ def get_user_roles(user: User, db: Session) -> list[str]:
     return [role.nombre for role in user_roles]
 
 
+# Roles are seeded once; any commit that writes them drops the cached rows
+ROLE_CACHE_TTL_SECONDS = 3600
+
+
+def get_role_by_name(db: Session, nombre: str) -> Optional[Role]:
+    """
+    Look up a role by name through the query cache.
+
+    Args:
+        db: Database session (the role is merged into it)
+        nombre: Role name
+
+    Returns:
+        The role, or None if it doesn't exist
+    """
+    statement = select(Role).where(Role.nombre == nombre)
+    return query_cache.execute(db, statement, ttl=ROLE_CACHE_TTL_SECONDS).scalars().first()
+
+
 def require_roles(required_roles: list[str]):
     """
     Dependency factory that checks if user has required roles.
@@ -153,10 +256,9 @@ def get_optional_user(
         return None
     
     try:
-        token_data = verify_token(token, token_type="access")
-        try:
-            token_user_id = UUID(token_data.user_id)
-        except (ValueError, TypeError):
+        verified = verify_token_cached(token, token_type="access")
+        token_user_id = verified.subject_uuid
+        if token_user_id is None or revocation_list.is_revoked(verified.payload.get("fam")):
             return None
         user = db.query(User).filter(User.id == token_user_id).first()
         return user
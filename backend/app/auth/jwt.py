@@ -1,10 +1,20 @@
 """
 JWT Token Handling
-Token generation, validation, and decoding using python-jose
+Token generation, validation, and decoding.
+
+Signing and verification go through a pluggable backend (python-jose by
+default, PyJWT when ``JWT_BACKEND=pyjwt``). Verified tokens are kept in a
+bounded LRU keyed by the token digest until their ``exp``, so a token
+presented on every request is only HMAC-checked once.
 """
 
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
+from uuid import UUID
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
@@ -12,7 +22,156 @@ from app.config import settings
 from app.schemas import TokenData
 from app.exceptions import InvalidTokenError, TokenExpiredError
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max rounds pinned to the configured cost so verify_and_update
+# flags hashes created with any other cost for rehashing.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+
+class JoseBackend:
+    """python-jose backend (reference implementation)."""
+
+    name = "jose"
+
+    def __init__(self, secret_key: str, algorithm: str):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.algorithms = [algorithm]
+
+    def encode(self, payload: dict) -> str:
+        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return jwt.decode(token, self.secret_key, algorithms=self.algorithms)
+        except jwt.ExpiredSignatureError:
+            raise TokenExpiredError()
+        except JWTError as e:
+            raise InvalidTokenError(f"Invalid token: {str(e)}")
+
+
+class PyJWTBackend:
+    """PyJWT backend with the key and decode options prepared once."""
+
+    name = "pyjwt"
+
+    def __init__(self, secret_key: str, algorithm: str):
+        import jwt as pyjwt
+
+        self._pyjwt = pyjwt
+        self._jwt = pyjwt.PyJWT()
+        self.secret_key = secret_key.encode("utf-8")
+        self.algorithm = algorithm
+        self.algorithms = [algorithm]
+
+    def encode(self, payload: dict) -> str:
+        return self._jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return self._jwt.decode(token, self.secret_key, algorithms=self.algorithms)
+        except self._pyjwt.ExpiredSignatureError:
+            raise TokenExpiredError()
+        except self._pyjwt.PyJWTError as e:
+            raise InvalidTokenError(f"Invalid token: {str(e)}")
+
+
+JWT_BACKENDS = {
+    JoseBackend.name: JoseBackend,
+    PyJWTBackend.name: PyJWTBackend,
+}
+
+
+def get_jwt_backend(name: Optional[str] = None):
+    """Instantiate a JWT backend by name (defaults to settings.JWT_BACKEND)."""
+    name = (name or settings.JWT_BACKEND).lower()
+    try:
+        backend_cls = JWT_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown JWT backend: {name}")
+    return backend_cls(settings.SECRET_KEY, settings.ALGORITHM)
+
+
+jwt_backend = get_jwt_backend()
+
+
+class VerifiedToken:
+    """A verified token's claims plus the parsed subject UUID (if any)."""
+
+    __slots__ = ("token_data", "subject_uuid", "expires_at", "payload")
+
+    def __init__(self, token_data: TokenData, payload: dict):
+        self.token_data = token_data
+        self.payload = payload
+        self.expires_at = float(payload.get("exp", 0))
+        try:
+            self.subject_uuid = UUID(token_data.user_id)
+        except (ValueError, TypeError):
+            self.subject_uuid = None
+
+
+class TokenCache:
+    """
+    Bounded, thread-safe LRU of verified tokens.
+
+    Keys are SHA-256 digests of the raw token, so the cache never holds
+    bearer tokens in memory. Entries are dropped once the token expires.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, VerifiedToken] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[VerifiedToken]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: bytes, entry: VerifiedToken) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: bytes) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache(maxsize=settings.JWT_CACHE_SIZE)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -48,12 +207,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         "iat": datetime.utcnow(),
     })
     
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
-    )
-    return encoded_jwt
+    return jwt_backend.encode(to_encode)
 
 
 def create_refresh_token(data: dict) -> str:
@@ -75,12 +229,7 @@ def create_refresh_token(data: dict) -> str:
         "iat": datetime.utcnow(),
     })
     
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
-    )
-    return encoded_jwt
+    return jwt_backend.encode(to_encode)
 
 
 def create_verification_token(email: str, hours: int = 24) -> str:
@@ -103,38 +252,28 @@ def create_verification_token(email: str, hours: int = 24) -> str:
         "iat": datetime.utcnow(),
     }
     
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
-    )
-    return encoded_jwt
+    return jwt_backend.encode(to_encode)
 
 
-def verify_token(token: str, token_type: str = "access") -> TokenData:
+def verify_token_cached(token: str, token_type: str = "access") -> VerifiedToken:
     """
-    Verify and decode a JWT token.
+    Verify a JWT token, consulting the verified-token cache first.
     
     Args:
         token: JWT token string to verify
         token_type: Expected token type (access, refresh, verification)
     
     Returns:
-        TokenData with user_id and roles
+        VerifiedToken with the claims and the parsed subject UUID
     
     Raises:
         InvalidTokenError: If token is invalid or wrong type
         TokenExpiredError: If token has expired
     """
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
-        
-        if payload.get("type") != token_type:
-            raise InvalidTokenError(f"Invalid token type. Expected {token_type}")
+    key = TokenCache.key(token)
+    entry = token_cache.get(key)
+    if entry is None:
+        payload = jwt_backend.decode(token)
         
         user_id: str = payload.get("sub")
         roles: list = payload.get("roles", [])
@@ -142,12 +281,31 @@ def verify_token(token: str, token_type: str = "access") -> TokenData:
         if user_id is None:
             raise InvalidTokenError("Token missing user identifier")
         
-        return TokenData(user_id=user_id, roles=roles)
+        entry = VerifiedToken(TokenData(user_id=user_id, roles=roles), payload)
+        token_cache.set(key, entry)
+    
+    if entry.payload.get("type") != token_type:
+        raise InvalidTokenError(f"Invalid token type. Expected {token_type}")
     
-    except jwt.ExpiredSignatureError:
-        raise TokenExpiredError()
-    except JWTError as e:
-        raise InvalidTokenError(f"Invalid token: {str(e)}")
+    return entry
+
+
+def verify_token(token: str, token_type: str = "access") -> TokenData:
+    """
+    Verify and decode a JWT token.
+    
+    Args:
+        token: JWT token string to verify
+        token_type: Expected token type (access, refresh, verification)
+    
+    Returns:
+        TokenData with user_id and roles
+    
+    Raises:
+        InvalidTokenError: If token is invalid or wrong type
+        TokenExpiredError: If token has expired
+    """
+    return verify_token_cached(token, token_type).token_data
 
 
 def decode_token(token: str) -> dict:
@@ -165,11 +323,6 @@ def decode_token(token: str) -> dict:
         InvalidTokenError: If token cannot be decoded
     """
     try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
-        return payload
-    except JWTError as e:
-        raise InvalidTokenError(f"Invalid token: {str(e)}")
+        return jwt_backend.decode(token)
+    except TokenExpiredError as e:
+        raise InvalidTokenError(f"Invalid token: {e.message}")
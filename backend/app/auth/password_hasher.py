@@ -0,0 +1,114 @@
+"""
+Password Hasher
+Runs bcrypt hashing and verification on a dedicated, bounded executor.
+
+bcrypt costs tens of milliseconds of CPU per call. Running it on the
+shared request threadpool lets a burst of logins starve every other sync
+endpoint, so hashing gets its own small pool with a bounded backlog and
+queue-time metrics.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from app.auth.jwt import pwd_context
+from app.config import settings
+from app.exceptions import ServiceBusyError
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Bounded executor for password hashing with queue-time metrics."""
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._queue_ms_total = 0.0
+        self._queue_ms_max = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="password-hasher",
+                    )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_queue_ms": round(self._queue_ms_total / self._completed, 2) if self._completed else 0.0,
+                "max_queue_ms": round(self._queue_ms_max, 2),
+            }
+
+    async def _submit(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise ServiceBusyError("Too many concurrent authentication requests, retry shortly")
+            self._pending += 1
+        enqueued = time.perf_counter()
+
+        def run():
+            queue_ms = (time.perf_counter() - enqueued) * 1000
+            with self._lock:
+                self._running += 1
+                self._queue_ms_total += queue_ms
+                self._queue_ms_max = max(self._queue_ms_max, queue_ms)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self._completed += 1
+
+        # Counters are released by the job itself, so a cancelled await
+        # cannot leak a pending slot.
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, run)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password at the configured bcrypt cost."""
+        return await self._submit(pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash."""
+        return await self._submit(pwd_context.verify, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """
+        Verify a password and, if the hash uses an outdated cost,
+        return a replacement hash computed with the configured cost.
+        """
+        return await self._submit(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,182 @@
+"""
+Login Throttle
+Sliding-window limiter for failed login attempts.
+
+Checked before any password hashing so a credential-stuffing burst is
+rejected without spending bcrypt CPU. Limits apply per client IP and per
+email; the IP limit is generous because a whole choir often logs in from
+the same rehearsal-room network. Behind a reverse proxy the client IP is
+taken from X-Forwarded-For (see ``client_ip``).
+
+Failures are counted in the host's shared limiter store when it is
+enabled. The limits then hold across all workers on the host, instead of
+multiplying with the worker count. That store never evicts live counters,
+so cache churn cannot reset a limit. Otherwise each worker counts in
+memory. With the shared store every call is blocking file I/O; async
+callers run them in the threadpool.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from fastapi import Request
+
+from app.config import settings
+from app.exceptions import TooManyRequestsError
+from app.utils.shared_cache import SharedCache, shared_limits
+
+
+def client_ip(request: Request, trusted_hops: Optional[int] = None) -> Optional[str]:
+    """
+    The client's IP address as seen by the outermost trusted proxy.
+
+    Each of the ``TRUSTED_PROXY_HOPS`` proxies in front of the app appends
+    the address it received the request from to X-Forwarded-For, so the
+    entry that many places from the right is the client. Entries further
+    left are supplied by the client and ignored, so they cannot be used to
+    dodge the per-IP limit.
+    """
+    trusted_hops = settings.TRUSTED_PROXY_HOPS if trusted_hops is None else trusted_hops
+    peer = request.client.host if request.client else None
+    header = request.headers.get("x-forwarded-for")
+    if trusted_hops <= 0 or not header:
+        return peer
+    hosts = [host.strip() for host in header.split(",") if host.strip()]
+    if len(hosts) < trusted_hops:
+        return peer
+    return hosts[-trusted_hops]
+
+
+class SlidingWindowCounter:
+    """Counts events per key over the last ``window_seconds``."""
+
+    def __init__(
+        self,
+        limit: int,
+        window_seconds: float,
+        max_keys: int = 10000,
+        store: Optional[SharedCache] = None,
+        namespace: str = "",
+    ):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self.store = store
+        self.namespace = namespace
+        self._events: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self) -> bool:
+        return self.store is not None and self.store.enabled
+
+    def _shared_events(self, value: Optional[bytes], now: float) -> list[float]:
+        """Wall-clock event times (shared across processes) still in the window."""
+        cutoff = now - self.window_seconds
+        return [at for at in json.loads(value) if at > cutoff] if value else []
+
+    def _prune(self, key: str, now: float) -> Optional[deque]:
+        events = self._events.get(key)
+        if events is None:
+            return None
+        cutoff = now - self.window_seconds
+        while events and events[0] <= cutoff:
+            events.popleft()
+        if not events:
+            del self._events[key]
+            return None
+        return events
+
+    def retry_after(self, key: str) -> Optional[float]:
+        """Seconds until ``key`` is below the limit, or None if it is allowed."""
+        if self.shared:
+            now = time.time()
+            events = self._shared_events(self.store.get(self.namespace + key), now)
+            if len(events) < self.limit:
+                return None
+            return max(events[0] + self.window_seconds - now, 0.0)
+        now = time.monotonic()
+        with self._lock:
+            events = self._prune(key, now)
+            if events is None or len(events) < self.limit:
+                return None
+            return max(events[0] + self.window_seconds - now, 0.0)
+
+    def hit(self, key: str) -> None:
+        if self.shared:
+            now = time.time()
+            self.store.update(
+                self.namespace + key,
+                lambda value: json.dumps(self._shared_events(value, now) + [now]).encode(),
+                self.window_seconds,
+            )
+            return
+        now = time.monotonic()
+        with self._lock:
+            events = self._prune(key, now)
+            if events is None:
+                if len(self._events) >= self.max_keys:
+                    # Drop the oldest tracked key to bound memory
+                    self._events.pop(next(iter(self._events)))
+                events = self._events[key] = deque()
+            events.append(now)
+
+    def reset(self, key: str) -> None:
+        if self.shared:
+            self.store.delete(self.namespace + key)
+        with self._lock:
+            self._events.pop(key, None)
+
+    def clear(self) -> None:
+        if self.shared:
+            self.store.clear(self.namespace)
+        with self._lock:
+            self._events.clear()
+
+
+class LoginThrottle:
+    """Failed-login limits per client IP and per email."""
+
+    def __init__(
+        self, max_per_ip: int, max_per_email: int, window_seconds: float, store: Optional[SharedCache] = None
+    ):
+        self.by_ip = SlidingWindowCounter(max_per_ip, window_seconds, store=store, namespace="login-ip:")
+        self.by_email = SlidingWindowCounter(max_per_email, window_seconds, store=store, namespace="login-email:")
+
+    def check(self, ip: Optional[str], email: str) -> None:
+        """
+        Raise TooManyRequestsError if either key is over its limit.
+        Must be called before the password is verified.
+        """
+        retry_after = max(
+            (self.by_ip.retry_after(ip) or 0.0) if ip else 0.0,
+            self.by_email.retry_after(email.lower()) or 0.0,
+        )
+        if retry_after > 0:
+            raise TooManyRequestsError(
+                "Too many failed login attempts, try again later",
+                retry_after=int(retry_after) + 1,
+            )
+
+    def record_failure(self, ip: Optional[str], email: str) -> None:
+        if ip:
+            self.by_ip.hit(ip)
+        self.by_email.hit(email.lower())
+
+    def record_success(self, email: str) -> None:
+        self.by_email.reset(email.lower())
+
+    def clear(self) -> None:
+        self.by_ip.clear()
+        self.by_email.clear()
+
+
+login_throttle = LoginThrottle(
+    max_per_ip=settings.LOGIN_MAX_FAILURES_PER_IP,
+    max_per_email=settings.LOGIN_MAX_FAILURES_PER_EMAIL,
+    window_seconds=settings.LOGIN_THROTTLE_WINDOW_SECONDS,
+    store=shared_limits,
+)
@@ -0,0 +1,275 @@
+"""
+Token Session Store
+Server-side refresh-token families with rotation, reuse detection and revocation.
+
+Every login starts a token family. Each refresh token is recorded in
+``token_sessions`` and replaced on use; presenting an already-rotated
+refresh token revokes the whole family. Access tokens carry the family id
+(``fam``) so revoking a family also invalidates its outstanding access
+tokens.
+
+Revoked families are mirrored in memory (``revocation_list``): a Bloom
+filter answers "definitely not revoked" for the common case and an exact
+map confirms hits, so the per-request check never touches the database.
+The mirror is refreshed from the database every
+``REVOCATION_SYNC_SECONDS`` to pick up revocations from other workers.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.auth.jwt import create_access_token, create_refresh_token, verify_token_cached
+from app.config import settings
+from app.exceptions import AuthenticationError, InactiveUserError, InvalidTokenError
+from app.models import TokenSession, User
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys."""
+
+    def __init__(self, size_bits: int = 1 << 16, hashes: int = 4):
+        self.size_bits = size_bits
+        self.hashes = hashes
+        self._bits = bytearray(size_bits // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8 * self.hashes).digest()
+        for i in range(self.hashes):
+            yield int.from_bytes(digest[i * 8:(i + 1) * 8], "little") % self.size_bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RevocationList:
+    """In-memory mirror of revoked token families."""
+
+    def __init__(self, sync_interval_seconds: float):
+        self.sync_interval_seconds = sync_interval_seconds
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter()
+        self._revoked: dict[str, float] = {}
+        self._last_sync_at: Optional[datetime] = None
+        self._next_sync = 0.0
+
+    def add(self, family_id, expires_at: float) -> None:
+        key = str(family_id)
+        with self._lock:
+            self._revoked[key] = max(expires_at, self._revoked.get(key, 0.0))
+            self._bloom.add(key)
+
+    def is_revoked(self, family_id) -> bool:
+        if family_id is None:
+            return False
+        key = str(family_id)
+        if key not in self._bloom:
+            return False
+        expires_at = self._revoked.get(key)
+        return expires_at is not None and expires_at > time.time()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bloom = BloomFilter()
+            self._revoked.clear()
+            self._last_sync_at = None
+            self._next_sync = 0.0
+
+    def _prune(self) -> None:
+        """Drop expired entries and rebuild the Bloom filter without them."""
+        now = time.time()
+        live = {k: exp for k, exp in self._revoked.items() if exp > now}
+        if len(live) != len(self._revoked):
+            bloom = BloomFilter()
+            for key in live:
+                bloom.add(key)
+            self._revoked, self._bloom = live, bloom
+
+    def maybe_sync(self, db: Session) -> None:
+        """Load revocations made by other workers, at most once per interval."""
+        if time.monotonic() < self._next_sync:
+            return
+        with self._lock:
+            if time.monotonic() < self._next_sync:
+                return
+            self._next_sync = time.monotonic() + self.sync_interval_seconds
+            since = self._last_sync_at
+        started_at = datetime.utcnow()
+        query = (
+            db.query(TokenSession.family_id, func.max(TokenSession.expires_at))
+            .filter(TokenSession.revoked_at.isnot(None), TokenSession.expires_at > started_at)
+        )
+        if since is not None:
+            query = query.filter(TokenSession.revoked_at >= since)
+        try:
+            rows = query.group_by(TokenSession.family_id).all()
+        except Exception as e:
+            logger.warning(f"Revocation list sync failed: {e}")
+            return
+        for family_id, expires_at in rows:
+            self.add(family_id, _timestamp(expires_at))
+        with self._lock:
+            self._last_sync_at = started_at
+            self._prune()
+
+
+def _timestamp(value: datetime) -> float:
+    """Naive UTC datetime (as stored) to epoch seconds."""
+    return (value - datetime(1970, 1, 1)).total_seconds()
+
+
+revocation_list = RevocationList(sync_interval_seconds=settings.REVOCATION_SYNC_SECONDS)
+
+
+def issue_token_pair(
+    db: Session,
+    user: User,
+    roles: list[str],
+    family_id: Optional[UUID] = None,
+) -> tuple[str, str, TokenSession]:
+    """
+    Issue an access/refresh token pair and record the refresh token.
+
+    Args:
+        db: Database session (committed by the caller)
+        user: Token subject
+        roles: Role names embedded in the access token
+        family_id: Existing family when rotating, None to start a new one
+
+    Returns:
+        (access_token, refresh_token, session)
+    """
+    family_id = family_id or uuid.uuid4()
+    session = TokenSession(
+        family_id=family_id,
+        user_id=user.id,
+        roles=list(roles),
+        expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    db.add(session)
+
+    access_token = create_access_token(
+        data={"sub": str(user.id), "roles": list(roles), "fam": str(family_id), "jti": str(uuid.uuid4())}
+    )
+    refresh_token = create_refresh_token(
+        data={"sub": str(user.id), "fam": str(family_id), "jti": str(session.jti)}
+    )
+    return access_token, refresh_token, session
+
+
+def revoke_family(db: Session, family_id: UUID) -> int:
+    """
+    Revoke every refresh token in a family and add it to the denylist.
+
+    Returns:
+        Number of token sessions revoked
+    """
+    now = datetime.utcnow()
+    sessions = db.query(TokenSession).filter(TokenSession.family_id == family_id).all()
+    latest_expiry = now
+    for session in sessions:
+        if session.revoked_at is None:
+            session.revoked_at = now
+        latest_expiry = max(latest_expiry, session.expires_at)
+    db.commit()
+    # Outstanding access tokens of the family must be refused until they expire too
+    access_expiry = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    revocation_list.add(family_id, _timestamp(max(latest_expiry, access_expiry)))
+    return len(sessions)
+
+
+def revoke_user_sessions(db: Session, user_id: UUID) -> int:
+    """Revoke all token families of a user (e.g. when their membership ends)."""
+    families = [
+        row.family_id
+        for row in db.query(TokenSession.family_id)
+        .filter(TokenSession.user_id == user_id, TokenSession.revoked_at.is_(None))
+        .distinct()
+        .all()
+    ]
+    return sum(revoke_family(db, family_id) for family_id in families)
+
+
+def prune_token_sessions(db: Session) -> int:
+    """
+    Delete token sessions whose refresh token has expired.
+
+    Revoked and rotated sessions are kept until then: reuse detection and
+    the revocation list sync both read them.
+
+    Returns:
+        Number of token sessions deleted
+    """
+    return (
+        db.query(TokenSession)
+        .filter(TokenSession.expires_at <= datetime.utcnow())
+        .delete(synchronize_session=False)
+    )
+
+
+def rotate_refresh_token(db: Session, refresh_token: str) -> tuple[str, str]:
+    """
+    Exchange a refresh token for a new access/refresh pair.
+
+    The presented token is marked as replaced. Presenting a token that was
+    already rotated or revoked revokes its whole family.
+
+    Raises:
+        AuthenticationError: If the token is invalid, reused or revoked
+        InactiveUserError: If the user is inactive
+    """
+    try:
+        verified = verify_token_cached(refresh_token, token_type="refresh")
+    except InvalidTokenError:
+        raise AuthenticationError("Invalid refresh token")
+
+    if verified.subject_uuid is None:
+        raise AuthenticationError("Invalid user id in token")
+
+    try:
+        jti = UUID(verified.payload["jti"])
+    except (KeyError, ValueError, TypeError):
+        raise AuthenticationError("Invalid refresh token")
+
+    row = (
+        db.query(TokenSession, User)
+        .join(User, TokenSession.user_id == User.id)
+        .filter(TokenSession.jti == jti)
+        .with_for_update(of=TokenSession)
+        .first()
+    )
+    if row is None:
+        raise AuthenticationError("Invalid refresh token")
+    session, user = row
+
+    if session.user_id != verified.subject_uuid:
+        raise AuthenticationError("Invalid refresh token")
+
+    if session.revoked_at is not None or session.replaced_by is not None:
+        logger.warning(f"Refresh token reuse detected for user {user.id}, revoking family {session.family_id}")
+        revoke_family(db, session.family_id)
+        raise AuthenticationError("Refresh token has been revoked")
+
+    if not user.is_active:
+        raise InactiveUserError()
+
+    access_token, new_refresh_token, new_session = issue_token_pair(
+        db, user, session.roles or [], family_id=session.family_id
+    )
+    session.replaced_by = new_session.jti
+    db.commit()
+    return access_token, new_refresh_token
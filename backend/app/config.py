@@ -30,6 +30,18 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    JWT_BACKEND: str = "jose"  # "jose" or "pyjwt"
+    JWT_CACHE_SIZE: int = 4096  # verified tokens kept in memory (0 disables)
+    REVOCATION_SYNC_SECONDS: int = 30  # how often each worker reloads revoked token families
+
+    # Password hashing (dedicated executor, bcrypt cost, login throttle)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    LOGIN_MAX_FAILURES_PER_IP: int = 50
+    LOGIN_MAX_FAILURES_PER_EMAIL: int = 5
+    LOGIN_THROTTLE_WINDOW_SECONDS: int = 300
+    TRUSTED_PROXY_HOPS: int = 0  # reverse proxies that append to X-Forwarded-For (0: socket peer; Render: 1)
     
     # Email
     EMAIL_PROVIDER: str = "sendgrid"
@@ -51,7 +63,70 @@ class Settings(BaseSettings):
     # App
     DEBUG: bool = False
     ENVIRONMENT: str = "development"
-    
+
+    # Query profiling (per-request statement log, slow queries, N+1 detection)
+    QUERY_PROFILER_ENABLED: bool = False
+    QUERY_PROFILER_HEADER: str = "X-Query-Profile"
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Health checks
+    HEALTH_CACHE_TTL_SECONDS: float = 5.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 3.0
+
+    # Response compression (gzip, and brotli when the brotli package is installed)
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # smaller responses are sent uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+
+    # Public read models (per-worker, invalidated by admin writes; TTL bounds cross-worker staleness)
+    PUBLIC_GALLERY_CACHE_SIZE: int = 256  # cached gallery pages (0 disables)
+    PUBLIC_GALLERY_CACHE_TTL_SECONDS: int = 300
+    UPCOMING_EVENTS_REFRESH_SECONDS: int = 300  # reload of the upcoming events feed
+    MEMBER_HOME_CACHE_SIZE: int = 1024  # cached /members/me/home responses (0 disables)
+    MEMBER_HOME_CACHE_TTL_SECONDS: int = 30
+    SINGLE_FLIGHT_TIMEOUT_SECONDS: float = 10.0  # wait for an identical in-flight public read
+
+    # Query result cache (per worker, invalidated on commit by table)
+    QUERY_CACHE_ENABLED: bool = True
+    QUERY_CACHE_SIZE: int = 1024  # cached statement results (0 disables)
+    QUERY_CACHE_DEFAULT_TTL_SECONDS: int = 60
+
+    # Admission control: concurrent requests per route class, and how long a
+    # request may queue for a slot before it is shed with 503
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_PUBLIC_READ_LIMIT: int = 16
+    ADMISSION_MEMBER_READ_LIMIT: int = 16
+    ADMISSION_ADMIN_READ_LIMIT: int = 4
+    ADMISSION_ADMIN_HEAVY_LIMIT: int = 2  # reports, stats, bulk dues
+    ADMISSION_UPLOAD_LIMIT: int = 2
+    ADMISSION_READ_QUEUE_TIMEOUT_SECONDS: float = 1.0
+    ADMISSION_HEAVY_QUEUE_TIMEOUT_SECONDS: float = 15.0  # admin heavy and uploads
+
+    # Host-local cache shared by the workers (SQLite file, /dev/shm by default)
+    SHARED_CACHE_ENABLED: bool = True
+    SHARED_CACHE_PATH: str = ""  # empty: /dev/shm/armentum-cache.sqlite3 or the temp dir
+    SHARED_CACHE_MAX_BYTES: int = 16 * 1024 * 1024  # leaves room for the WAL in a 64 MiB /dev/shm
+    SHARED_CACHE_MAX_ENTRIES: int = 50000
+    # Rate-limiter state (login throttle), in its own file and never LRU-evicted
+    SHARED_LIMITS_PATH: str = ""  # empty: /dev/shm/armentum-limits.sqlite3 or the temp dir
+    SHARED_LIMITS_MAX_BYTES: int = 4 * 1024 * 1024
+    SHARED_LIMITS_MAX_ENTRIES: int = 50000
+
+    # Cross-worker cache invalidation (PostgreSQL LISTEN/NOTIFY)
+    INVALIDATION_BUS_ENABLED: bool = True
+    INVALIDATION_CHANNEL: str = "armentum_invalidation"
+
+    # Background jobs (daily, one worker at a time via database leader lock)
+    SCHEDULER_ENABLED: bool = True
+    OVERDUE_JOB_HOUR_UTC: int = 3  # pendiente -> vencida transition
+    TOKEN_PRUNE_JOB_HOUR_UTC: int = 4  # expired token_sessions rows deleted
+
+    @property
+    def is_production(self) -> bool:
+        """Check if running in production"""
+        return self.ENVIRONMENT == "production"
+
     @property
     def cors_origins_list(self) -> list[str]:
         """Parse CORS_ORIGINS string to list"""
@@ -2,14 +2,22 @@
 Custom Exceptions for Armentum API
 """
 
+from typing import Optional
+
 from fastapi import HTTPException, status
 
 
 class ArmentumException(Exception):
     """Base exception for Armentum API."""
-    def __init__(self, message: str, status_code: int = status.HTTP_400_BAD_REQUEST):
+    def __init__(
+        self,
+        message: str,
+        status_code: int = status.HTTP_400_BAD_REQUEST,
+        headers: Optional[dict] = None,
+    ):
         self.message = message
         self.status_code = status_code
+        self.headers = headers
         super().__init__(self.message)
 
 
@@ -65,3 +73,23 @@ class EmailNotVerifiedError(ArmentumException):
     """Raised when email verification is required."""
     def __init__(self, message: str = "Email not verified"):
         super().__init__(message, status.HTTP_403_FORBIDDEN)
+
+
+class TooManyRequestsError(ArmentumException):
+    """Raised when a client exceeds a rate limit."""
+    def __init__(self, message: str = "Too many requests", retry_after: int = 60):
+        super().__init__(
+            message,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class ServiceBusyError(ArmentumException):
+    """Raised when a bounded resource is saturated and the request is shed."""
+    def __init__(self, message: str = "Service busy, retry shortly", retry_after: int = 1):
+        super().__init__(
+            message,
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(retry_after)},
+        )
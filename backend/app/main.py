@@ -10,9 +10,19 @@ from app.routers import auth
 from app.routers import public
 from app.routers import members
 from app.routers import admin
+from app.routers import health
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from app.exceptions import ArmentumException
+from app.auth.token_store import prune_token_sessions
+from app.database import sync_engine, async_engine
+from app.utils.admission import AdmissionControlMiddleware
+from app.utils.compression import CompressionMiddleware
+from app.utils.invalidation_bus import PostgresNotifyTransport, invalidation_bus
+from app.utils.responses import FastJSONResponse
+from app.utils.query_profiler import QueryProfilerMiddleware, install_query_profiler
+from app.utils.scheduler import DailyJob, run_locked
+from app.services.dues_service import dues_service
 
 app = FastAPI(
     title="Armentum API",
@@ -20,8 +30,14 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
 )
 
+# Per-route-class concurrency limits (added first: innermost, so shed
+# responses still get CORS headers)
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -31,12 +47,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for JSON and text responses
+app.add_middleware(CompressionMiddleware)
+
+# Query profiling (always on when enabled, header-activated outside production)
+if settings.QUERY_PROFILER_ENABLED or not settings.is_production:
+    install_query_profiler(sync_engine, async_engine.sync_engine)
+    app.add_middleware(QueryProfilerMiddleware)
+
+# Daily background jobs (leader-locked, idempotent)
+scheduled_jobs = [
+    DailyJob(
+        "overdue-cuotas",
+        lambda: run_locked("overdue-cuotas", dues_service.mark_overdue),
+        hour_utc=settings.OVERDUE_JOB_HOUR_UTC,
+    ),
+    DailyJob(
+        "prune-token-sessions",
+        lambda: run_locked("prune-token-sessions", prune_token_sessions),
+        hour_utc=settings.TOKEN_PRUNE_JOB_HOUR_UTC,
+    ),
+]
+
+
+@app.on_event("startup")
+async def start_scheduled_jobs():
+    if settings.SCHEDULER_ENABLED:
+        for job in scheduled_jobs:
+            job.start()
+
+
+@app.on_event("shutdown")
+async def stop_scheduled_jobs():
+    for job in scheduled_jobs:
+        await job.stop()
+
+
+@app.on_event("startup")
+async def start_invalidation_bus():
+    # Without it (e.g. SQLite) each worker only sees its own invalidations
+    if settings.INVALIDATION_BUS_ENABLED and async_engine.dialect.name == "postgresql":
+        await invalidation_bus.start(PostgresNotifyTransport(async_engine, settings.INVALIDATION_CHANNEL))
+
+
+@app.on_event("shutdown")
+async def stop_invalidation_bus():
+    await invalidation_bus.stop()
+
+
 # Global exception handler for custom Armentum exceptions
 @app.exception_handler(ArmentumException)
 async def armentum_exception_handler(request: Request, exc: ArmentumException):
     return JSONResponse(
         status_code=exc.status_code,
-        content={"detail": exc.message}
+        content={"detail": exc.message},
+        headers=exc.headers,
     )
 
 
@@ -63,6 +128,7 @@ async def root():
     }
 
 
+app.include_router(health.router, tags=["health"])
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(public.router, prefix="/api", tags=["public"])
 app.include_router(members.router, prefix="/api", tags=["members"])
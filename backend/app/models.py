@@ -3,7 +3,7 @@ SQLAlchemy ORM Models
 Database table definitions
 """
 
-from sqlalchemy import Column, String, Boolean, DateTime, Date, Numeric, Text, ForeignKey, JSON
+from sqlalchemy import Column, String, Boolean, DateTime, Date, Integer, Numeric, Text, ForeignKey, JSON, Index, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -64,6 +64,10 @@ class Role(Base):
 
 class UserRole(Base):
     __tablename__ = "users_roles"
+    __table_args__ = (
+        # Role lookup on every authenticated request (index-only scan)
+        Index("ix_users_roles_user_id_role_id", "user_id", postgresql_include=["role_id"]),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -75,6 +79,10 @@ class UserRole(Base):
 
 class Miembro(Base):
     __tablename__ = "miembros"
+    __table_args__ = (
+        # Admin member list: filter by estado, newest members first
+        Index("ix_miembros_estado_fecha_ingreso", "estado", "fecha_ingreso"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False)
@@ -105,6 +113,16 @@ class Miembro(Base):
 
 class EventoPublico(Base):
     __tablename__ = "eventos_publicos"
+    __table_args__ = (
+        # Public event list with an explicit estado filter
+        Index("ix_eventos_publicos_estado_fecha", "estado", "fecha"),
+        # Default public event list and the dashboard's upcoming count
+        Index(
+            "ix_eventos_publicos_visibles_fecha",
+            "fecha",
+            postgresql_where=text("estado IN ('planificado', 'en_curso')"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     nombre = Column(String(255), nullable=False)
@@ -136,7 +154,7 @@ class Ensayo(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tipo = Column(String(50), nullable=False)
     nombre = Column(String(255))
-    fecha = Column(Date, nullable=False)
+    fecha = Column(Date, nullable=False, index=True)
     hora = Column(String(10), nullable=False)
     lugar = Column(String(255), nullable=False)
     cuerdas = Column(String(255))
@@ -150,6 +168,13 @@ class Ensayo(Base):
 
 class Asistencia(Base):
     __tablename__ = "asistencias"
+    __table_args__ = (
+        UniqueConstraint("miembro_id", "ensayo_id", name="uq_asistencias_miembro_ensayo"),
+        # Rehearsal roster and roll-call lookups (index-only with presente)
+        Index("ix_asistencias_ensayo_miembro", "ensayo_id", "miembro_id", postgresql_include=["presente"]),
+        # A member's attendance history, newest first
+        Index("ix_asistencias_miembro_registrado_en", "miembro_id", "registrado_en"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     miembro_id = Column(UUID(as_uuid=True), ForeignKey("miembros.id", ondelete="CASCADE"), nullable=False)
@@ -173,8 +198,50 @@ class Asistencia(Base):
     ensayo = relationship("Ensayo", back_populates="asistencias")
 
 
+class EstadisticaAsistencia(Base):
+    """
+    Attendance counters per member, maintained incrementally by the
+    attendance service. ``temporada`` is the rehearsal year; 0 holds the
+    totals across all seasons.
+    """
+    __tablename__ = "estadisticas_asistencia"
+
+    miembro_id = Column(UUID(as_uuid=True), ForeignKey("miembros.id", ondelete="CASCADE"), primary_key=True)
+    temporada = Column(Integer, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    presentes = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __init__(self, **kwargs):
+        # Ensure default values on instantiation
+        if 'total' not in kwargs:
+            kwargs['total'] = 0
+        if 'presentes' not in kwargs:
+            kwargs['presentes'] = 0
+        if 'updated_at' not in kwargs:
+            kwargs['updated_at'] = datetime.utcnow()
+        super().__init__(**kwargs)
+
+    miembro = relationship("Miembro")
+
+
 class Cuota(Base):
     __tablename__ = "cuotas"
+    __table_args__ = (
+        # Natural key of generated recurring dues (periodo is NULL for one-off cuotas)
+        UniqueConstraint("miembro_id", "tipo", "periodo", name="uq_cuotas_miembro_tipo_periodo"),
+        # Overdue job and per-estado finance queries
+        Index("ix_cuotas_estado_fecha_vencimiento", "estado", "fecha_vencimiento"),
+        # A member's cuotas, optionally by estado, ordered by due date
+        Index("ix_cuotas_miembro_estado_vencimiento", "miembro_id", "estado", "fecha_vencimiento"),
+        # A member's payment history
+        Index(
+            "ix_cuotas_pagadas_miembro_fecha_pago",
+            "miembro_id",
+            "fecha_pago",
+            postgresql_where=text("estado = 'pagada'"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     miembro_id = Column(UUID(as_uuid=True), ForeignKey("miembros.id", ondelete="CASCADE"), nullable=False)
@@ -184,6 +251,7 @@ class Cuota(Base):
     fecha_vencimiento = Column(Date, nullable=False)
     estado = Column(String(50), default="pendiente")
     fecha_pago = Column(Date)
+    periodo = Column(String(7))  # YYYY-MM for generated recurring dues
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -202,8 +270,62 @@ class Cuota(Base):
     miembro = relationship("Miembro", back_populates="cuotas")
 
 
+class MovimientoSaldo(Base):
+    """
+    Append-only ledger of balance changes. ``monto`` is signed: positive
+    increases what the member owes, negative decreases it. Cuota state
+    changes record ``estado_origen``/``estado_destino``.
+    """
+    __tablename__ = "movimientos_saldo"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    miembro_id = Column(UUID(as_uuid=True), ForeignKey("miembros.id", ondelete="CASCADE"), nullable=False, index=True)
+    cuota_id = Column(UUID(as_uuid=True), ForeignKey("cuotas.id", ondelete="SET NULL"), index=True)
+    tipo = Column(String(50), nullable=False)
+    monto = Column(Numeric(10, 2), nullable=False)
+    estado_origen = Column(String(50))
+    estado_destino = Column(String(50))
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __init__(self, **kwargs):
+        # Ensure default values on instantiation
+        if 'id' not in kwargs:
+            kwargs['id'] = uuid.uuid4()
+        if 'created_at' not in kwargs:
+            kwargs['created_at'] = datetime.utcnow()
+        super().__init__(**kwargs)
+
+
+class SaldoCuotas(Base):
+    """
+    Cached cuota totals per estado, maintained from the ledger. One row per
+    member plus a choir-wide row keyed by the nil UUID.
+    """
+    __tablename__ = "saldos_cuotas"
+
+    miembro_id = Column(UUID(as_uuid=True), primary_key=True)
+    total_pagado = Column(Numeric(12, 2), nullable=False, default=0)
+    total_pendiente = Column(Numeric(12, 2), nullable=False, default=0)
+    total_vencido = Column(Numeric(12, 2), nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __init__(self, **kwargs):
+        # Ensure default values on instantiation
+        for field in ('total_pagado', 'total_pendiente', 'total_vencido'):
+            if field not in kwargs:
+                kwargs[field] = 0
+        if 'updated_at' not in kwargs:
+            kwargs['updated_at'] = datetime.utcnow()
+        super().__init__(**kwargs)
+
+
 class Comunicado(Base):
     __tablename__ = "comunicados"
+    __table_args__ = (
+        # Public news: comunicados for everyone, newest first
+        Index("ix_comunicados_dirigido_a_created_at", "dirigido_a", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     titulo = Column(String(255), nullable=False)
@@ -266,3 +388,32 @@ class GalleryImage(Base):
         if 'created_at' not in kwargs:
             kwargs['created_at'] = datetime.utcnow()
         super().__init__(**kwargs)
+
+
+class TokenSession(Base):
+    """
+    Issued refresh token. Tokens rotated from the same login share a
+    family_id; revoking a family invalidates every token issued from it.
+    """
+    __tablename__ = "token_sessions"
+
+    jti = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    roles = Column(JSON, default=[])
+    issued_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    replaced_by = Column(UUID(as_uuid=True))
+    revoked_at = Column(DateTime)
+
+    def __init__(self, **kwargs):
+        # Ensure default values on instantiation
+        if 'jti' not in kwargs:
+            kwargs['jti'] = uuid.uuid4()
+        if 'roles' not in kwargs:
+            kwargs['roles'] = []
+        if 'issued_at' not in kwargs:
+            kwargs['issued_at'] = datetime.utcnow()
+        super().__init__(**kwargs)
+
+    user = relationship("User")
@@ -6,16 +6,18 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, status
-from sqlalchemy import and_, func, or_
+from sqlalchemy import Numeric, and_, case, func, select, true, type_coerce
 from sqlalchemy.orm import Session
 
-from app.auth.dependencies import require_admin
+from app.auth.dependencies import get_role_by_name, require_admin
 from app.auth.jwt import get_password_hash
+from app.auth.token_store import revoke_user_sessions
 from app.database import get_db
 from app.models import (
     Asistencia,
     Cuota,
     Ensayo,
+    EstadisticaAsistencia,
     EventoPublico,
     GalleryImage,
     Miembro,
@@ -26,14 +28,19 @@ from app.models import (
 from app.schemas import (
     AdminAttendanceReportResponse,
     AdminAttendanceReportRecord,
+    AdminAttendanceStatsRecord,
+    AdminAttendanceStatsResponse,
     AdminFinancePaymentRequest,
     AdminFinanceReportResponse,
     AdminMemberCreate,
     AdminMemberListResponse,
     AdminMemberResponse,
     AdminMemberUpdate,
+    AsistenciaBulkUpdate,
     AsistenciaCreate,
     AsistenciaResponse,
+    CuotaBulkCreate,
+    CuotaBulkResponse,
     CuotaCreate,
     CuotaResponse,
     EventoPublicoCreate,
@@ -47,12 +54,47 @@ from app.schemas import (
     GalleryImageUploadResponse,
     Message,
 )
+from app.services.attendance_service import ALL_SEASONS, attendance_service
+from app.services.dues_service import dues_service
+from app.services.events_feed_service import events_feed_service
 from app.services.image_service import image_service
+from app.services.ledger_service import CuotaTransition, ledger_service
+from app.services.public_gallery_service import public_gallery_service
+from app.services.search_service import GALLERY_SEARCH_COLUMNS, MEMBER_SEARCH_COLUMNS, search_service
+from app.utils.fieldsets import Fieldset
+from app.utils.query_cache import query_cache
+from app.utils.responses import FastJSONResponse
 from app.utils.storage_buckets import BUCKET_IMAGES, is_allowed_mime_type, get_max_file_size_mb
 
 
 router = APIRouter()
 
+# ?fields= projections of the admin list endpoints
+MEMBER_FIELDS = Fieldset({
+    "id": Miembro.id,
+    "nombre": User.nombre,
+    "email": User.email,
+    "voz": Miembro.voz,
+    "estado": Miembro.estado,
+    "fecha_ingreso": Miembro.fecha_ingreso,
+    "telefono": Miembro.telefono,
+    "saldo_actual": Miembro.saldo_actual,
+})
+CUOTA_FIELDS = Fieldset({
+    "id": Cuota.id,
+    "userId": Cuota.miembro_id,
+    "miembro_id": Cuota.miembro_id,
+    "miembro_nombre": User.nombre,
+    "monto": type_coerce(Cuota.monto, Numeric(10, 2, asdecimal=False)),
+    "descripcion": Cuota.descripcion,
+    "tipo": Cuota.tipo,
+    "vencimiento": Cuota.fecha_vencimiento,
+    "fecha_vencimiento": Cuota.fecha_vencimiento,
+    "estado": Cuota.estado,
+    "fecha_pago": Cuota.fecha_pago,
+    "created_at": Cuota.created_at,
+})
+
 
 def _member_to_response(member: Miembro) -> AdminMemberResponse:
     user = member.user
@@ -77,33 +119,34 @@ def list_members(
         None,
         pattern="^(activo|inactivo|suspendido)$",
     ),
+    fields: Optional[str] = Query(None, description="Comma-separated member fields to return (default: all)"),
     db: Session = Depends(get_db),
     _admin: User = Depends(require_admin),
 ):
-    query = db.query(Miembro).join(User)
+    field_names = MEMBER_FIELDS.parse(fields)
+    query = db.query(*MEMBER_FIELDS.select(field_names)).select_from(Miembro)
+    if search or MEMBER_FIELDS.needs(field_names, User.__table__):
+        query = query.join(User, User.id == Miembro.user_id)
     if estado:
         query = query.filter(Miembro.estado == estado)
+    ordering = [Miembro.fecha_ingreso.desc()]
     if search:
-        term = f"%{search.lower()}%"
-        query = query.filter(
-            or_(
-                func.lower(User.nombre).like(term),
-                func.lower(User.email).like(term),
-            )
-        )
+        match = search_service.match(db, MEMBER_SEARCH_COLUMNS, search)
+        query = query.filter(match.condition)
+        ordering.insert(0, match.rank.desc())
     total = query.count()
-    members = (
-        query.order_by(Miembro.fecha_ingreso.desc())
+    rows = (
+        query.order_by(*ordering)
         .offset(offset)
         .limit(limit)
         .all()
     )
-    return AdminMemberListResponse(
-        total=total,
-        limit=limit,
-        offset=offset,
-        members=[_member_to_response(member) for member in members],
-    )
+    return FastJSONResponse({
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "members": [row._asdict() for row in rows],
+    })
 
 
 @router.get("/events", response_model=dict)
@@ -123,24 +166,24 @@ def list_events(
         .limit(limit)
         .all()
     )
-    return {
+    return FastJSONResponse({
         "events": [
             {
-                "id": str(e.id),
+                "id": e.id,
                 "nombre": e.nombre,
                 "descripcion": e.descripcion,
-                "fecha": str(e.fecha),
+                "fecha": e.fecha,
                 "hora": e.hora,
                 "lugar": e.lugar,
                 "tipo": e.tipo,
                 "estado": e.estado,
                 "imagen_url": e.imagen_url,
-                "created_at": e.created_at.isoformat() if e.created_at else None,
+                "created_at": e.created_at,
             }
             for e in events
         ],
         "total": total,
-    }
+    })
 
 
 @router.get("/rehearsals", response_model=dict)
@@ -160,25 +203,25 @@ def list_rehearsals(
         .limit(limit)
         .all()
     )
-    return {
+    return FastJSONResponse({
         "rehearsals": [
             {
-                "id": str(r.id),
+                "id": r.id,
                 "titulo": r.nombre,
                 "descripcion": r.descripcion,
-                "fecha": str(r.fecha),
+                "fecha": r.fecha,
                 "horaInicio": r.hora,
                 "horaFin": None,
                 "lugar": r.lugar,
                 "estado": "scheduled",
                 "tipo": r.tipo,
                 "cuerdas": r.cuerdas,
-                "created_at": r.created_at.isoformat() if r.created_at else None,
+                "created_at": r.created_at,
             }
             for r in rehearsals
         ],
         "total": total,
-    }
+    })
 
 
 @router.post(
@@ -208,7 +251,7 @@ def create_member(
         user = existing_user
         user.nombre = payload.nombre
 
-    corista_role = db.query(Role).filter(Role.nombre == "corista").first()
+    corista_role = get_role_by_name(db, "corista")
     if not corista_role:
         corista_role = Role(nombre="corista", descripcion="Rol corista")
         db.add(corista_role)
@@ -238,7 +281,7 @@ def update_member(
     member_id: UUID,
     payload: AdminMemberUpdate,
     db: Session = Depends(get_db),
-    _admin: User = Depends(require_admin),
+    current_admin: User = Depends(require_admin),
 ):
     member = db.query(Miembro).filter(Miembro.id == member_id).first()
     if not member:
@@ -250,8 +293,11 @@ def update_member(
     if payload.telefono is not None:
         member.telefono = payload.telefono
     if payload.saldo_actual is not None:
-        member.saldo_actual = payload.saldo_actual
+        ledger_service.adjust_balance(db, member.id, payload.saldo_actual, created_by=current_admin.id)
     db.commit()
+    if payload.estado is not None and payload.estado != "activo":
+        # Membership ended or suspended: sign the member out everywhere
+        revoke_user_sessions(db, member.user_id)
     db.refresh(member)
     return _member_to_response(member)
 
@@ -267,6 +313,7 @@ def delete_member(
         raise HTTPException(status_code=404, detail="Member not found")
     member.estado = "inactivo"
     db.commit()
+    revoke_user_sessions(db, member.user_id)
     return Message(message="Member marked as inactive")
 
 
@@ -284,6 +331,7 @@ def create_event(
     db.add(event)
     db.commit()
     db.refresh(event)
+    events_feed_service.upsert(event)
     return event
 
 
@@ -294,20 +342,20 @@ def get_event(
     _admin: User = Depends(require_admin),
 ):
     """Get a specific event by ID."""
-    event = db.query(EventoPublico).filter(EventoPublico.id == event_id).first()
+    event = query_cache.execute(db, select(EventoPublico).where(EventoPublico.id == event_id)).scalars().first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return {
-        "id": str(event.id),
+        "id": event.id,
         "nombre": event.nombre,
         "descripcion": event.descripcion,
-        "fecha": str(event.fecha),
+        "fecha": event.fecha,
         "hora": event.hora,
         "lugar": event.lugar,
         "tipo": event.tipo,
         "estado": event.estado,
         "imagen_url": event.imagen_url,
-        "created_at": event.created_at.isoformat() if event.created_at else None,
+        "created_at": event.created_at,
     }
 
 
@@ -325,6 +373,7 @@ def update_event(
         setattr(event, field, value)
     db.commit()
     db.refresh(event)
+    events_feed_service.upsert(event)
     return event
 
 
@@ -339,6 +388,7 @@ def delete_event(
         raise HTTPException(status_code=404, detail="Event not found")
     db.delete(event)
     db.commit()
+    events_feed_service.remove(event_id)
     return Message(message="Event deleted")
 
 
@@ -369,8 +419,10 @@ def update_rehearsal(
     rehearsal = db.query(Ensayo).filter(Ensayo.id == rehearsal_id).first()
     if not rehearsal:
         raise HTTPException(status_code=404, detail="Rehearsal not found")
+    old_fecha = rehearsal.fecha
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(rehearsal, field, value)
+    attendance_service.move_rehearsal(db, rehearsal.id, old_fecha, rehearsal.fecha)
     db.commit()
     db.refresh(rehearsal)
     return rehearsal
@@ -385,6 +437,7 @@ def delete_rehearsal(
     rehearsal = db.query(Ensayo).filter(Ensayo.id == rehearsal_id).first()
     if not rehearsal:
         raise HTTPException(status_code=404, detail="Rehearsal not found")
+    attendance_service.forget_rehearsal(db, rehearsal_id, rehearsal.fecha)
     # Delete related attendances first to avoid FK constraint violation
     db.query(Asistencia).filter(Asistencia.ensayo_id == rehearsal_id).delete()
     db.delete(rehearsal)
@@ -403,17 +456,17 @@ def get_rehearsal(
     if not rehearsal:
         raise HTTPException(status_code=404, detail="Rehearsal not found")
     return {
-        "id": str(rehearsal.id),
+        "id": rehearsal.id,
         "titulo": rehearsal.nombre,
         "descripcion": rehearsal.descripcion,
-        "fecha": str(rehearsal.fecha),
+        "fecha": rehearsal.fecha,
         "horaInicio": rehearsal.hora,
         "horaFin": None,
         "lugar": rehearsal.lugar,
         "estado": "scheduled",
         "tipo": rehearsal.tipo,
         "cuerdas": rehearsal.cuerdas,
-        "created_at": rehearsal.created_at.isoformat() if rehearsal.created_at else None,
+        "created_at": rehearsal.created_at,
     }
 
 
@@ -421,38 +474,84 @@ def get_rehearsal(
 def get_rehearsal_attendance(
     rehearsal_id: UUID,
     voz: Optional[str] = Query(None, description="Filtrar por tipo de voz"),
+    agrupar_por_voz: bool = Query(False, description="Agrupar por voz con conteos"),
     db: Session = Depends(get_db),
     _admin: User = Depends(require_admin),
 ):
-    """Get all attendance records for a specific rehearsal, optionally filtered by voice."""
-    rehearsal = db.query(Ensayo).filter(Ensayo.id == rehearsal_id).first()
-    if not rehearsal:
+    """Get all attendance records for a specific rehearsal, optionally filtered or grouped by voice."""
+    rows = _roster_rows(db, rehearsal_id, voz, with_counts=agrupar_por_voz)
+    if not rows and not db.query(Ensayo.id).filter(Ensayo.id == rehearsal_id).first():
         raise HTTPException(status_code=404, detail="Rehearsal not found")
-    
-    # Get all members with their attendance for this rehearsal
-    query = db.query(Miembro).join(User).filter(Miembro.estado == "activo")
+
+    if not agrupar_por_voz:
+        return FastJSONResponse([_roster_entry(row, rehearsal_id) for row in rows])
+
+    groups = []
+    for row in rows:
+        if not groups or groups[-1]["voz"] != row.voz:
+            groups.append({
+                "voz": row.voz,
+                "total": row.voz_total,
+                "presentes": row.voz_presentes,
+                "ausentes": row.voz_total - row.voz_presentes,
+                "miembros": [],
+            })
+        groups[-1]["miembros"].append(_roster_entry(row, rehearsal_id))
+    return FastJSONResponse(groups)
+
+
+def _roster_rows(db: Session, rehearsal_id: UUID, voz: Optional[str] = None, with_counts: bool = False) -> list:
+    """
+    Active members of the rehearsal roster with their attendance, in one query.
+
+    The rehearsal is part of the join so an unknown id yields no rows
+    instead of a roster of members without attendance.
+    """
+    columns = [
+        Miembro.id.label("miembro_id"),
+        Miembro.voz,
+        User.nombre,
+        Asistencia.id.label("asistencia_id"),
+        Asistencia.presente,
+        Asistencia.justificacion,
+        Asistencia.registrado_en,
+    ]
+    if with_counts:
+        presente = case((Asistencia.presente.is_(True), 1), else_=0)
+        columns += [
+            func.count().over(partition_by=Miembro.voz).label("voz_total"),
+            func.sum(presente).over(partition_by=Miembro.voz).label("voz_presentes"),
+        ]
+
+    query = (
+        db.query(*columns)
+        .select_from(Ensayo)
+        .join(Miembro, true())
+        .join(User, User.id == Miembro.user_id)
+        .outerjoin(
+            Asistencia,
+            and_(Asistencia.miembro_id == Miembro.id, Asistencia.ensayo_id == Ensayo.id),
+        )
+        .filter(Ensayo.id == rehearsal_id, Miembro.estado == "activo")
+    )
     if voz:
         query = query.filter(Miembro.voz == voz)
-    members = query.all()
-    
-    attendances = db.query(Asistencia).filter(Asistencia.ensayo_id == rehearsal_id).all()
-    attendance_map = {str(a.miembro_id): a for a in attendances}
-    
-    result = []
-    for member in members:
-        attendance = attendance_map.get(str(member.id))
-        result.append({
-            "id": str(attendance.id) if attendance else str(member.id),
-            "userId": member.user.nombre,
-            "nombre": member.user.nombre,
-            "voz": member.voz,
-            "miembro_id": str(member.id),
-            "ensayo_id": str(rehearsal_id),
-            "presente": attendance.presente if attendance else False,
-            "justificacion": attendance.justificacion if attendance else None,
-            "registrado_en": attendance.registrado_en.isoformat() if attendance and attendance.registrado_en else None,
-        })
-    return result
+    return query.order_by(Miembro.voz, User.nombre).all()
+
+
+def _roster_entry(row, rehearsal_id: UUID) -> dict:
+    has_attendance = row.asistencia_id is not None
+    return {
+        "id": row.asistencia_id if has_attendance else row.miembro_id,
+        "userId": row.nombre,
+        "nombre": row.nombre,
+        "voz": row.voz,
+        "miembro_id": row.miembro_id,
+        "ensayo_id": rehearsal_id,
+        "presente": bool(row.presente) if has_attendance else False,
+        "justificacion": row.justificacion,
+        "registrado_en": row.registrado_en,
+    }
 
 
 # Request body for attendance update
@@ -464,6 +563,32 @@ class AttendanceUpdateRequest(BaseModel):
     justificacion: Optional[str] = None
 
 
+@router.put("/rehearsals/{rehearsal_id}/attendance", response_model=list)
+def bulk_update_rehearsal_attendance(
+    rehearsal_id: UUID,
+    payload: AsistenciaBulkUpdate,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(require_admin),
+):
+    """Register attendance for a whole rehearsal in one statement and return the roster."""
+    rehearsal = db.query(Ensayo.id, Ensayo.fecha).filter(Ensayo.id == rehearsal_id).first()
+    if not rehearsal:
+        raise HTTPException(status_code=404, detail="Rehearsal not found")
+
+    member_ids = {registro.miembro_id for registro in payload.registros}
+    found = {row.id for row in db.query(Miembro.id).filter(Miembro.id.in_(member_ids))}
+    missing = member_ids - found
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Members not found: {', '.join(sorted(str(m) for m in missing))}",
+        )
+
+    attendance_service.upsert_roster(db, rehearsal_id, rehearsal.fecha, payload.registros, current_admin.id)
+    db.commit()
+    return [_roster_entry(row, rehearsal_id) for row in _roster_rows(db, rehearsal_id)]
+
+
 @router.put("/rehearsals/{rehearsal_id}/attendance/{attendance_id}", response_model=dict)
 def update_rehearsal_attendance(
     rehearsal_id: UUID,
@@ -473,8 +598,8 @@ def update_rehearsal_attendance(
     current_admin: User = Depends(require_admin),
 ):
     """Update attendance for a specific member in a rehearsal."""
-    # Verify rehearsal exists
-    rehearsal = db.query(Ensayo).filter(Ensayo.id == rehearsal_id).first()
+    # Verify rehearsal exists, locked like every attendance write (see lock_rehearsal)
+    rehearsal = db.query(Ensayo).filter(Ensayo.id == rehearsal_id).with_for_update().first()
     if not rehearsal:
         raise HTTPException(status_code=404, detail="Rehearsal not found")
     
@@ -483,11 +608,13 @@ def update_rehearsal_attendance(
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
     
-    # Try to find existing attendance record
+    # Try to find existing attendance record, locked so concurrent edits
+    # apply their stats deltas one after the other
     attendance = db.query(Asistencia).filter(
         Asistencia.ensayo_id == rehearsal_id,
         Asistencia.miembro_id == attendance_id,
-    ).first()
+    ).with_for_update().first()
+    previous = bool(attendance.presente) if attendance else None
     
     if attendance:
         attendance.presente = payload.presente
@@ -504,11 +631,12 @@ def update_rehearsal_attendance(
             registrado_por=current_admin.id,
         )
         db.add(attendance)
+    attendance_service.record_changes(db, rehearsal.fecha, [(member.id, previous, payload.presente)])
     
     db.commit()
     db.refresh(attendance)
     return {
-        "id": str(attendance.id),
+        "id": attendance.id,
         "presente": attendance.presente,
         "justificacion": attendance.justificacion,
     }
@@ -516,7 +644,7 @@ def update_rehearsal_attendance(
     db.commit()
     db.refresh(attendance)
     return {
-        "id": str(attendance.id),
+        "id": attendance.id,
         "presente": attendance.presente,
         "justificacion": attendance.justificacion,
     }
@@ -535,7 +663,8 @@ def register_attendance(
     member = db.query(Miembro).filter(Miembro.id == payload.miembro_id).first()
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
-    rehearsal = db.query(Ensayo).filter(Ensayo.id == payload.ensayo_id).first()
+    # Locked like every attendance write (see lock_rehearsal)
+    rehearsal = db.query(Ensayo).filter(Ensayo.id == payload.ensayo_id).with_for_update().first()
     if not rehearsal:
         raise HTTPException(status_code=404, detail="Rehearsal not found")
     attendance = (
@@ -544,8 +673,10 @@ def register_attendance(
             Asistencia.miembro_id == payload.miembro_id,
             Asistencia.ensayo_id == payload.ensayo_id,
         )
+        .with_for_update()  # the stats delta depends on the previous value
         .first()
     )
+    previous = bool(attendance.presente) if attendance else None
     if attendance:
         attendance.presente = payload.presente
         attendance.justificacion = payload.justificacion
@@ -560,6 +691,7 @@ def register_attendance(
             registrado_por=current_admin.id,
         )
         db.add(attendance)
+    attendance_service.record_changes(db, rehearsal.fecha, [(member.id, previous, payload.presente)])
     db.commit()
     db.refresh(attendance)
     return attendance
@@ -599,13 +731,64 @@ def attendance_reports(
                 registrado_en=record.registrado_en,
             )
         )
-    return AdminAttendanceReportResponse(
+    return FastJSONResponse(AdminAttendanceReportResponse(
         total=total,
         presentes=present_count,
         ausentes=absent_count,
         porcentaje_presencia=porcentaje,
         records=structured,
+    ))
+
+
+@router.get(
+    "/attendance/stats",
+    response_model=AdminAttendanceStatsResponse,
+)
+def attendance_stats(
+    temporada: int = Query(ALL_SEASONS, ge=0, description="Año de la temporada (0 = todas)"),
+    orden: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    _admin: User = Depends(require_admin),
+):
+    """Active members ranked by attendance rate, read from the maintained counters."""
+    porcentaje = case(
+        (EstadisticaAsistencia.total > 0, EstadisticaAsistencia.presentes * 100.0 / EstadisticaAsistencia.total),
+        else_=0.0,
+    ).label("porcentaje")
+    query = (
+        db.query(
+            EstadisticaAsistencia.miembro_id,
+            User.nombre,
+            Miembro.voz,
+            EstadisticaAsistencia.total,
+            EstadisticaAsistencia.presentes,
+            porcentaje,
+        )
+        .join(Miembro, Miembro.id == EstadisticaAsistencia.miembro_id)
+        .join(User, User.id == Miembro.user_id)
+        .filter(EstadisticaAsistencia.temporada == temporada, Miembro.estado == "activo")
     )
+    total = query.count()
+    ranking = porcentaje.desc() if orden == "desc" else porcentaje.asc()
+    rows = query.order_by(ranking, User.nombre).offset(offset).limit(limit).all()
+    return FastJSONResponse(AdminAttendanceStatsResponse(
+        temporada=temporada,
+        total=total,
+        records=[
+            AdminAttendanceStatsRecord(
+                miembro_id=row.miembro_id,
+                miembro_nombre=row.nombre,
+                voz=row.voz,
+                total=row.total,
+                presentes=row.presentes,
+                ausentes=row.total - row.presentes,
+                porcentaje=float(row.porcentaje),
+            )
+            for row in rows
+        ],
+    ))
 
 
 @router.post(
@@ -632,55 +815,75 @@ def create_due(
         fecha_pago=None,
     )
     db.add(cuota)
+    db.flush()  # the ledger row references the cuota (sessions don't autoflush)
+    ledger_service.record_transitions(
+        db,
+        [CuotaTransition(cuota.id, cuota.miembro_id, Decimal(str(payload.monto)), None, "pendiente")],
+        created_by=current_admin.id,
+    )
     db.commit()
     db.refresh(cuota)
     return cuota
 
 
+@router.post(
+    "/finance/dues/bulk",
+    response_model=CuotaBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def generate_dues(
+    payload: CuotaBulkCreate,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(require_admin),
+):
+    """Create the period's cuota for every targeted member; existing ones are skipped."""
+    result = dues_service.generate(
+        db,
+        payload.periodo,
+        Decimal(str(payload.monto)),
+        current_admin.id,
+        tipo=payload.tipo,
+        descripcion=payload.descripcion,
+        fecha_vencimiento=payload.fecha_vencimiento,
+        estado_miembro=payload.estado_miembro,
+        voces=payload.voces,
+    )
+    db.commit()
+    return CuotaBulkResponse(**result._asdict())
+
+
 @router.get("/finance/cuotas", response_model=dict)
 def list_cuotas(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     status: Optional[str] = Query(None, pattern="^(pendiente|pagada|vencida)$"),
     memberId: Optional[UUID] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated cuota fields to return (default: all)"),
     db: Session = Depends(get_db),
     _admin: User = Depends(require_admin),
 ):
     """List all cuotas with pagination and filters."""
     offset = (page - 1) * limit
-    query = db.query(Cuota).join(Miembro).join(User, Miembro.user_id == User.id)
+    field_names = CUOTA_FIELDS.parse(fields)
+    query = db.query(*CUOTA_FIELDS.select(field_names)).select_from(Cuota)
+    if CUOTA_FIELDS.needs(field_names, User.__table__):
+        query = query.join(Miembro, Miembro.id == Cuota.miembro_id).join(User, Miembro.user_id == User.id)
     if status:
         query = query.filter(Cuota.estado == status)
     if memberId:
         query = query.filter(Cuota.miembro_id == memberId)
     total = query.count()
-    cuotas = (
+    rows = (
         query
         .order_by(Cuota.fecha_vencimiento.desc())
         .offset(offset)
         .limit(limit)
         .all()
     )
-    return {
-        "cuotas": [
-            {
-                "id": str(c.id),
-                "userId": str(c.miembro_id),
-                "miembro_id": str(c.miembro_id),
-                "miembro_nombre": c.miembro.user.nombre if c.miembro and c.miembro.user else "Desconocido",
-                "monto": float(c.monto),
-                "descripcion": c.descripcion,
-                "tipo": c.tipo,
-                "vencimiento": str(c.fecha_vencimiento),
-                "fecha_vencimiento": str(c.fecha_vencimiento),
-                "estado": c.estado,
-                "fecha_pago": str(c.fecha_pago) if c.fecha_pago else None,
-                "created_at": c.created_at.isoformat() if c.created_at else None,
-            }
-            for c in cuotas
-        ],
+    return FastJSONResponse({
+        "cuotas": [row._asdict() for row in rows],
         "total": total,
-    }
+    })
 
 
 @router.get("/finance/summary", response_model=dict)
@@ -689,29 +892,7 @@ def get_finance_summary(
     _admin: User = Depends(require_admin),
 ):
     """Get financial summary for admin dashboard."""
-    total_pagado = db.query(func.sum(Cuota.monto)).filter(
-        Cuota.estado == "pagada"
-    ).scalar() or Decimal(0)
-    
-    # Pendientes: solo las que no han vencido
-    total_pendiente = db.query(func.sum(Cuota.monto)).filter(
-        Cuota.estado == "pendiente",
-        Cuota.fecha_vencimiento >= date.today()
-    ).scalar() or Decimal(0)
-    
-    # Vencidas: las que tienen estado "vencida" o pendientes con fecha pasada
-    total_vencido = db.query(func.sum(Cuota.monto)).filter(
-        or_(
-            Cuota.estado == "vencida",
-            and_(Cuota.estado == "pendiente", Cuota.fecha_vencimiento < date.today())
-        )
-    ).scalar() or Decimal(0)
-    
-    return {
-        "totalIngresos": float(total_pagado),
-        "totalPendiente": float(total_pendiente),
-        "totalVencido": float(total_vencido),
-    }
+    return ledger_service.get_summary(db)
 
 
 @router.post(
@@ -721,20 +902,19 @@ def get_finance_summary(
 def mark_cuota_as_paid(
     cuota_id: UUID,
     db: Session = Depends(get_db),
-    _admin: User = Depends(require_admin),
+    current_admin: User = Depends(require_admin),
 ):
     """Mark a cuota as paid."""
-    cuota = db.query(Cuota).filter(Cuota.id == cuota_id).first()
+    cuota = db.query(Cuota).filter(Cuota.id == cuota_id).with_for_update().first()
     if not cuota:
         raise HTTPException(status_code=404, detail="Cuota not found")
-    cuota.estado = "pagada"
-    cuota.fecha_pago = date.today()
+    _pay_cuota(db, cuota, date.today(), current_admin.id)
     db.commit()
     db.refresh(cuota)
     return {
-        "id": str(cuota.id),
+        "id": cuota.id,
         "estado": cuota.estado,
-        "fecha_pago": str(cuota.fecha_pago),
+        "fecha_pago": cuota.fecha_pago,
     }
 
 
@@ -745,18 +925,28 @@ def mark_cuota_as_paid(
 def register_payment(
     payload: AdminFinancePaymentRequest,
     db: Session = Depends(get_db),
-    _admin: User = Depends(require_admin),
+    current_admin: User = Depends(require_admin),
 ):
-    cuota = db.query(Cuota).filter(Cuota.id == payload.cuota_id).first()
+    cuota = db.query(Cuota).filter(Cuota.id == payload.cuota_id).with_for_update().first()
     if not cuota:
         raise HTTPException(status_code=404, detail="Cuota not found")
-    cuota.estado = "pagada"
-    cuota.fecha_pago = payload.fecha_pago
+    _pay_cuota(db, cuota, payload.fecha_pago, current_admin.id)
     db.commit()
     db.refresh(cuota)
     return cuota
 
 
+def _pay_cuota(db: Session, cuota: Cuota, fecha_pago: date, paid_by: UUID) -> None:
+    previous = cuota.estado
+    cuota.estado = "pagada"
+    cuota.fecha_pago = fecha_pago
+    ledger_service.record_transitions(
+        db,
+        [CuotaTransition(cuota.id, cuota.miembro_id, cuota.monto, previous, "pagada")],
+        created_by=paid_by,
+    )
+
+
 @router.get(
     "/finance/reports",
     response_model=AdminFinanceReportResponse,
@@ -776,12 +966,12 @@ def finance_reports(
     def _sum_estado(estado: str) -> float:
         total = sum((cuota.monto for cuota in cuotas if cuota.estado == estado), Decimal(0))
         return float(total)
-    return AdminFinanceReportResponse(
+    return FastJSONResponse(AdminFinanceReportResponse(
         total_ingresos=_sum_estado("pagada"),
         total_pendiente=_sum_estado("pendiente"),
         total_vencido=_sum_estado("vencida"),
-        cuotas=cuotas,
-    )
+        cuotas=[CuotaResponse.model_validate(cuota) for cuota in cuotas],
+    ))
 
 
 # ==========================================
@@ -798,33 +988,16 @@ def get_dashboard_stats(
     total_members = db.query(Miembro).count()
     active_members = db.query(Miembro).filter(Miembro.estado == "activo").count()
 
-    # Events stats (upcoming)
-    upcoming_events = db.query(EventoPublico).filter(
-        EventoPublico.estado.in_(['planificado', 'en_curso']),
-        EventoPublico.fecha >= date.today()
-    ).count()
+    # Events stats (upcoming, from the events feed)
+    upcoming_events = events_feed_service.count_upcoming(db)
 
     # Rehearsals stats (upcoming)
-    upcoming_rehearsals = db.query(Ensayo).filter(
-        Ensayo.fecha >= date.today()
-    ).count()
+    upcoming_rehearsals = query_cache.execute(
+        db, select(func.count(Ensayo.id)).where(Ensayo.fecha >= date.today())
+    ).scalar()
 
     # Finance summary
-    total_pagado = db.query(func.sum(Cuota.monto)).filter(
-        Cuota.estado == "pagada"
-    ).scalar() or Decimal(0)
-
-    total_pendiente = db.query(func.sum(Cuota.monto)).filter(
-        Cuota.estado == "pendiente",
-        Cuota.fecha_vencimiento >= date.today()
-    ).scalar() or Decimal(0)
-
-    total_vencido = db.query(func.sum(Cuota.monto)).filter(
-        or_(
-            Cuota.estado == "vencida",
-            and_(Cuota.estado == "pendiente", Cuota.fecha_vencimiento < date.today())
-        )
-    ).scalar() or Decimal(0)
+    finance = ledger_service.get_summary(db)
 
     return {
         "totalMembers": total_members,
@@ -832,11 +1005,7 @@ def get_dashboard_stats(
         "inactiveMembers": total_members - active_members,
         "upcomingEvents": upcoming_events,
         "upcomingRehearsals": upcoming_rehearsals,
-        "finance": {
-            "totalIngresos": float(total_pagado),
-            "totalPendiente": float(total_pendiente),
-            "totalVencido": float(total_vencido),
-        },
+        "finance": finance,
     }
 
 
@@ -858,15 +1027,12 @@ async def list_gallery_images(
     """List gallery images with pagination and filters."""
     query = db.query(GalleryImage)
 
-    # Search filter (titulo or descripcion)
+    # Search filter (titulo or descripcion), best matches first
+    ordering = [GalleryImage.fecha.desc()]
     if search:
-        term = f"%{search.lower()}%"
-        query = query.filter(
-            or_(
-                func.lower(GalleryImage.titulo).like(term),
-                func.lower(GalleryImage.descripcion).like(term),
-            )
-        )
+        match = search_service.match(db, GALLERY_SEARCH_COLUMNS, search)
+        query = query.filter(match.condition)
+        ordering.insert(0, match.rank.desc())
 
     # Tags filter (AND logic: all tags must match)
     if tags:
@@ -882,18 +1048,18 @@ async def list_gallery_images(
 
     total = query.count()
     images = (
-        query.order_by(GalleryImage.fecha.desc())
+        query.order_by(*ordering)
         .offset(offset)
         .limit(limit)
         .all()
     )
 
-    return GalleryImageListResponse(
+    return FastJSONResponse(GalleryImageListResponse(
         total=total,
         limit=limit,
         offset=offset,
-        images=images,
-    )
+        images=[GalleryImageResponse.model_validate(image) for image in images],
+    ))
 
 
 @router.post(
@@ -956,6 +1122,7 @@ async def upload_gallery_image(
 
     db.add(gallery_image)
     db.commit()
+    await public_gallery_service.invalidate_shared()
     db.refresh(gallery_image)
 
     return GalleryImageUploadResponse(
@@ -992,6 +1159,7 @@ async def update_gallery_image(
 
     gallery_image.updated_at = datetime.utcnow()
     db.commit()
+    await public_gallery_service.invalidate_shared()
     db.refresh(gallery_image)
 
     return gallery_image
@@ -1056,6 +1224,7 @@ async def replace_gallery_image(
     gallery_image.updated_at = datetime.utcnow()
 
     db.commit()
+    await public_gallery_service.invalidate_shared()
     db.refresh(gallery_image)
 
     return gallery_image
@@ -1086,6 +1255,7 @@ async def delete_gallery_image(
     # Delete from database
     db.delete(gallery_image)
     db.commit()
+    await public_gallery_service.invalidate_shared()
 
     return Message(message="Gallery image deleted successfully")
 
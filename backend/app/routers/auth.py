@@ -6,12 +6,13 @@ Handles user registration, login, token refresh, and email verification
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_db
-from app.models import User, Role, UserRole
+from app.models import User, UserRole
 from app.schemas import (
     UserCreate,
     UserLogin,
@@ -22,14 +23,14 @@ from app.schemas import (
     Message,
 )
 from app.auth.jwt import (
-    create_access_token,
-    create_refresh_token,
     verify_token,
-    verify_password,
-    get_password_hash,
+    verify_token_cached,
     create_verification_token,
 )
-from app.auth.dependencies import get_current_active_user, get_user_roles
+from app.auth.dependencies import get_current_active_user, get_role_by_name, get_user_roles, oauth2_scheme
+from app.auth.token_store import issue_token_pair, revoke_family, rotate_refresh_token
+from app.auth.password_hasher import password_hasher
+from app.auth.throttle import client_ip, login_throttle
 from app.exceptions import (
     EmailAlreadyExistsError,
     AuthenticationError,
@@ -56,8 +57,26 @@ def _send_verification_email_task(email: str, token: str):
     asyncio.run(email_service.send_verification_email(email, token))
 
 
+def _get_user_by_email(db: Session, email: str) -> Optional[User]:
+    return db.query(User).filter(User.email == email).first()
+
+
+def _start_token_family(db: Session, user: User, roles: list[str]) -> tuple[str, str]:
+    """Issue the first access/refresh pair of a new login."""
+    access_token, refresh_token, _ = issue_token_pair(db, user, roles)
+    db.commit()
+    return access_token, refresh_token
+
+
+def _save_rehashed_password(db: Session, user: User, password_hash: str) -> None:
+    """Persist a password hash upgraded to the configured bcrypt cost."""
+    user.password_hash = password_hash
+    db.commit()
+    db.refresh(user)
+
+
 @router.post("/register", response_model=LoginResponse, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     user_data: UserCreate,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
@@ -66,17 +85,28 @@ def register(
     Register a new user.
     
     - Validates email uniqueness
-    - Hashes password
+    - Hashes password (on the dedicated password-hashing executor)
     - Creates user with default 'corista' role
     - Sends verification email (or logs URL in development)
     - Returns tokens and user data
     """
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await run_in_threadpool(_get_user_by_email, db, user_data.email)
     if existing_user:
         raise EmailAlreadyExistsError()
     
-    hashed_password = get_password_hash(user_data.password)
-    
+    hashed_password = await password_hasher.hash(user_data.password)
+    return await run_in_threadpool(
+        _create_registered_user, user_data, hashed_password, background_tasks, db
+    )
+
+
+def _create_registered_user(
+    user_data: UserCreate,
+    hashed_password: str,
+    background_tasks: BackgroundTasks,
+    db: Session,
+) -> LoginResponse:
+    """Create the user with its role and build the login response (runs in the threadpool)."""
     is_dev_mode = settings.ENVIRONMENT == "development"
     new_user = User(
         email=user_data.email,
@@ -90,10 +120,10 @@ def register(
     db.flush()
     
     role_name = "admin" if user_data.es_admin else "corista"
-    role = db.query(Role).filter(Role.nombre == role_name).first()
+    role = get_role_by_name(db, role_name)
     
     if not role:
-        default_role = db.query(Role).filter(Role.nombre == "corista").first()
+        default_role = get_role_by_name(db, "corista")
         if default_role:
             user_role = UserRole(user_id=new_user.id, role_id=default_role.id)
             db.add(user_role)
@@ -118,10 +148,8 @@ def register(
     
     user_roles = _get_user_roles(new_user, db)
     
-    access_token = create_access_token(
-        data={"sub": str(new_user.id), "roles": user_roles}
-    )
-    refresh_token = create_refresh_token(data={"sub": str(new_user.id)})
+    access_token, refresh_token, _ = issue_token_pair(db, new_user, user_roles)
+    db.commit()
     
     return LoginResponse(
         access_token=access_token,
@@ -141,32 +169,41 @@ def register(
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, request: Request, db: Session = Depends(get_db)):
     """
     Authenticate user and return tokens.
     
-    - Verifies email and password
+    - Rejects throttled IPs/emails before any password hashing
+    - Verifies email and password (on the dedicated password-hashing executor)
+    - Rehashes the password if it was stored with an outdated bcrypt cost
     - Checks if user is active
     - Generates access and refresh tokens
     - Returns tokens and user data
     """
-    user = db.query(User).filter(User.email == credentials.email).first()
+    ip = client_ip(request)
+    await run_in_threadpool(login_throttle.check, ip, credentials.email)
+    
+    user = await run_in_threadpool(_get_user_by_email, db, credentials.email)
     
     if not user:
+        await run_in_threadpool(login_throttle.record_failure, ip, credentials.email)
         raise AuthenticationError("Incorrect email or password")
     
-    if not verify_password(credentials.password, user.password_hash):
+    valid, new_hash = await password_hasher.verify_and_update(credentials.password, user.password_hash)
+    if not valid:
+        await run_in_threadpool(login_throttle.record_failure, ip, credentials.email)
         raise AuthenticationError("Incorrect email or password")
     
+    await run_in_threadpool(login_throttle.record_success, credentials.email)
+    
     if not user.is_active:
         raise InactiveUserError()
     
-    user_roles = _get_user_roles(user, db)
+    if new_hash:
+        await run_in_threadpool(_save_rehashed_password, db, user, new_hash)
     
-    access_token = create_access_token(
-        data={"sub": str(user.id), "roles": user_roles}
-    )
-    refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    user_roles = await run_in_threadpool(_get_user_roles, user, db)
+    access_token, refresh_token = await run_in_threadpool(_start_token_family, db, user, user_roles)
     
     return LoginResponse(
         access_token=access_token,
@@ -190,34 +227,12 @@ def refresh_token(request: RefreshTokenRequest, db: Session = Depends(get_db)):
     """
     Refresh access token using refresh token.
     
-    - Validates refresh token
-    - Generates new access token
+    - Validates refresh token against the server-side token store
+    - Rotates it (the presented token can no longer be used)
+    - Revokes the whole token family if a rotated token is reused
     - Returns new tokens
     """
-    try:
-        token_data = verify_token(request.refresh_token, token_type="refresh")
-    except InvalidTokenError:
-        raise AuthenticationError("Invalid refresh token")
-    
-    # Convert token user_id string to UUID for querying
-    try:
-        token_user_id = UUID(token_data.user_id)
-    except (ValueError, TypeError):
-        raise AuthenticationError("Invalid user id in token")
-    user = db.query(User).filter(User.id == token_user_id).first()
-    
-    if not user:
-        raise AuthenticationError("User not found")
-    
-    if not user.is_active:
-        raise InactiveUserError()
-    
-    user_roles = _get_user_roles(user, db)
-    
-    access_token = create_access_token(
-        data={"sub": str(user.id), "roles": user_roles}
-    )
-    new_refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    access_token, new_refresh_token = rotate_refresh_token(db, request.refresh_token)
     
     return Token(
         access_token=access_token,
@@ -287,12 +302,22 @@ def get_current_user_info(
 
 
 @router.post("/logout", response_model=Message)
-def logout(current_user: User = Depends(get_current_active_user)):
+def logout(
+    token: str = Depends(oauth2_scheme),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
     """
-    Logout user (client should discard tokens).
+    Logout user.
     
-    Note: With stateless JWT, server-side logout requires
-    a token blacklist. This endpoint exists for consistency
-    and future token blacklist implementation.
+    Revokes the token family of the presented access token: its refresh
+    tokens can no longer be used and its access tokens are rejected
+    until they expire.
     """
+    family_id = verify_token_cached(token, token_type="access").payload.get("fam")
+    if family_id:
+        try:
+            revoke_family(db, UUID(family_id))
+        except ValueError:
+            pass
     return Message(message="Successfully logged out")
@@ -0,0 +1,31 @@
+"""
+Health Router
+Liveness and readiness probes for load balancers and monitoring
+"""
+
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+from app.utils.health_checks import check_readiness
+
+router = APIRouter()
+
+
+@router.get("/health/live")
+async def liveness():
+    """Liveness probe: the process is up and serving requests. Never touches the database."""
+    return {"status": "ok", "environment": settings.ENVIRONMENT, "version": "1.0.0"}
+
+
+@router.get("/health/ready")
+async def readiness():
+    """
+    Readiness probe: database, storage and email provider checks.
+
+    Returns 503 when a critical dependency (the database) is unavailable.
+    Probe results are cached for a few seconds.
+    """
+    result = await check_readiness()
+    status_code = status.HTTP_200_OK if result["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(status_code=status_code, content=result)
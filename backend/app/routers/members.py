@@ -2,16 +2,20 @@
 Private APIs for corista zone: members, rehearsals, attendance, finance
 """
 from typing import List, Optional
+from dataclasses import replace
 from datetime import date
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_db
-from app.auth.dependencies import get_current_user
-from app.models import Miembro, Cuota, Ensayo, Asistencia
+from app.auth.dependencies import MemberContext, get_current_member, get_current_user
+from app.models import User, Miembro, Cuota, Ensayo, Asistencia, EstadisticaAsistencia, SaldoCuotas
 from app.schemas import (
+    MemberHomeResponse,
     MemberProfileResponse,
     MemberProfileUpdate,
     RehearsalResponse,
@@ -21,65 +25,156 @@ from app.schemas import (
     CuotaResponse,
     FinanceSummaryResponse,
 )
+from app.services.attendance_service import ALL_SEASONS, attendance_service, stats_payload
+from app.services.ledger_service import ledger_service, summary_payload
+from app.utils.invalidation_bus import Invalidation, invalidation_bus
+from app.utils.query_cache import query_cache
+from app.utils.responses import FastJSONResponse
+from app.utils.ttl_cache import TTLCache
 
 router = APIRouter()
 
+# Upcoming rehearsals kept in a cached home response; requests slice it
+MAX_HOME_REHEARSALS = 10
+
+# /members/me/home responses by user id
+member_home_cache: TTLCache[UUID, MemberHomeResponse] = TTLCache(
+    settings.MEMBER_HOME_CACHE_SIZE, settings.MEMBER_HOME_CACHE_TTL_SECONDS
+)
+
+# Tables a home response is built from
+MEMBER_HOME_TABLES = (
+    User.__tablename__,
+    Miembro.__tablename__,
+    Ensayo.__tablename__,
+    EstadisticaAsistencia.__tablename__,
+    SaldoCuotas.__tablename__,
+)
+
+
+def _invalidate_member_homes(message: Invalidation) -> None:
+    """Drop the homes a commit may have changed (only those users' when it wrote just ``users`` rows)."""
+    user_ids = message.ids(User.__tablename__)
+    if user_ids is not None and message.tables.keys() & set(MEMBER_HOME_TABLES) == {User.__tablename__}:
+        for user_id in user_ids:
+            member_home_cache.discard(UUID(user_id))
+    else:
+        member_home_cache.invalidate()
+
+
+invalidation_bus.subscribe(_invalidate_member_homes, tables=MEMBER_HOME_TABLES)
+
+
+def _profile_to_response(member: MemberContext) -> dict:
+    return {
+        "id": member.id,
+        "email": member.email,
+        "nombre": member.nombre,
+        "voz": member.voz,
+        "fecha_ingreso": member.fecha_ingreso,
+        "estado": member.estado,
+        "telefono": member.telefono,
+        "saldo_actual": member.saldo_actual,
+    }
+
+
+def _rehearsal_to_response(rehearsal: Ensayo) -> dict:
+    return {
+        "id": rehearsal.id,
+        "nombre": rehearsal.nombre,
+        "titulo": rehearsal.nombre,  # Backward compatibility
+        "fecha": rehearsal.fecha,
+        "hora": rehearsal.hora,
+        "horaInicio": rehearsal.hora,  # Backward compatibility
+        "lugar": rehearsal.lugar,
+        "tipo": rehearsal.tipo,
+        "descripcion": rehearsal.descripcion,
+    }
+
+
+def _upcoming_rehearsals():
+    """Rehearsals from today on, soonest first (run through the query cache)."""
+    return select(Ensayo).where(Ensayo.fecha >= date.today()).order_by(Ensayo.fecha.asc())
+
+
+def _load_member_home(db: Session, member: MemberContext) -> MemberHomeResponse:
+    """
+    Attendance counters and cuota totals in one statement (both keyed by the
+    member), plus one query for the upcoming rehearsals.
+    """
+    row = (
+        db.query(EstadisticaAsistencia, SaldoCuotas)
+        .select_from(Miembro)
+        .outerjoin(
+            EstadisticaAsistencia,
+            and_(
+                EstadisticaAsistencia.miembro_id == Miembro.id,
+                EstadisticaAsistencia.temporada == ALL_SEASONS,
+            ),
+        )
+        .outerjoin(SaldoCuotas, SaldoCuotas.miembro_id == Miembro.id)
+        .filter(Miembro.id == member.id)
+        .first()
+    )
+    if row is None:
+        # Profile deleted since the member was resolved
+        raise HTTPException(status_code=404, detail="Member profile not found")
+    stats, saldo = row
+    rehearsals = query_cache.execute(
+        db, _upcoming_rehearsals().limit(MAX_HOME_REHEARSALS)
+    ).scalars().all()
+    return MemberHomeResponse(
+        perfil=_profile_to_response(member),
+        proximos_ensayos=[_rehearsal_to_response(r) for r in rehearsals],
+        asistencia=stats_payload(stats.total if stats else 0, stats.presentes if stats else 0),
+        finanzas=summary_payload(saldo),
+    )
+
 # ==========================================
 # Members: Profile endpoints (T037-T038)
 # ==========================================
 
 @router.get("/members/me", response_model=MemberProfileResponse)
 def get_my_profile(
-    current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    member: MemberContext = Depends(get_current_member),
 ):
     """
     Retrieve profile of the authenticated member.
     """
-    member = db.query(Miembro).filter(Miembro.user_id == current_user.id).first()
-    if not member:
-        raise HTTPException(status_code=404, detail="Member profile not found")
-    user = member.user
-    return {
-        "id": member.id,
-        "email": user.email,
-        "nombre": user.nombre,
-        "voz": member.voz,
-        "fecha_ingreso": member.fecha_ingreso,
-        "estado": member.estado,
-        "telefono": member.telefono,
-        "saldo_actual": member.saldo_actual,
-    }
+    return _profile_to_response(member)
+
+@router.get("/members/me/home", response_model=MemberHomeResponse)
+def get_my_home(
+    ensayos: int = Query(5, ge=1, le=MAX_HOME_REHEARSALS, description="Upcoming rehearsals to include"),
+    member: MemberContext = Depends(get_current_member),
+    db: Session = Depends(get_db),
+):
+    """
+    Profile, next rehearsals, attendance stats and finance summary of the
+    authenticated member in one request. Cached briefly per member.
+    """
+    home = member_home_cache.get(member.user_id)
+    if home is None:
+        generation = member_home_cache.generation
+        home = _load_member_home(db, member)
+        member_home_cache.set(member.user_id, home, generation)
+    return FastJSONResponse(home.model_copy(update={"proximos_ensayos": home.proximos_ensayos[:ensayos]}))
 
 @router.put("/members/me", response_model=MemberProfileResponse)
 def update_my_profile(
     profile_update: MemberProfileUpdate,
-    current_user=Depends(get_current_user),
+    member: MemberContext = Depends(get_current_member),
     db: Session = Depends(get_db),
 ):
     """
     Update phone and voice of the authenticated member.
     """
-    member = db.query(Miembro).filter(Miembro.user_id == current_user.id).first()
-    if not member:
-        raise HTTPException(status_code=404, detail="Member profile not found")
-    if profile_update.telefono is not None:
-        member.telefono = profile_update.telefono
-    if profile_update.voz is not None:
-        member.voz = profile_update.voz
-    db.commit()
-    db.refresh(member)
-    user = member.user
-    return {
-        "id": member.id,
-        "email": user.email,
-        "nombre": user.nombre,
-        "voz": member.voz,
-        "fecha_ingreso": member.fecha_ingreso,
-        "estado": member.estado,
-        "telefono": member.telefono,
-        "saldo_actual": member.saldo_actual,
-    }
+    changes = profile_update.model_dump(include={"telefono", "voz"}, exclude_none=True)
+    if changes:
+        db.query(Miembro).filter(Miembro.id == member.id).update(changes, synchronize_session=False)
+        db.commit()
+        member_home_cache.discard(member.user_id)
+    return _profile_to_response(replace(member, **changes))
 
 # ==========================================
 # Rehearsals endpoints (T039-T040)
@@ -97,36 +192,22 @@ def list_rehearsals(
     """
     List upcoming rehearsals within optional date range.
     """
-    query = db.query(Ensayo).filter(Ensayo.fecha >= date.today())
+    statement = _upcoming_rehearsals()
     if desde:
-        query = query.filter(Ensayo.fecha >= desde)
+        statement = statement.where(Ensayo.fecha >= desde)
     if hasta:
-        query = query.filter(Ensayo.fecha <= hasta)
-    query = query.order_by(Ensayo.fecha.asc())
+        statement = statement.where(Ensayo.fecha <= hasta)
     if offset:
-        query = query.offset(offset)
+        statement = statement.offset(offset)
     if limit:
-        query = query.limit(limit)
-    rehearsals = query.all()
-    return [
-        {
-            "id": r.id,
-            "nombre": r.nombre,
-            "titulo": r.nombre,  # Backward compatibility
-            "fecha": r.fecha,
-            "hora": r.hora,
-            "horaInicio": r.hora,  # Backward compatibility
-            "lugar": r.lugar,
-            "tipo": r.tipo,
-            "descripcion": r.descripcion,
-        }
-        for r in rehearsals
-    ]
+        statement = statement.limit(limit)
+    rehearsals = query_cache.execute(db, statement).scalars().all()
+    return FastJSONResponse([RehearsalResponse(**_rehearsal_to_response(r)) for r in rehearsals])
 
 @router.get("/rehearsals/{rehearsal_id}", response_model=RehearsalDetailResponse)
 def get_rehearsal_detail(
     rehearsal_id: UUID,
-    current_user=Depends(get_current_user),
+    member: MemberContext = Depends(get_current_member),
     db: Session = Depends(get_db),
 ):
     """
@@ -135,9 +216,6 @@ def get_rehearsal_detail(
     rehearsal = db.query(Ensayo).filter(Ensayo.id == rehearsal_id).first()
     if not rehearsal:
         raise HTTPException(status_code=404, detail="Rehearsal not found")
-    member = db.query(Miembro).filter(Miembro.user_id == current_user.id).first()
-    if not member:
-        raise HTTPException(status_code=404, detail="Member profile not found")
     attendance = (
         db.query(Asistencia)
         .filter(Asistencia.ensayo_id == rehearsal_id, Asistencia.miembro_id == member.id)
@@ -169,55 +247,41 @@ def get_rehearsal_detail(
 def list_my_attendance(
     limit: Optional[int] = Query(None, ge=1),
     offset: int = Query(0, ge=0),
-    current_user=Depends(get_current_user),
+    member: MemberContext = Depends(get_current_member),
     db: Session = Depends(get_db),
 ):
     """
     List attendance records for the authenticated member.
     """
-    member = db.query(Miembro).filter(Miembro.user_id == current_user.id).first()
-    if not member:
-        raise HTTPException(status_code=404, detail="Member profile not found")
     query = db.query(Asistencia).filter(Asistencia.miembro_id == member.id).order_by(Asistencia.registrado_en.desc())
     if offset:
         query = query.offset(offset)
     if limit:
         query = query.limit(limit)
     records = query.all()
-    return [
-        {
-            "id": r.id,
-            "ensayo_id": r.ensayo_id,
-            "ensayo_nombre": r.ensayo.nombre,
-            "ensayo_fecha": r.ensayo.fecha,
-            "presente": r.presente,
-            "justificacion": r.justificacion,
-            "registrado_en": r.registrado_en,
-        }
+    return FastJSONResponse([
+        AttendanceResponse(
+            id=r.id,
+            ensayo_id=r.ensayo_id,
+            ensayo_nombre=r.ensayo.nombre,
+            ensayo_fecha=r.ensayo.fecha,
+            presente=r.presente,
+            justificacion=r.justificacion,
+            registrado_en=r.registrado_en,
+        )
         for r in records
-    ]
+    ])
 
 @router.get("/attendance/me/stats", response_model=AttendanceStatsResponse)
 def get_my_attendance_stats(
-    current_user=Depends(get_current_user),
+    temporada: int = Query(ALL_SEASONS, ge=0, description="Año de la temporada (0 = todas)"),
+    member: MemberContext = Depends(get_current_member),
     db: Session = Depends(get_db),
 ):
     """
     Get attendance statistics for the authenticated member.
     """
-    member = db.query(Miembro).filter(Miembro.user_id == current_user.id).first()
-    if not member:
-        raise HTTPException(status_code=404, detail="Member profile not found")
-    total = db.query(Asistencia).filter(Asistencia.miembro_id == member.id).count()
-    asistencias = db.query(Asistencia).filter(Asistencia.miembro_id == member.id, Asistencia.presente.is_(True)).count()
-    inasistencias = db.query(Asistencia).filter(Asistencia.miembro_id == member.id, Asistencia.presente.is_(False)).count()
-    porcentaje = float((asistencias / total) * 100) if total > 0 else 0.0
-    return {
-        "total_ensayos": total,
-        "asistencias": asistencias,
-        "inasistencias": inasistencias,
-        "porcentaje": porcentaje,
-    }
+    return attendance_service.get_stats(db, member.id, temporada)
 
 
 @router.get("/finance/me", response_model=List[CuotaResponse])
@@ -227,78 +291,42 @@ def list_my_fees(
         pattern="^(pendiente|pagada|vencida)$",
         description="Filter by fee status"
     ),
-    current_user=Depends(get_current_user),
+    member: MemberContext = Depends(get_current_member),
     db: Session = Depends(get_db),
 ):
     """
     List fees for the authenticated member.
     """
-    member = db.query(Miembro).filter(Miembro.user_id == current_user.id).first()
-    if not member:
-        raise HTTPException(status_code=404, detail="Member profile not found")
     query = db.query(Cuota).filter(Cuota.miembro_id == member.id)
     if estado:
         query = query.filter(Cuota.estado == estado)
     fees = query.order_by(Cuota.fecha_vencimiento.asc()).all()
-    return fees
+    return FastJSONResponse([CuotaResponse.model_validate(fee) for fee in fees])
 
 
 @router.get("/finance/me/history", response_model=List[CuotaResponse])
 def payment_history(
-    current_user=Depends(get_current_user),
+    member: MemberContext = Depends(get_current_member),
     db: Session = Depends(get_db),
 ):
     """
     Retrieve payment history (paid fees) for the authenticated member.
     """
-    member = db.query(Miembro).filter(Miembro.user_id == current_user.id).first()
-    if not member:
-        raise HTTPException(status_code=404, detail="Member profile not found")
     paid = (
         db.query(Cuota)
         .filter(Cuota.miembro_id == member.id, Cuota.estado == "pagada")
         .order_by(Cuota.fecha_pago.desc())
         .all()
     )
-    return paid
+    return FastJSONResponse([CuotaResponse.model_validate(fee) for fee in paid])
 
 
 @router.get("/finance/me/summary", response_model=FinanceSummaryResponse)
 def get_finance_summary(
-    current_user=Depends(get_current_user),
+    member: MemberContext = Depends(get_current_member),
     db: Session = Depends(get_db),
 ):
     """
     Get financial summary for the authenticated member.
     """
-    from sqlalchemy import func
-    from decimal import Decimal
-    
-    member = db.query(Miembro).filter(Miembro.user_id == current_user.id).first()
-    if not member:
-        raise HTTPException(status_code=404, detail="Member profile not found")
-    
-    # Calculate totals by status
-    total_pagado = db.query(func.sum(Cuota.monto)).filter(
-        Cuota.miembro_id == member.id,
-        Cuota.estado == "pagada"
-    ).scalar() or Decimal(0)
-    
-    total_pendiente = db.query(func.sum(Cuota.monto)).filter(
-        Cuota.miembro_id == member.id,
-        Cuota.estado == "pendiente"
-    ).scalar() or Decimal(0)
-    
-    # Vencidas are pendientes with fecha_vencimiento < today
-    from datetime import date as today_date
-    total_vencido = db.query(func.sum(Cuota.monto)).filter(
-        Cuota.miembro_id == member.id,
-        Cuota.estado == "pendiente",
-        Cuota.fecha_vencimiento < today_date.today()
-    ).scalar() or Decimal(0)
-    
-    return {
-        "totalIngresos": float(total_pagado),
-        "totalPendiente": float(total_pendiente),
-        "totalVencido": float(total_vencido),
-    }
+    return ledger_service.get_summary(db, member.id)
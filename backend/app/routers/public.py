@@ -4,21 +4,27 @@ import html
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, select
 
 from app.database import get_db
-from app.models import EventoPublico, Comunicado, GalleryImage
+from app.models import EventoPublico, Comunicado
 from app.schemas import (
     EventoPublicoResponse,
     ComunicadoResponse,
     PageResponse,
-    GalleryImageListResponse,
+    PublicGalleryListResponse,
     ChoirInterestRequest,
     ServiceQuoteRequest,
     Message,
 )
 from app.services.email_service import email_service
+from app.services.events_feed_service import events_feed_service
+from app.services.public_gallery_service import PUBLIC_FIELDS, public_gallery_service
 from app.config import settings
+from app.utils.compression import PrecompressedResponse
+from app.utils.query_cache import query_cache
+from app.utils.responses import FastJSONResponse
+from app.utils.single_flight import public_reads
 
 router = APIRouter()
 
@@ -30,22 +36,14 @@ def list_public_events(
     db: Session = Depends(get_db),
 ):
     """List public events with optional state filter.
-    Default: only 'planificado' or 'en_curso', ordered by date ascending (upcoming first)."""
-    from datetime import date
-    query = db.query(EventoPublico)
-    if estado:
-        query = query.filter(EventoPublico.estado == estado)
-    else:
-        query = query.filter(EventoPublico.estado.in_(['planificado', 'en_curso']))
-    # Only show future events and order by date ascending (upcoming first)
-    query = query.filter(EventoPublico.fecha >= date.today())
-    events = query.order_by(EventoPublico.fecha.asc()).offset(offset).limit(limit).all()
-    return events
+    Default: only 'planificado' or 'en_curso', ordered by date ascending (upcoming first).
+    Served from the in-memory upcoming events feed."""
+    return events_feed_service.list_events(db, estado=estado, offset=offset, limit=limit)
 
 @router.get("/events/{event_id}", response_model=EventoPublicoResponse)
 def get_public_event(event_id: UUID, db: Session = Depends(get_db)):
     """Get full details of a public event by ID."""
-    event = db.query(EventoPublico).filter(EventoPublico.id == event_id).first()
+    event = query_cache.execute(db, select(EventoPublico).where(EventoPublico.id == event_id)).scalars().first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return event
@@ -56,16 +54,20 @@ def list_public_news(
     offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
 ):
-    """List public news/communications directed to all."""
-    news = (
-        db.query(Comunicado)
-        .filter(Comunicado.dirigido_a == "todos")
-        .order_by(Comunicado.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
-    return news
+    """List public news/communications directed to all.
+    Identical concurrent requests share one query."""
+    def load() -> list[ComunicadoResponse]:
+        news = (
+            db.query(Comunicado)
+            .filter(Comunicado.dirigido_a == "todos")
+            .order_by(Comunicado.created_at.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        return [ComunicadoResponse.model_validate(item) for item in news]
+
+    return FastJSONResponse(public_reads.do(("news", offset, limit), load))
 
 @router.get("/pages/{slug}", response_model=PageResponse)
 def get_public_page(slug: str):
@@ -82,36 +84,20 @@ def get_public_page(slug: str):
     return {"slug": slug, "title": page["title"], "content": page["content"]}
 
 
-@router.get("/gallery", response_model=GalleryImageListResponse)
+@router.get("/gallery", response_model=PublicGalleryListResponse)
 def get_public_gallery(
     limit: int = Query(100, ge=1, le=200),
     offset: int = Query(0, ge=0),
     tags: Optional[str] = Query(None, description="Comma-separated tags for filtering"),
+    fields: Optional[str] = Query(None, description="Comma-separated image fields to return (default: all)"),
     db: Session = Depends(get_db),
 ):
-    """Get public gallery images with optional tag filtering."""
-    query = db.query(GalleryImage)
-
-    # Tags filter (AND logic: all tags must match)
-    if tags:
-        tag_list = [t.strip() for t in tags.split(",") if t.strip()]
-        for tag in tag_list:
-            query = query.filter(GalleryImage.tags.contains([tag]))
-
-    total = query.count()
-    images = (
-        query.order_by(GalleryImage.fecha.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
-
-    return GalleryImageListResponse(
-        total=total,
-        limit=limit,
-        offset=offset,
-        images=images,
-    )
+    """Get public gallery images with optional tag filtering (all tags must match).
+    Pages are served from the public gallery read model."""
+    tag_list = [t.strip() for t in tags.split(",") if t.strip()] if tags else []
+    field_names = PUBLIC_FIELDS.parse(fields)
+    page = public_gallery_service.get_page(db, tag_list, offset, limit, field_names)
+    return PrecompressedResponse(page)
 
 
 @router.post("/choir-interest", response_model=Message)
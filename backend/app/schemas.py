@@ -264,6 +264,14 @@ class AsistenciaUpdate(BaseModel):
     justificacion: Optional[str] = None
 
 
+class AsistenciaBulkItem(AsistenciaBase):
+    miembro_id: UUID
+
+
+class AsistenciaBulkUpdate(BaseModel):
+    registros: list[AsistenciaBulkItem] = Field(..., min_length=1, max_length=500)
+
+
 # ============================================================
 # FINANCE (CUOTA) SCHEMAS
 # ============================================================
@@ -284,12 +292,29 @@ class CuotaResponse(CuotaBase):
     miembro_id: UUID
     estado: str
     fecha_pago: Optional[date] = None
+    periodo: Optional[str] = None
     created_by: Optional[UUID] = None
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class CuotaBulkCreate(BaseModel):
+    periodo: str = Field(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="YYYY-MM")
+    monto: float = Field(..., gt=0)
+    descripcion: Optional[str] = Field(None, max_length=255)
+    tipo: str = Field("regular", pattern="^(regular|extraordinaria)$")
+    fecha_vencimiento: Optional[date] = Field(None, description="Defaults to the last day of the period")
+    estado_miembro: str = Field("activo", pattern="^(activo|inactivo|suspendido)$")
+    voces: Optional[list[str]] = None
+
+
+class CuotaBulkResponse(BaseModel):
+    periodo: str
+    creadas: int
+    omitidas: int
+
+
 class FinanceSummaryResponse(BaseModel):
     """Summary of member's financial status"""
     totalIngresos: float = Field(..., description="Total amount paid")
@@ -297,6 +322,14 @@ class FinanceSummaryResponse(BaseModel):
     totalVencido: float = Field(..., description="Total overdue amount")
 
 
+class MemberHomeResponse(BaseModel):
+    """Everything the corista zone home shows, in one response"""
+    perfil: MemberProfileResponse
+    proximos_ensayos: list[RehearsalResponse]
+    asistencia: AttendanceStatsResponse
+    finanzas: FinanceSummaryResponse
+
+
 class CuotaUpdate(BaseModel):
     monto: Optional[float] = Field(None, gt=0)
     descripcion: Optional[str] = Field(None, max_length=255)
@@ -361,6 +394,22 @@ class AdminAttendanceReportResponse(BaseModel):
     records: list[AdminAttendanceReportRecord]
 
 
+class AdminAttendanceStatsRecord(BaseModel):
+    miembro_id: UUID
+    miembro_nombre: str
+    voz: str
+    total: int
+    presentes: int
+    ausentes: int
+    porcentaje: float
+
+
+class AdminAttendanceStatsResponse(BaseModel):
+    temporada: int
+    total: int
+    records: list[AdminAttendanceStatsRecord]
+
+
 class AdminFinancePaymentRequest(BaseModel):
     cuota_id: UUID
     fecha_pago: date
@@ -531,6 +580,26 @@ class GalleryImageListResponse(BaseModel):
     images: list[GalleryImageResponse]
 
 
+class PublicGalleryImage(BaseModel):
+    """Gallery image as shown on the public page (no audit columns)."""
+    id: UUID
+    titulo: str
+    descripcion: Optional[str] = None
+    fecha: date
+    tags: list[str] = []
+    image_url: str
+    thumbnail_url: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PublicGalleryListResponse(BaseModel):
+    total: int
+    limit: int
+    offset: int
+    images: list[PublicGalleryImage]
+
+
 class GalleryImageUploadResponse(BaseModel):
     message: str
     image: GalleryImageResponse
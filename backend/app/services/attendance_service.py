@@ -0,0 +1,267 @@
+"""
+Attendance Service
+Roll-call writes for rehearsals and the per-member attendance counters.
+
+A whole rehearsal roster is applied with a single
+``INSERT ... ON CONFLICT (miembro_id, ensayo_id) DO UPDATE`` instead of a
+lookup and commit per member.
+
+Every attendance write also applies its delta to ``estadisticas_asistencia``
+(one row per member and season plus an all-seasons row), so attendance
+stats are read from a single row instead of counting ``asistencias``.
+Writers that bypass this service can be reconciled with
+``scripts/rebuild_attendance_stats.py``.
+"""
+
+import logging
+import uuid
+from datetime import date, datetime
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import Integer, case, cast, extract, func, literal, select
+from sqlalchemy.orm import Session
+
+from app.models import Asistencia, Ensayo, EstadisticaAsistencia
+from app.schemas import AsistenciaBulkItem
+from app.utils.db_utils import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+# temporada value of the row holding totals across all seasons
+ALL_SEASONS = 0
+
+# (miembro_id, presente before, presente after); None means no record
+AttendanceChange = tuple[UUID, Optional[bool], Optional[bool]]
+
+
+def season_of(fecha: date) -> int:
+    """Season a rehearsal belongs to (its calendar year)."""
+    return fecha.year
+
+
+def stats_payload(total: int, presentes: int) -> dict:
+    """AttendanceStatsResponse fields for a pair of counters."""
+    return {
+        "total_ensayos": total,
+        "asistencias": presentes,
+        "inasistencias": total - presentes,
+        "porcentaje": float(presentes / total * 100) if total else 0.0,
+    }
+
+
+def lock_rehearsal(db: Session, ensayo_id: UUID) -> None:
+    """
+    Lock a rehearsal's row until the transaction ends.
+
+    Every attendance write takes this lock before reading the previous
+    presente values it derives stats deltas from.
+    """
+    db.query(Ensayo.id).filter(Ensayo.id == ensayo_id).with_for_update().first()
+
+
+class AttendanceService:
+    """Service for registering rehearsal attendance"""
+
+    def upsert_roster(
+        self,
+        db: Session,
+        ensayo_id: UUID,
+        fecha: date,
+        registros: Iterable[AsistenciaBulkItem],
+        registrado_por: UUID,
+    ) -> int:
+        """
+        Insert or update attendance for many members of one rehearsal.
+
+        The caller validates the rehearsal and members and commits.
+        If a member appears more than once, the last entry wins.
+
+        Args:
+            db: Database session
+            ensayo_id: Rehearsal id
+            fecha: Rehearsal date (selects the stats season)
+            registros: Attendance entries (miembro_id, presente, justificacion)
+            registrado_por: Admin user recording the roll-call
+
+        Returns:
+            Number of attendance rows written
+        """
+        now = datetime.utcnow()
+        latest = {registro.miembro_id: registro for registro in registros}
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "miembro_id": miembro_id,
+                "ensayo_id": ensayo_id,
+                "presente": registro.presente,
+                "justificacion": registro.justificacion,
+                "registrado_por": registrado_por,
+                "registrado_en": now,
+            }
+            for miembro_id, registro in latest.items()
+        ]
+        if not rows:
+            return 0
+
+        # Row locks only cover existing rows; locking the rehearsal serialises
+        # roll-calls that would both insert a member's first row and count it twice
+        lock_rehearsal(db, ensayo_id)
+        previous = dict(
+            db.query(Asistencia.miembro_id, Asistencia.presente)
+            .filter(Asistencia.ensayo_id == ensayo_id, Asistencia.miembro_id.in_(latest))
+            .with_for_update()
+            .all()
+        )
+
+        insert = dialect_insert(db)
+        if insert is None:
+            logger.warning("Dialect without ON CONFLICT support, falling back to per-row merge")
+            self._merge_rows(db, ensayo_id, rows)
+        else:
+            stmt = insert(Asistencia).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Asistencia.miembro_id, Asistencia.ensayo_id],
+                set_={
+                    "presente": stmt.excluded.presente,
+                    "justificacion": stmt.excluded.justificacion,
+                    "registrado_por": stmt.excluded.registrado_por,
+                    "registrado_en": stmt.excluded.registrado_en,
+                },
+            )
+            db.execute(stmt)
+
+        self.record_changes(db, fecha, [
+            (row["miembro_id"], _presence(previous, row["miembro_id"]), row["presente"])
+            for row in rows
+        ])
+        return len(rows)
+
+    def _merge_rows(self, db: Session, ensayo_id: UUID, rows: list[dict]) -> None:
+        existing = {
+            attendance.miembro_id: attendance
+            for attendance in db.query(Asistencia).filter(
+                Asistencia.ensayo_id == ensayo_id,
+                Asistencia.miembro_id.in_([row["miembro_id"] for row in rows]),
+            )
+        }
+        for row in rows:
+            attendance = existing.get(row["miembro_id"])
+            if attendance is None:
+                db.add(Asistencia(**row))
+                continue
+            for field in ("presente", "justificacion", "registrado_por", "registrado_en"):
+                setattr(attendance, field, row[field])
+
+    def record_changes(self, db: Session, fecha: date, changes: Iterable[AttendanceChange]) -> None:
+        """
+        Apply attendance changes of one rehearsal to the member counters.
+
+        Args:
+            db: Database session (committed by the caller)
+            fecha: Rehearsal date
+            changes: (miembro_id, presente before, presente after), None for no record
+        """
+        deltas: dict[tuple[UUID, int], list[int]] = {}
+        for miembro_id, before, after in changes:
+            for temporada in (ALL_SEASONS, season_of(fecha)):
+                delta = deltas.setdefault((miembro_id, temporada), [0, 0])
+                delta[0] += (after is not None) - (before is not None)
+                delta[1] += bool(after) - bool(before)
+        self._apply_deltas(db, deltas)
+
+    def forget_rehearsal(self, db: Session, ensayo_id: UUID, fecha: date) -> None:
+        """Remove a rehearsal's attendance from the counters before it is deleted."""
+        records = (
+            db.query(Asistencia.miembro_id, Asistencia.presente)
+            .filter(Asistencia.ensayo_id == ensayo_id)
+            .all()
+        )
+        self.record_changes(db, fecha, [(miembro_id, bool(presente), None) for miembro_id, presente in records])
+
+    def move_rehearsal(self, db: Session, ensayo_id: UUID, old_fecha: date, new_fecha: date) -> None:
+        """Move a rehearsal's attendance to another season when its date changes."""
+        if season_of(old_fecha) == season_of(new_fecha):
+            return
+        records = (
+            db.query(Asistencia.miembro_id, Asistencia.presente)
+            .filter(Asistencia.ensayo_id == ensayo_id)
+            .all()
+        )
+        self.record_changes(db, old_fecha, [(m, bool(p), None) for m, p in records])
+        self.record_changes(db, new_fecha, [(m, None, bool(p)) for m, p in records])
+
+    def _apply_deltas(self, db: Session, deltas: dict[tuple[UUID, int], list[int]]) -> None:
+        now = datetime.utcnow()
+        rows = [
+            {"miembro_id": miembro_id, "temporada": temporada, "total": total, "presentes": presentes, "updated_at": now}
+            for (miembro_id, temporada), (total, presentes) in deltas.items()
+            if total or presentes
+        ]
+        if not rows:
+            return
+
+        insert = dialect_insert(db)
+        if insert is None:
+            for row in rows:
+                stats = db.get(EstadisticaAsistencia, (row["miembro_id"], row["temporada"]))
+                if stats is None:
+                    db.add(EstadisticaAsistencia(**row))
+                else:
+                    stats.total += row["total"]
+                    stats.presentes += row["presentes"]
+                    stats.updated_at = now
+            return
+
+        stmt = insert(EstadisticaAsistencia).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EstadisticaAsistencia.miembro_id, EstadisticaAsistencia.temporada],
+            set_={
+                "total": EstadisticaAsistencia.total + stmt.excluded.total,
+                "presentes": EstadisticaAsistencia.presentes + stmt.excluded.presentes,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        db.execute(stmt)
+
+    def get_stats(self, db: Session, miembro_id: UUID, temporada: int = ALL_SEASONS) -> dict:
+        """Attendance counters of a member for a season (all seasons by default)."""
+        stats = db.get(EstadisticaAsistencia, (miembro_id, temporada))
+        return stats_payload(stats.total if stats else 0, stats.presentes if stats else 0)
+
+    def rebuild_stats(self, db: Session) -> int:
+        """
+        Recompute every counter from ``asistencias`` (backfill / drift repair).
+        The caller commits.
+
+        Returns:
+            Number of counter rows written
+        """
+        db.query(EstadisticaAsistencia).delete(synchronize_session=False)
+        now = datetime.utcnow()
+        presentes = func.sum(case((Asistencia.presente.is_(True), 1), else_=0))
+        temporada = cast(extract("year", Ensayo.fecha), Integer)
+        columns = ["miembro_id", "temporada", "total", "presentes", "updated_at"]
+
+        per_season = (
+            select(Asistencia.miembro_id, temporada, func.count(), presentes, literal(now))
+            .join(Ensayo, Ensayo.id == Asistencia.ensayo_id)
+            .group_by(Asistencia.miembro_id, temporada)
+        )
+        all_seasons = (
+            select(Asistencia.miembro_id, literal(ALL_SEASONS), func.count(), presentes, literal(now))
+            .join(Ensayo, Ensayo.id == Asistencia.ensayo_id)
+            .group_by(Asistencia.miembro_id)
+        )
+        table = EstadisticaAsistencia.__table__
+        written = 0
+        for query in (per_season, all_seasons):
+            written += db.execute(table.insert().from_select(columns, query)).rowcount
+        return written
+
+
+def _presence(previous: dict, miembro_id: UUID) -> Optional[bool]:
+    return bool(previous[miembro_id]) if miembro_id in previous else None
+
+
+attendance_service = AttendanceService()
@@ -0,0 +1,166 @@
+"""
+Dues Service
+Bulk generation of recurring cuotas.
+
+Target members are selected in SQL and all cuotas of a period are written
+with one multi-row ``INSERT ... ON CONFLICT DO NOTHING`` on the natural key
+(miembro_id, tipo, periodo), so re-running a period only creates the
+cuotas that are missing. Created cuotas go through the balance ledger in
+the same transaction.
+
+``mark_overdue`` is run daily by the scheduler so that overdue cuotas are
+stored as ``vencida`` instead of being derived from the due date.
+"""
+
+import calendar
+import logging
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.models import Cuota, Miembro
+from app.services.ledger_service import CuotaTransition, ledger_service
+from app.utils.db_utils import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+
+class DuesGenerationResult(NamedTuple):
+    periodo: str
+    creadas: int
+    omitidas: int
+
+
+def period_end(periodo: str) -> date:
+    """Last day of a YYYY-MM period."""
+    year, month = (int(part) for part in periodo.split("-"))
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
+class DuesService:
+    """Service for generating recurring dues"""
+
+    def generate(
+        self,
+        db: Session,
+        periodo: str,
+        monto: Decimal,
+        created_by: UUID,
+        *,
+        tipo: str = "regular",
+        descripcion: Optional[str] = None,
+        fecha_vencimiento: Optional[date] = None,
+        estado_miembro: str = "activo",
+        voces: Optional[list[str]] = None,
+    ) -> DuesGenerationResult:
+        """
+        Create one cuota per target member for a period. The caller commits.
+
+        Args:
+            db: Database session
+            periodo: Period as YYYY-MM
+            monto: Amount of every cuota
+            created_by: Admin user generating the dues
+            tipo: Cuota tipo (part of the natural key)
+            descripcion: Defaults to "Cuota <periodo>"
+            fecha_vencimiento: Defaults to the last day of the period
+            estado_miembro: Member estado to target
+            voces: Restrict to these voices
+
+        Returns:
+            Period with the number of cuotas created and skipped (already present)
+        """
+        query = db.query(Miembro.id).filter(Miembro.estado == estado_miembro)
+        if voces:
+            query = query.filter(Miembro.voz.in_(voces))
+        member_ids = [row.id for row in query.all()]
+        if not member_ids:
+            return DuesGenerationResult(periodo, 0, 0)
+
+        monto = Decimal(str(monto)).quantize(Decimal("0.01"))
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "miembro_id": miembro_id,
+                "monto": monto,
+                "descripcion": descripcion or f"Cuota {periodo}",
+                "tipo": tipo,
+                "fecha_vencimiento": fecha_vencimiento or period_end(periodo),
+                "estado": "pendiente",
+                "fecha_pago": None,
+                "periodo": periodo,
+                "created_by": created_by,
+                "created_at": now,
+            }
+            for miembro_id in member_ids
+        ]
+
+        insert = dialect_insert(db)
+        if insert is None:
+            created = self._insert_missing(db, rows)
+        else:
+            # executemany form: compiled once, sent as multi-row INSERTs
+            # by SQLAlchemy's insertmanyvalues batching
+            stmt = (
+                insert(Cuota.__table__)
+                .on_conflict_do_nothing(index_elements=["miembro_id", "tipo", "periodo"])
+                .returning(Cuota.__table__.c.id, Cuota.__table__.c.miembro_id)
+            )
+            created = [(row.id, row.miembro_id) for row in db.execute(stmt, rows)]
+
+        ledger_service.record_transitions(
+            db,
+            [CuotaTransition(cuota_id, miembro_id, monto, None, "pendiente") for cuota_id, miembro_id in created],
+            created_by=created_by,
+        )
+        result = DuesGenerationResult(periodo, len(created), len(rows) - len(created))
+        logger.info(f"Generated dues for {periodo}: {result.creadas} created, {result.omitidas} already present")
+        return result
+
+    def mark_overdue(self, db: Session, today: Optional[date] = None) -> int:
+        """
+        Move every pendiente cuota past its due date to vencida with one
+        set-based UPDATE and record the transitions in the ledger.
+        The caller commits.
+
+        Returns:
+            Number of cuotas marked vencida
+        """
+        cuotas = Cuota.__table__
+        stmt = (
+            cuotas.update()
+            .where(cuotas.c.estado == "pendiente", cuotas.c.fecha_vencimiento < (today or date.today()))
+            .values(estado="vencida")
+            .returning(cuotas.c.id, cuotas.c.miembro_id, cuotas.c.monto)
+        )
+        overdue = db.execute(stmt).all()
+        ledger_service.record_transitions(
+            db,
+            [CuotaTransition(row.id, row.miembro_id, row.monto, "pendiente", "vencida") for row in overdue],
+        )
+        if overdue:
+            logger.info(f"Marked {len(overdue)} cuotas as vencida")
+        return len(overdue)
+
+    def _insert_missing(self, db: Session, rows: list[dict]) -> list[tuple[UUID, UUID]]:
+        sample = rows[0]
+        existing = {
+            row.miembro_id
+            for row in db.query(Cuota.miembro_id).filter(
+                Cuota.tipo == sample["tipo"],
+                Cuota.periodo == sample["periodo"],
+                Cuota.miembro_id.in_([row["miembro_id"] for row in rows]),
+            )
+        }
+        missing = [row for row in rows if row["miembro_id"] not in existing]
+        if missing:
+            db.execute(Cuota.__table__.insert(), missing)
+        return [(row["id"], row["miembro_id"]) for row in missing]
+
+
+dues_service = DuesService()
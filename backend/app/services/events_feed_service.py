@@ -0,0 +1,134 @@
+"""
+Events Feed Service
+In-memory feed of upcoming public events.
+
+The feed holds every event dated today or later (any estado), sorted by
+date and time, as validated ``EventoPublicoResponse`` snapshots. The public
+event list and the dashboard's upcoming count read it instead of querying
+``eventos_publicos``.
+
+The admin event endpoints apply their writes to the feed after committing.
+Commits that write ``eventos_publicos`` in any worker drop the feed
+through the invalidation bus, and the next read reloads it. When the local
+date changes, the first read drops past events, so the feed rolls over at
+midnight without a query. The feed is also reloaded every
+UPCOMING_EVENTS_REFRESH_SECONDS, in case a notification was lost.
+Concurrent reads that find the feed expired share a single reload.
+"""
+
+import logging
+import threading
+import time
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import EventoPublico
+from app.schemas import EventoPublicoResponse
+from app.utils.invalidation_bus import invalidation_bus
+from app.utils.single_flight import public_reads
+
+logger = logging.getLogger(__name__)
+
+# Estados listed on the public site when no estado is requested
+VISIBLE_STATES = ("planificado", "en_curso")
+
+
+def _sort_key(event: EventoPublicoResponse) -> tuple:
+    hora = event.hora.zfill(5)  # "9:00" sorts before "19:00"
+    return event.fecha, hora, str(event.id)
+
+
+class EventsFeedService:
+    """Service for the upcoming public events feed"""
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._events: list[EventoPublicoResponse] = []
+        self._day: Optional[date] = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def list_events(
+        self,
+        db: Session,
+        estado: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 10,
+    ) -> list[EventoPublicoResponse]:
+        """
+        Upcoming events, soonest first.
+
+        Args:
+            db: Database session (only used to (re)load the feed)
+            estado: Only this estado; defaults to VISIBLE_STATES
+            offset: Events to skip
+            limit: Maximum events returned
+        """
+        states = (estado,) if estado else VISIBLE_STATES
+        matching = [event for event in self._current(db) if event.estado in states]
+        return matching[offset:offset + limit]
+
+    def count_upcoming(self, db: Session) -> int:
+        """Number of upcoming events in VISIBLE_STATES."""
+        return sum(1 for event in self._current(db) if event.estado in VISIBLE_STATES)
+
+    def upsert(self, event: EventoPublico) -> None:
+        """Apply a created or updated event (call after the write commits)."""
+        snapshot = EventoPublicoResponse.model_validate(event)
+        with self._lock:
+            self._generation += 1
+            if self._day is None:
+                return
+            events = [existing for existing in self._events if existing.id != snapshot.id]
+            if snapshot.fecha >= self._day:
+                events.append(snapshot)
+                events.sort(key=_sort_key)
+            self._events = events
+
+    def remove(self, event_id: UUID) -> None:
+        """Drop a deleted event (call after the delete commits)."""
+        with self._lock:
+            self._generation += 1
+            self._events = [event for event in self._events if event.id != event_id]
+
+    def _current(self, db: Session) -> list[EventoPublicoResponse]:
+        today = date.today()
+        with self._lock:
+            if self._day is not None and time.monotonic() < self._expires_at:
+                if today != self._day:
+                    self._events = [event for event in self._events if event.fecha >= today]
+                    self._day = today
+                return self._events
+            generation = self._generation
+
+        # Requests arriving while the feed reloads wait for the same load
+        return public_reads.do(("events", generation, today), lambda: self._load(db, today, generation))
+
+    def _load(self, db: Session, today: date, generation: int) -> list[EventoPublicoResponse]:
+        rows = db.query(EventoPublico).filter(EventoPublico.fecha >= today).all()
+        events = sorted((EventoPublicoResponse.model_validate(row) for row in rows), key=_sort_key)
+        with self._lock:
+            # A write during the load makes this snapshot stale; serve it once
+            # and reload on the next read
+            if generation == self._generation:
+                self._events = events
+                self._day = today
+                self._expires_at = time.monotonic() + self.refresh_seconds
+        logger.debug(f"Loaded {len(events)} upcoming events")
+        return events
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._events = []
+            self._day = None
+            self._expires_at = 0.0
+
+
+events_feed_service = EventsFeedService(refresh_seconds=settings.UPCOMING_EVENTS_REFRESH_SECONDS)
+invalidation_bus.subscribe(lambda message: events_feed_service.clear(), tables=[EventoPublico.__tablename__])
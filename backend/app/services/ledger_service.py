@@ -0,0 +1,289 @@
+"""
+Ledger Service
+Member balance ledger for cuotas.
+
+Every cuota state change (created, paid, overdue) and every manual balance
+adjustment appends a ``movimientos_saldo`` entry and, in the same
+transaction, applies its delta to the cached totals in ``saldos_cuotas``
+(per member and choir-wide) and to ``Miembro.saldo_actual``. Finance
+summaries read one cached row instead of summing ``cuotas``.
+
+``reconcile`` recomputes the totals from the raw cuotas and reports (or
+repairs) any drift; see ``scripts/reconcile_balances.py``.
+"""
+
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, func
+from sqlalchemy.orm import Session
+
+from app.models import Cuota, Miembro, MovimientoSaldo, SaldoCuotas
+from app.utils.db_utils import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+# saldos_cuotas key of the choir-wide totals
+ALL_MEMBERS = UUID(int=0)
+
+# Cuota estados that count towards what a member owes
+OUTSTANDING_STATES = ("pendiente", "vencida")
+
+ESTADO_COLUMNS = {
+    "pagada": "total_pagado",
+    "pendiente": "total_pendiente",
+    "vencida": "total_vencido",
+}
+
+CENT = Decimal("0.01")
+
+
+class CuotaTransition(NamedTuple):
+    """A cuota moving between estados; None for a cuota that did not exist."""
+    cuota_id: UUID
+    miembro_id: UUID
+    monto: Decimal
+    estado_origen: Optional[str]
+    estado_destino: Optional[str]
+
+
+def _movement_type(transition: CuotaTransition) -> str:
+    if transition.estado_origen is None:
+        return "cargo"
+    if transition.estado_destino == "pagada":
+        return "pago"
+    if transition.estado_destino == "vencida":
+        return "vencimiento"
+    return "cambio_estado"
+
+
+def _balance_effect(transition: CuotaTransition) -> Decimal:
+    """Change in what the member owes caused by a transition."""
+    effect = Decimal(0)
+    if transition.estado_destino in OUTSTANDING_STATES:
+        effect += transition.monto
+    if transition.estado_origen in OUTSTANDING_STATES:
+        effect -= transition.monto
+    return effect
+
+
+def summary_payload(saldo: Optional[object]) -> dict:
+    """FinanceSummaryResponse fields for a saldos_cuotas row (None when missing)."""
+    return {
+        "totalIngresos": float(saldo.total_pagado) if saldo else 0.0,
+        "totalPendiente": float(saldo.total_pendiente) if saldo else 0.0,
+        "totalVencido": float(saldo.total_vencido) if saldo else 0.0,
+    }
+
+
+def _decimal(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(CENT)
+
+
+class LedgerService:
+    """Service for the member balance ledger"""
+
+    def record_transitions(
+        self,
+        db: Session,
+        transitions: Iterable[CuotaTransition],
+        created_by: Optional[UUID] = None,
+    ) -> int:
+        """
+        Append ledger entries for cuota state changes and update cached balances.
+        The caller commits.
+
+        Args:
+            db: Database session
+            transitions: Cuota state changes; no-op transitions are skipped
+            created_by: User performing the change
+
+        Returns:
+            Number of ledger entries written
+        """
+        now = datetime.utcnow()
+        entries = []
+        totals: dict[UUID, dict[str, Decimal]] = defaultdict(lambda: defaultdict(Decimal))
+        balances: dict[UUID, Decimal] = defaultdict(Decimal)
+
+        for transition in transitions:
+            if transition.estado_origen == transition.estado_destino:
+                continue
+            monto = _decimal(transition.monto)
+            entries.append({
+                "id": uuid.uuid4(),
+                "miembro_id": transition.miembro_id,
+                "cuota_id": transition.cuota_id,
+                "tipo": _movement_type(transition),
+                "monto": monto,
+                "estado_origen": transition.estado_origen,
+                "estado_destino": transition.estado_destino,
+                "created_by": created_by,
+                "created_at": now,
+            })
+            for key in (transition.miembro_id, ALL_MEMBERS):
+                if transition.estado_origen in ESTADO_COLUMNS:
+                    totals[key][ESTADO_COLUMNS[transition.estado_origen]] -= monto
+                if transition.estado_destino in ESTADO_COLUMNS:
+                    totals[key][ESTADO_COLUMNS[transition.estado_destino]] += monto
+            balances[transition.miembro_id] += _balance_effect(transition._replace(monto=monto))
+
+        if not entries:
+            return 0
+        db.execute(MovimientoSaldo.__table__.insert(), entries)
+        self._apply_totals(db, totals, now)
+        self._apply_balances(db, balances)
+        return len(entries)
+
+    def adjust_balance(
+        self,
+        db: Session,
+        miembro_id: UUID,
+        nuevo_saldo: Decimal,
+        created_by: Optional[UUID] = None,
+    ) -> Decimal:
+        """
+        Set a member's balance by appending an ``ajuste`` entry for the difference.
+        The caller commits.
+
+        Returns:
+            The adjustment applied
+        """
+        current = db.query(Miembro.saldo_actual).filter(Miembro.id == miembro_id).with_for_update().scalar()
+        delta = _decimal(nuevo_saldo) - _decimal(current)
+        if delta:
+            db.execute(MovimientoSaldo.__table__.insert(), [{
+                "id": uuid.uuid4(),
+                "miembro_id": miembro_id,
+                "cuota_id": None,
+                "tipo": "ajuste",
+                "monto": delta,
+                "estado_origen": None,
+                "estado_destino": None,
+                "created_by": created_by,
+                "created_at": datetime.utcnow(),
+            }])
+            self._apply_balances(db, {miembro_id: delta})
+        return delta
+
+    def _apply_totals(self, db: Session, totals: dict[UUID, dict[str, Decimal]], now: datetime) -> None:
+        rows = [
+            {
+                "miembro_id": key,
+                "total_pagado": deltas.get("total_pagado", Decimal(0)),
+                "total_pendiente": deltas.get("total_pendiente", Decimal(0)),
+                "total_vencido": deltas.get("total_vencido", Decimal(0)),
+                "updated_at": now,
+            }
+            for key, deltas in totals.items()
+        ]
+        insert = dialect_insert(db)
+        if insert is None:
+            for row in rows:
+                saldo = db.get(SaldoCuotas, row["miembro_id"])
+                if saldo is None:
+                    db.add(SaldoCuotas(**row))
+                    continue
+                for column in ESTADO_COLUMNS.values():
+                    setattr(saldo, column, getattr(saldo, column) + row[column])
+                saldo.updated_at = now
+            return
+
+        table = SaldoCuotas.__table__
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["miembro_id"],
+            set_={
+                **{column: table.c[column] + stmt.excluded[column] for column in ESTADO_COLUMNS.values()},
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        db.execute(stmt, rows)
+
+    def _apply_balances(self, db: Session, balances: dict[UUID, Decimal]) -> None:
+        params = [{"b_id": miembro_id, "b_delta": delta} for miembro_id, delta in balances.items() if delta]
+        if not params:
+            return
+        miembros = Miembro.__table__
+        db.execute(
+            miembros.update()
+            .where(miembros.c.id == bindparam("b_id"))
+            .values(saldo_actual=func.coalesce(miembros.c.saldo_actual, 0) + bindparam("b_delta")),
+            params,
+        )
+
+    def get_summary(self, db: Session, miembro_id: UUID = ALL_MEMBERS) -> dict:
+        """Cached cuota totals for a member (choir-wide by default)."""
+        return summary_payload(db.get(SaldoCuotas, miembro_id))
+
+    def reconcile(self, db: Session, fix: bool = False) -> list[dict]:
+        """
+        Compare cached balances with totals recomputed from cuotas.
+
+        Args:
+            db: Database session (committed by the caller when fixing)
+            fix: Overwrite drifted cached values with the recomputed ones
+
+        Returns:
+            One dict per mismatch: miembro_id, campo, cached, expected
+        """
+        expected: dict[UUID, dict[str, Decimal]] = defaultdict(lambda: defaultdict(Decimal))
+        outstanding: dict[UUID, Decimal] = defaultdict(Decimal)
+        rows = (
+            db.query(Cuota.miembro_id, Cuota.estado, func.sum(Cuota.monto))
+            .group_by(Cuota.miembro_id, Cuota.estado)
+            .all()
+        )
+        for miembro_id, estado, total in rows:
+            total = _decimal(total)
+            if estado in ESTADO_COLUMNS:
+                expected[miembro_id][ESTADO_COLUMNS[estado]] += total
+                expected[ALL_MEMBERS][ESTADO_COLUMNS[estado]] += total
+            if estado in OUTSTANDING_STATES:
+                outstanding[miembro_id] += total
+
+        adjustments = dict(
+            db.query(MovimientoSaldo.miembro_id, func.sum(MovimientoSaldo.monto))
+            .filter(MovimientoSaldo.tipo == "ajuste")
+            .group_by(MovimientoSaldo.miembro_id)
+            .all()
+        )
+
+        mismatches = []
+        cached = {saldo.miembro_id: saldo for saldo in db.query(SaldoCuotas).all()}
+        for key in set(expected) | set(cached):
+            saldo = cached.get(key)
+            for column in ESTADO_COLUMNS.values():
+                have = _decimal(getattr(saldo, column) if saldo else 0)
+                want = expected[key][column]
+                if have != want:
+                    mismatches.append({"miembro_id": key, "campo": column, "cached": have, "expected": want})
+                    if fix:
+                        if saldo is None:
+                            saldo = SaldoCuotas(miembro_id=key)
+                            db.add(saldo)
+                            cached[key] = saldo
+                        setattr(saldo, column, want)
+
+        for miembro in db.query(Miembro).all():
+            want = outstanding[miembro.id] + _decimal(adjustments.get(miembro.id))
+            have = _decimal(miembro.saldo_actual)
+            if have != want:
+                mismatches.append({"miembro_id": miembro.id, "campo": "saldo_actual", "cached": have, "expected": want})
+                if fix:
+                    miembro.saldo_actual = want
+
+        for mismatch in mismatches:
+            logger.warning(
+                f"Balance drift for {mismatch['miembro_id']} {mismatch['campo']}: "
+                f"cached {mismatch['cached']}, expected {mismatch['expected']}"
+            )
+        return mismatches
+
+
+ledger_service = LedgerService()
@@ -0,0 +1,173 @@
+"""
+Public Gallery Service
+Read model for the public gallery page.
+
+Each (tag set, offset, limit, fields) page is rendered once into its JSON
+response body and kept in a bounded LRU, so repeated anonymous views skip
+both the database and serialization. Each cached page also keeps its
+compressed variants, so a page is gzip/brotli-encoded once rather than on
+every request. Rendered bodies are also kept in the host's shared cache,
+so the other workers on the machine (and newly started ones) render each
+page only once between them. The admin gallery write endpoints call
+``invalidate`` after committing, and the invalidation bus does the same in
+every worker when a commit writes ``gallery_images``. A generation counter
+keeps a page rendered from pre-write data from being stored after the
+invalidation. In the shared cache, a random generation token that is part
+of every key does the same job. ``invalidate`` only touches memory (it
+runs on the event loop for bus deliveries); the token is rotated on the
+next page load, or right away by ``invalidate_shared`` after an admin
+write. Concurrent misses of the same page are coalesced into a single
+render.
+"""
+
+import json
+import logging
+import uuid
+from typing import Iterable
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.models import GalleryImage
+from app.utils.compression import PrecompressedBody
+from app.utils.fieldsets import Fieldset
+from app.utils.invalidation_bus import invalidation_bus
+from app.utils.responses import dumps
+from app.utils.shared_cache import shared_cache
+from app.utils.single_flight import public_reads
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# (sorted tags, offset, limit, fields)
+PageKey = tuple[tuple[str, ...], int, int, tuple[str, ...]]
+
+# Shared cache keys; pages are stored under the current generation token
+SHARED_PREFIX = "gallery:"
+GENERATION_KEY = SHARED_PREFIX + "generation"
+GENERATION_TTL_SECONDS = 86400
+
+# Fields of the compact public response (PublicGalleryImage)
+PUBLIC_FIELDS = Fieldset({
+    "id": GalleryImage.id,
+    "titulo": GalleryImage.titulo,
+    "descripcion": GalleryImage.descripcion,
+    "fecha": GalleryImage.fecha,
+    "tags": GalleryImage.tags,
+    "image_url": GalleryImage.image_url,
+    "thumbnail_url": GalleryImage.thumbnail_url,
+})
+
+
+class PublicGalleryService:
+    """Service for cached public gallery pages"""
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.pages: TTLCache[PageKey, PrecompressedBody] = TTLCache(maxsize, ttl_seconds)
+        self._generation_stale = False
+
+    @staticmethod
+    def page_key(
+        tags: Iterable[str], offset: int, limit: int, fields: tuple[str, ...] = PUBLIC_FIELDS.names
+    ) -> PageKey:
+        return tuple(sorted(set(tags))), offset, limit, fields
+
+    def get_page(
+        self,
+        db: Session,
+        tags: Iterable[str],
+        offset: int,
+        limit: int,
+        fields: tuple[str, ...] = PUBLIC_FIELDS.names,
+    ) -> PrecompressedBody:
+        """
+        JSON body of a public gallery page, from the cache when possible.
+
+        Args:
+            db: Database session (only used on a miss)
+            tags: Tags every image must have
+            offset: Page offset
+            limit: Page size
+            fields: Image fields to include, from ``PUBLIC_FIELDS.parse``
+
+        Returns:
+            Serialized PublicGalleryListResponse (images trimmed to ``fields``),
+            with its compressed variants cached alongside
+        """
+        key = self.page_key(tags, offset, limit, fields)
+        page = self.pages.get(key)
+        if page is not None:
+            return page
+        generation = self.pages.generation
+
+        def load() -> PrecompressedBody:
+            shared_key = self._shared_key(key)
+            body = shared_cache.get_or_set(shared_key, lambda: self._render(db, key), self.pages.ttl_seconds)
+            page = PrecompressedBody(body)
+            self.pages.set(key, page, generation)
+            return page
+
+        # Concurrent misses of the same page share one render; a write
+        # (new generation) starts a new flight
+        return public_reads.do(("gallery", generation, key), load)
+
+    def invalidate(self) -> None:
+        """Drop every cached page; the shared token is rotated on the next load."""
+        self.pages.invalidate()
+        self._generation_stale = True
+
+    async def invalidate_shared(self) -> None:
+        """``invalidate``, and rotate the shared token now (after an admin gallery write)."""
+        self.invalidate()
+        await run_in_threadpool(self._rotate_generation)
+
+    def _rotate_generation(self) -> None:
+        self._generation_stale = False
+        shared_cache.set(GENERATION_KEY, uuid.uuid4().hex.encode(), GENERATION_TTL_SECONDS)
+
+    def _shared_key(self, key: PageKey) -> str:
+        if self._generation_stale:
+            self._rotate_generation()
+        # An evicted or expired token is replaced by a new one, never reused
+        token = shared_cache.get_or_set(GENERATION_KEY, lambda: uuid.uuid4().hex.encode(), GENERATION_TTL_SECONDS)
+        return f"{SHARED_PREFIX}{token.decode()}:{json.dumps(key)}"
+
+    def _render(self, db: Session, key: PageKey) -> bytes:
+        tags, offset, limit, fields = key
+        query = db.query(*PUBLIC_FIELDS.select(fields), func.count().over().label("total"))
+        if tags:
+            # One containment test for all tags (served by the GIN index on tags)
+            query = query.filter(GalleryImage.tags.contains(list(tags)))
+        rows = (
+            query.order_by(GalleryImage.fecha.desc(), GalleryImage.id)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Past the last page: the window count has no row to ride on
+            count_query = db.query(func.count(GalleryImage.id))
+            if tags:
+                count_query = count_query.filter(GalleryImage.tags.contains(list(tags)))
+            total = count_query.scalar()
+        else:
+            total = 0
+
+        images = [{name: row._mapping[name] for name in fields} for row in rows]
+        return dumps({"total": total, "limit": limit, "offset": offset, "images": images})
+
+    def clear(self) -> None:
+        self.pages.clear()
+        self._generation_stale = False
+        shared_cache.clear(SHARED_PREFIX)
+
+
+public_gallery_service = PublicGalleryService(
+    maxsize=settings.PUBLIC_GALLERY_CACHE_SIZE,
+    ttl_seconds=settings.PUBLIC_GALLERY_CACHE_TTL_SECONDS,
+)
+invalidation_bus.subscribe(lambda message: public_gallery_service.invalidate(), tables=[GalleryImage.__tablename__])
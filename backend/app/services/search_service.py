@@ -0,0 +1,69 @@
+"""
+Search Service
+Ranked text search for the admin member and gallery lists.
+
+On PostgreSQL the searched columns carry ``pg_trgm`` GIN indexes
+(migration 010), so both the substring match (``ILIKE '%term%'``) and the
+typo-tolerant word match (``term <% column``) are index scans. Results are
+ranked by the best ``word_similarity`` over the searched columns.
+
+Other dialects (SQLite in tests) fall back to a case-insensitive substring
+match ranked by the number of matching columns.
+"""
+
+from typing import NamedTuple, Sequence
+
+from sqlalchemy import case, func, literal, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models import GalleryImage, User
+
+# Columns searched by each admin list
+MEMBER_SEARCH_COLUMNS = (User.nombre, User.email)
+GALLERY_SEARCH_COLUMNS = (GalleryImage.titulo, GalleryImage.descripcion)
+
+
+class SearchMatch(NamedTuple):
+    """WHERE clause of a search and the expression to rank its results by (higher first)."""
+    condition: ColumnElement
+    rank: ColumnElement
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class SearchService:
+    """Service for ranked text search"""
+
+    def match(self, db: Session, columns: Sequence[ColumnElement], term: str) -> SearchMatch:
+        """
+        Build the filter and rank for a search term over some columns.
+
+        Args:
+            db: Session whose bind selects the dialect
+            columns: Columns to search (any of them may match)
+            term: User search input
+
+        Returns:
+            SearchMatch to apply with ``filter(match.condition)`` and
+            ``order_by(match.rank.desc(), ...)``
+        """
+        term = term.strip()
+        pattern = _like_pattern(term)
+        substring = [column.ilike(pattern, escape="\\") for column in columns]
+
+        if db.get_bind().dialect.name == "postgresql":
+            word = literal(term)
+            fuzzy = [word.op("<%", is_comparison=True)(column) for column in columns]
+            similarity = [func.coalesce(func.word_similarity(word, column), 0) for column in columns]
+            rank = func.greatest(*similarity) if len(similarity) > 1 else similarity[0]
+            return SearchMatch(or_(*substring, *fuzzy), rank)
+
+        rank = sum((case((match, 1), else_=0) for match in substring), literal(0))
+        return SearchMatch(or_(*substring), rank)
+
+
+search_service = SearchService()
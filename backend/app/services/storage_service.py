@@ -1,16 +1,26 @@
 """
 Storage Service
 Handles Supabase Storage operations for files and media
+
+Signed URLs are kept in the host's shared cache and reused until shortly
+before they expire. All workers on the host hand out the same URL for a
+file instead of each calling Storage for a new one.
 """
 
 import logging
 from typing import Optional
 from datetime import datetime
 
+from starlette.concurrency import run_in_threadpool
+
 from app.config import settings
+from app.utils.shared_cache import shared_cache
 
 logger = logging.getLogger(__name__)
 
+# A cached signed URL is replaced this long before it expires
+SIGNED_URL_REFRESH_MARGIN_SECONDS = 60
+
 
 class StorageService:
     def __init__(self):
@@ -74,6 +84,10 @@ class StorageService:
     async def get_signed_url(
         self, bucket: str, path: str, expires_in: int = 3600
     ) -> str:
+        cache_key = f"signed-url:{bucket}:{expires_in}:{path}"
+        cached = await run_in_threadpool(shared_cache.get, cache_key)
+        if cached is not None:
+            return cached.decode()
         try:
             response = self.client.storage.from_(bucket).create_signed_url(
                 path, expires_in
@@ -82,11 +96,17 @@ class StorageService:
             if hasattr(response, "error") and response.error:
                 raise Exception(response.error)
 
-            return response.get("signedURL", response) if isinstance(response, dict) else response
+            url = response.get("signedURL", response) if isinstance(response, dict) else response
         except Exception as e:
             logger.error(f"Signed URL error: {e}")
             raise
 
+        ttl = expires_in - SIGNED_URL_REFRESH_MARGIN_SECONDS
+        if ttl > 0:
+            # Another worker may have signed the same file meanwhile; all use one URL
+            url = (await run_in_threadpool(shared_cache.add, cache_key, url.encode(), ttl)).decode()
+        return url
+
     async def list_files(self, bucket: str, folder: str = "") -> list:
         try:
             response = self.client.storage.from_(bucket).list(folder)
@@ -0,0 +1,212 @@
+"""
+Admission Control
+Per-route-class concurrency limits with queueing and load shedding.
+
+Each request is classified by method and path:
+
+- public read: public site GETs
+- member read: member area GETs
+- admin read: admin GETs
+- admin heavy: reports, stats and bulk dues
+- upload: gallery image uploads and replacements
+
+Each class has a slot limit. A request that finds its class full queues
+(first in, first out) for up to the class's queue timeout. It is then
+shed with 503 and Retry-After. The cheap classes have short timeouts, so
+a burst fails fast instead of piling up. The heavy classes are capped
+low and wait longer. A run of reports or uploads therefore cannot take
+every threadpool thread and pool connection from member reads.
+
+Requests that match no rule are admitted without limits. That covers
+auth (login has its own throttle), health probes and ordinary writes.
+Per-class queue depth and shed counts are reported in the readiness
+payload.
+"""
+
+import asyncio
+import logging
+import math
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from app.config import settings
+from app.utils.responses import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_READ = "public_read"
+MEMBER_READ = "member_read"
+ADMIN_READ = "admin_read"
+ADMIN_HEAVY = "admin_heavy"
+UPLOAD = "upload"
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+@dataclass(frozen=True)
+class RouteRule:
+    route_class: str
+    methods: frozenset[str]
+    pattern: re.Pattern
+
+
+def _rule(route_class: str, methods, pattern: str) -> RouteRule:
+    return RouteRule(route_class, frozenset(methods), re.compile(pattern))
+
+
+# First match wins
+ROUTE_RULES = (
+    _rule(UPLOAD, {"POST"}, r"^/api/admin/gallery/?$"),
+    _rule(UPLOAD, {"PUT"}, r"^/api/admin/gallery/[^/]+/replace/?$"),
+    _rule(ADMIN_HEAVY, READ_METHODS, r"^/api/admin/(attendance/(reports|stats)|finance/(reports|summary)|dashboard/stats)/?$"),
+    _rule(ADMIN_HEAVY, {"POST"}, r"^/api/admin/finance/dues/bulk/?$"),
+    _rule(ADMIN_READ, READ_METHODS, r"^/api/admin/"),
+    _rule(MEMBER_READ, READ_METHODS, r"^/api/(members|rehearsals|attendance|finance)(/|$)"),
+    _rule(PUBLIC_READ, READ_METHODS, r"^/api/(events|news|pages|gallery)(/|$)"),
+)
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """Route class of a request, or None if it is not admission-controlled."""
+    for rule in ROUTE_RULES:
+        if method in rule.methods and rule.pattern.match(path):
+            return rule.route_class
+    return None
+
+
+class AdmissionClass:
+    """Slots for one route class, handed to queued requests in arrival order."""
+
+    def __init__(self, name: str, limit: int, queue_timeout_seconds: float):
+        self.name = name
+        self.limit = limit
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.max_queued = 0
+        self.admitted = 0
+        self.shed = 0
+        self.queue_wait_seconds = 0.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.queue_timeout_seconds))
+
+    async def acquire(self) -> bool:
+        """Take a slot, queueing up to the timeout; False if the request must be shed."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return True
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.max_queued = max(self.max_queued, len(self._waiters))
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            if not (waiter.done() and not waiter.cancelled()):
+                self._discard(waiter)
+                self.shed += 1
+                return False
+        except asyncio.CancelledError:
+            # Client went away while queued; pass on a slot it was just handed
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+        finally:
+            self.queue_wait_seconds += time.perf_counter() - started
+        # release() handed over its slot: ``active`` already counts this request
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "queue_wait_seconds": round(self.queue_wait_seconds, 3),
+        }
+
+
+class AdmissionController:
+    """The admission classes of one process."""
+
+    def __init__(self, classes: list[AdmissionClass]):
+        self.classes = {admission.name: admission for admission in classes}
+
+    def stats(self) -> dict:
+        return {name: admission.stats() for name, admission in self.classes.items()}
+
+
+admission_controller = AdmissionController([
+    AdmissionClass(PUBLIC_READ, settings.ADMISSION_PUBLIC_READ_LIMIT, settings.ADMISSION_READ_QUEUE_TIMEOUT_SECONDS),
+    AdmissionClass(MEMBER_READ, settings.ADMISSION_MEMBER_READ_LIMIT, settings.ADMISSION_READ_QUEUE_TIMEOUT_SECONDS),
+    AdmissionClass(ADMIN_READ, settings.ADMISSION_ADMIN_READ_LIMIT, settings.ADMISSION_READ_QUEUE_TIMEOUT_SECONDS),
+    AdmissionClass(ADMIN_HEAVY, settings.ADMISSION_ADMIN_HEAVY_LIMIT, settings.ADMISSION_HEAVY_QUEUE_TIMEOUT_SECONDS),
+    AdmissionClass(UPLOAD, settings.ADMISSION_UPLOAD_LIMIT, settings.ADMISSION_HEAVY_QUEUE_TIMEOUT_SECONDS),
+])
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware that admits, queues or sheds requests by route class.
+    """
+
+    def __init__(self, app, controller: AdmissionController = admission_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route_class = classify(scope["method"], scope["path"])
+        admission = self.controller.classes.get(route_class) if route_class else None
+        if admission is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await admission.acquire():
+            logger.warning(
+                f"Shed {scope['method']} {scope['path']}: {route_class} saturated "
+                f"({admission.active} active, {admission.queued} queued)"
+            )
+            response = FastJSONResponse(
+                {"detail": "Service busy, retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(admission.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.release()
@@ -0,0 +1,217 @@
+"""
+Response Compression
+gzip/brotli content negotiation for API responses.
+
+``CompressionMiddleware`` compresses text and JSON responses of at least
+COMPRESSION_MINIMUM_SIZE bytes with the best encoding the client accepts
+(brotli when the ``brotli`` package is installed, then gzip). A response
+sent in one message is compressed in one pass. A streamed response is
+compressed chunk by chunk and flushed after each chunk, so the client
+still receives data as it is produced.
+
+Cached responses can carry a ``PrecompressedBody``. It compresses its body
+at most once per encoding and reuses the result for every later request.
+``PrecompressedResponse`` sends the variant the client negotiated. The
+middleware leaves responses that already have a Content-Encoding alone.
+"""
+
+import gzip
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only without it
+    brotli = None
+
+# Server preference, used to break ties between equally accepted encodings
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def negotiate(accept_encoding: str, encodings: tuple[str, ...] = ENCODINGS) -> Optional[str]:
+    """
+    Pick the response encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Request header value ("" if absent)
+        encodings: Supported encodings, most preferred first
+
+    Returns:
+        The accepted encoding with the highest q-value, or None for identity
+    """
+    qualities = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        name, _, value = params.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[token] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a whole body (gzip output is deterministic: mtime is zeroed)."""
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class StreamCompressor:
+    """Incremental compressor that flushes after every chunk."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits 31: gzip container
+            self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class PrecompressedBody:
+    """A cached response body and its compressed variants, each built once."""
+
+    __slots__ = ("body", "_variants")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._variants: dict[str, bytes] = {}
+
+    @property
+    def compressible(self) -> bool:
+        return len(self.body) >= settings.COMPRESSION_MINIMUM_SIZE
+
+    def encoded(self, encoding: Optional[str]) -> tuple[bytes, Optional[str]]:
+        """The body to send for a negotiated encoding, and the encoding applied."""
+        if encoding is None or not self.compressible:
+            return self.body, None
+        variant = self._variants.get(encoding)
+        if variant is None:
+            # Concurrent first requests may both compress; the results are identical
+            variant = self._variants[encoding] = compress(self.body, encoding)
+        return variant, encoding
+
+
+class PrecompressedResponse(Response):
+    """Response for a ``PrecompressedBody``, encoded as the request negotiates."""
+
+    media_type = "application/json"
+
+    def __init__(self, content: PrecompressedBody, status_code: int = 200, headers=None, media_type=None):
+        self.precompressed = content
+        super().__init__(content.body, status_code, headers, media_type)
+
+    async def __call__(self, scope, receive, send):
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        body, applied = self.precompressed.encoded(encoding)
+        if self.precompressed.compressible:
+            self.headers.add_vary_header("Accept-Encoding")
+        if applied:
+            self.body = body
+            self.headers["content-encoding"] = applied
+            self.headers["content-length"] = str(len(body))
+        await super().__call__(scope, receive, send)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that compresses eligible responses (see module docstring).
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        start_message = None
+        compressor: Optional[StreamCompressor] = None
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor
+            if message["type"] == "http.response.start":
+                # Held back until the first body message shows the response size
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is None:
+                if compressor is not None:
+                    body = compressor.compress(body)
+                    if not more_body:
+                        body += compressor.finish()
+                    message = {"type": "http.response.body", "body": body, "more_body": more_body}
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            if self._eligible(start["status"], headers):
+                headers.add_vary_header("Accept-Encoding")
+                if encoding and (more_body or len(body) >= self.minimum_size):
+                    headers["content-encoding"] = encoding
+                    if more_body:
+                        if "content-length" in headers:
+                            del headers["content-length"]
+                        compressor = StreamCompressor(encoding)
+                        body = compressor.compress(body)
+                    else:
+                        body = compress(body, encoding)
+                        headers["content-length"] = str(len(body))
+                    message = {"type": "http.response.body", "body": body, "more_body": more_body}
+            await send({**start, "headers": headers.raw})
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _eligible(status: int, headers: MutableHeaders) -> bool:
+        if status < 200 or status in (204, 304):
+            return False
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        return headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
@@ -69,10 +69,34 @@ def get_supabase_anon_client():
         return None
 
 
-async def check_database_health_async() -> dict:
+def dialect_insert(db):
+    """
+    Return the dialect ``insert`` construct that supports ON CONFLICT.
+
+    Args:
+        db: Session or connection whose bind selects the dialect
+
+    Returns:
+        postgresql/sqlite ``insert`` function, or None for other dialects
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
+
+async def check_database_health_async(include_activity: bool = False) -> dict:
     """
     Async health check for the database connection.
     
+    Args:
+        include_activity: Also count backends in pg_stat_activity.
+            This is a catalog scan, keep it off for frequently polled probes.
+    
     Returns:
         dict with status and details
     """
@@ -93,13 +117,13 @@ async def check_database_health_async() -> dict:
                 db_result = await session.execute(text("SELECT 1"))
                 db_result.fetchone()
                 
-                pool_result = await session.execute(
-                    text("SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()")
-                )
-                active_connections = pool_result.scalar()
+                if include_activity:
+                    pool_result = await session.execute(
+                        text("SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()")
+                    )
+                    result["details"]["active_connections"] = pool_result.scalar()
                 
                 result["status"] = "healthy"
-                result["details"]["active_connections"] = active_connections
                 result["details"]["message"] = "Database connection successful"
                 
     except Exception as e:
@@ -108,10 +132,14 @@ async def check_database_health_async() -> dict:
     return result
 
 
-def check_database_health() -> dict:
+def check_database_health(include_activity: bool = False) -> dict:
     """
     Sync health check for the database connection.
     
+    Args:
+        include_activity: Also count backends in pg_stat_activity.
+            This is a catalog scan, keep it off for frequently polled probes.
+    
     Returns:
         dict with status and details
     """
@@ -130,12 +158,12 @@ def check_database_health() -> dict:
         try:
             db.execute(text("SELECT 1"))
             
-            active_connections = db.execute(
-                text("SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()")
-            ).scalar()
+            if include_activity:
+                result["details"]["active_connections"] = db.execute(
+                    text("SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()")
+                ).scalar()
             
             result["status"] = "healthy"
-            result["details"]["active_connections"] = active_connections
             result["details"]["message"] = "Database connection successful"
         finally:
             db.close()
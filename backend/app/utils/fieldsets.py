@@ -0,0 +1,57 @@
+"""
+Sparse Fieldsets
+``?fields=`` support for list endpoints, with the projection pushed down to SQL.
+
+A ``Fieldset`` maps each response field of a list item to the column
+expression that produces it. An endpoint parses the requested fields,
+selects only their columns (joining other tables only when a requested
+field lives there) and returns the rows as dicts, so unrequested columns
+are neither read, hydrated into ORM objects nor sent.
+"""
+
+from typing import Iterable, Mapping, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import Table
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.util import find_tables
+
+
+class Fieldset:
+    """Response fields of a list item and the SQL expressions behind them."""
+
+    def __init__(self, columns: Mapping[str, ColumnElement], always: Iterable[str] = ("id",)):
+        # .expression unwraps ORM attributes so find_tables sees their table
+        self.columns = {name: column.expression for name, column in columns.items()}
+        self.always = tuple(always)
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return tuple(self.columns)
+
+    def parse(self, fields: Optional[str]) -> tuple[str, ...]:
+        """
+        Requested field names in response order (every field if none requested).
+
+        Raises:
+            HTTPException: 400 if an unknown field is requested
+        """
+        if not fields:
+            return self.names
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - self.columns.keys()
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}. Available: {', '.join(self.names)}",
+            )
+        requested.update(self.always)
+        return tuple(name for name in self.columns if name in requested)
+
+    def select(self, names: Iterable[str]) -> list[ColumnElement]:
+        """Labeled column expressions for the given fields."""
+        return [self.columns[name].label(name) for name in names]
+
+    def needs(self, names: Iterable[str], table: Table) -> bool:
+        """Whether any of the given fields reads from ``table``."""
+        return any(table in find_tables(self.columns[name], check_columns=True) for name in names)
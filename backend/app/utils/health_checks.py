@@ -0,0 +1,168 @@
+"""
+Health Checks
+Readiness probes for the database, storage and email provider.
+
+Probes run concurrently with a per-probe timeout and their results are
+cached for ``HEALTH_CACHE_TTL_SECONDS`` so load-balancer polling cannot
+turn into one database round trip per poll.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.auth.password_hasher import password_hasher
+from app.config import settings
+from app.database import sync_engine, async_engine
+from app.utils.db_utils import check_database_health, get_supabase_client
+from app.utils.admission import admission_controller
+from app.utils.invalidation_bus import invalidation_bus
+from app.utils.shared_cache import shared_cache, shared_limits
+from app.utils.single_flight import public_reads
+
+logger = logging.getLogger(__name__)
+
+STATUS_HEALTHY = "healthy"
+STATUS_UNHEALTHY = "unhealthy"
+STATUS_SKIPPED = "skipped"
+
+Probe = Callable[[], Awaitable[dict]]
+
+
+async def probe_database() -> dict:
+    """Run ``SELECT 1`` through the sync pool used by the API handlers."""
+    return await run_in_threadpool(check_database_health)
+
+
+async def probe_storage() -> dict:
+    """List Supabase Storage buckets, skipped when Supabase is not configured."""
+    if not settings.is_supabase_configured:
+        return {"status": STATUS_SKIPPED, "details": {"message": "Supabase not configured"}}
+    client = get_supabase_client()
+    if client is None:
+        return {"status": STATUS_UNHEALTHY, "details": {"error": "Supabase client unavailable"}}
+    buckets = await run_in_threadpool(client.storage.list_buckets)
+    return {"status": STATUS_HEALTHY, "details": {"buckets": len(buckets)}}
+
+
+async def probe_email() -> dict:
+    """Check the configured email provider has credentials (no mail is sent)."""
+    provider = settings.EMAIL_PROVIDER.lower()
+    if provider == "development":
+        return {"status": STATUS_HEALTHY, "details": {"provider": provider}}
+    api_keys = {
+        "sendgrid": settings.SENDGRID_API_KEY,
+        "resend": settings.RESEND_API_KEY,
+        "brevo": settings.BREVO_API_KEY,
+    }
+    if api_keys.get(provider):
+        return {"status": STATUS_HEALTHY, "details": {"provider": provider}}
+    return {
+        "status": STATUS_UNHEALTHY,
+        "details": {"provider": provider, "error": "Email provider API key not configured"},
+    }
+
+
+# Probes that must be healthy for the instance to receive traffic.
+CRITICAL_PROBES = {"database"}
+
+PROBES: dict[str, Probe] = {
+    "database": probe_database,
+    "storage": probe_storage,
+    "email": probe_email,
+}
+
+
+def pool_stats() -> dict:
+    """Connection pool counters for the sync and async engines."""
+    stats = {}
+    for name, pool in (("sync", sync_engine.pool), ("async", async_engine.sync_engine.pool)):
+        try:
+            stats[name] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+            }
+        except AttributeError:
+            stats[name] = {"status": pool.status()}
+    return stats
+
+
+class ProbeCache:
+    """Caches probe results and collapses concurrent runs of the same probe."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._results: dict[str, tuple[float, dict]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def clear(self) -> None:
+        self._results.clear()
+
+    def _cached(self, name: str) -> Optional[dict]:
+        entry = self._results.get(name)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    async def run(self, name: str, probe: Probe, timeout: float) -> dict:
+        cached = self._cached(name)
+        if cached is not None:
+            return cached
+
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            cached = self._cached(name)
+            if cached is not None:
+                return cached
+
+            started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(probe(), timeout=timeout)
+            except asyncio.TimeoutError:
+                result = {"status": STATUS_UNHEALTHY, "details": {"error": f"Timed out after {timeout}s"}}
+            except Exception as e:
+                logger.warning(f"Health probe {name} failed: {e}")
+                result = {"status": STATUS_UNHEALTHY, "details": {"error": str(e)}}
+            result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            result["checked_at"] = time.time()
+
+            self._results[name] = (time.monotonic() + self.ttl_seconds, result)
+            return result
+
+
+probe_cache = ProbeCache(ttl_seconds=settings.HEALTH_CACHE_TTL_SECONDS)
+
+
+async def check_readiness() -> dict:
+    """
+    Run all probes concurrently (cached) and summarise readiness.
+
+    Returns:
+        dict with overall status, per-probe results and pool stats
+    """
+    names = list(PROBES)
+    results = await asyncio.gather(*(
+        probe_cache.run(name, PROBES[name], settings.HEALTH_PROBE_TIMEOUT_SECONDS)
+        for name in names
+    ))
+    checks = dict(zip(names, results))
+    ready = all(checks[name]["status"] == STATUS_HEALTHY for name in CRITICAL_PROBES if name in checks)
+    degraded = any(check["status"] == STATUS_UNHEALTHY for check in checks.values())
+
+    return {
+        "status": "ready" if ready and not degraded else ("degraded" if ready else "unavailable"),
+        "ready": ready,
+        "checks": checks,
+        "pool": pool_stats(),
+        "password_hashing": password_hasher.stats(),
+        "single_flight": public_reads.stats(),
+        "invalidation_bus": invalidation_bus.stats(),
+        "shared_cache": await run_in_threadpool(shared_cache.stats),
+        "shared_limits": await run_in_threadpool(shared_limits.stats),
+        "admission": admission_controller.stats(),
+    }
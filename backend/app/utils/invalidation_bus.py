@@ -0,0 +1,322 @@
+"""
+Invalidation Bus
+Cross-worker eviction of per-worker caches after database writes.
+
+Session events record the tables each session writes, along with the
+primary keys of the ORM rows flushed. Bulk ``update()``/``delete()``/
+``insert()`` statements are recorded as whole-table writes. When the
+session commits, the bus publishes one ``Invalidation``. The bus first
+delivers it to this worker's subscribers, then hands it to the
+transport, which delivers it to every other worker.
+
+Caches subscribe with the tables they read (``None`` for all tables).
+Subscribers must be cheap and must not touch the database; they run on
+the committing thread or on the event loop.
+
+Transports:
+- ``PostgresNotifyTransport``: NOTIFY on the async engine. Each worker
+  LISTENs on a dedicated connection. After the listener reconnects, the
+  bus delivers an ``everything`` invalidation, because notifications may
+  have been missed while it was disconnected.
+- ``LoopbackTransport``: connects several buses in one process (tests).
+Without a transport (SQLite, or INVALIDATION_BUS_ENABLED off) only the
+local worker is invalidated.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Mapping, Optional
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Session.info key holding the rows written in the current transaction
+WRITTEN = "invalidation_written"
+
+# Beyond this many rows of one table, a message names the whole table
+MAX_IDS_PER_TABLE = 50
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+
+
+@dataclass(frozen=True)
+class Invalidation:
+    """Tables written by one commit; ids per table, or None for any row."""
+
+    tables: Mapping[str, Optional[frozenset[str]]] = field(default_factory=dict)
+    origin: str = ""
+    everything: bool = False
+
+    def affects(self, tables: Optional[frozenset[str]]) -> bool:
+        if self.everything or tables is None:
+            return True
+        return not tables.isdisjoint(self.tables)
+
+    def ids(self, table: str) -> Optional[frozenset[str]]:
+        """Written row ids of ``table`` (None: unknown, assume any row)."""
+        return None if self.everything else self.tables.get(table)
+
+    def encode(self) -> str:
+        tables = {name: sorted(ids) if ids is not None else None for name, ids in self.tables.items()}
+        payload = json.dumps({"o": self.origin, "t": tables, "e": self.everything})
+        if len(payload.encode("utf-8")) >= MAX_PAYLOAD_BYTES:
+            # Drop the ids rather than the message
+            payload = json.dumps({"o": self.origin, "t": dict.fromkeys(tables), "e": self.everything})
+        return payload
+
+    @classmethod
+    def decode(cls, payload: str) -> "Invalidation":
+        data = json.loads(payload)
+        tables = {name: frozenset(ids) if ids is not None else None for name, ids in data["t"].items()}
+        return cls(tables=tables, origin=data["o"], everything=data.get("e", False))
+
+
+Handler = Callable[[Invalidation], None]
+
+
+class InvalidationBus:
+    """Publishes commits' invalidations to this worker's caches and to the other workers."""
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self.transport = None
+        self._subscribers: list[tuple[Optional[frozenset[str]], Handler]] = []
+        self._lock = threading.Lock()
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+
+    def subscribe(self, handler: Handler, tables: Optional[Iterable[str]] = None) -> None:
+        """Call ``handler`` for every invalidation touching one of ``tables`` (None: any)."""
+        interest = frozenset(tables) if tables is not None else None
+        with self._lock:
+            self._subscribers.append((interest, handler))
+
+    def publish(self, tables: Mapping[str, Optional[frozenset[str]]]) -> None:
+        """Invalidate ``tables`` in this worker now and in the others through the transport."""
+        if not tables:
+            return
+        message = Invalidation(tables=dict(tables), origin=self.origin)
+        self.published += 1
+        self.deliver(message)
+        if self.transport is not None:
+            self.transport.send(message)
+
+    def receive(self, message: Invalidation) -> None:
+        """Apply an invalidation from the transport (this worker's own are skipped)."""
+        if message.origin == self.origin:
+            return
+        self.received += 1
+        self.deliver(message)
+
+    def deliver(self, message: Invalidation) -> None:
+        """Run the subscribers interested in ``message``."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for interest, handler in subscribers:
+            if not message.affects(interest):
+                continue
+            try:
+                handler(message)
+            except Exception as exc:
+                # One broken cache must not keep the others stale
+                self.errors += 1
+                logger.error(f"Invalidation handler {handler!r} failed: {exc}")
+
+    async def start(self, transport) -> None:
+        self.transport = transport
+        await transport.start(self)
+
+    async def stop(self) -> None:
+        transport, self.transport = self.transport, None
+        if transport is not None:
+            await transport.stop()
+
+    def stats(self) -> dict:
+        return {
+            "transport": type(self.transport).__name__ if self.transport is not None else None,
+            "published": self.published,
+            "received": self.received,
+            "errors": self.errors,
+        }
+
+
+class LoopbackTransport:
+    """In-process transport: each message reaches every other bus started on it."""
+
+    def __init__(self):
+        self._buses: list[InvalidationBus] = []
+
+    async def start(self, bus: InvalidationBus) -> None:
+        self._buses.append(bus)
+
+    async def stop(self) -> None:
+        self._buses.clear()
+
+    def send(self, message: Invalidation) -> None:
+        for bus in list(self._buses):
+            bus.receive(Invalidation.decode(message.encode()))
+
+
+class PostgresNotifyTransport:
+    """NOTIFY/LISTEN on one channel through the asyncpg driver of an async engine."""
+
+    def __init__(self, engine, channel: str, reconnect_max_seconds: float = 30.0):
+        self.engine = engine
+        self.channel = channel
+        self.reconnect_max_seconds = reconnect_max_seconds
+        self._bus: Optional[InvalidationBus] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._outbox: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self.connected = asyncio.Event()
+
+    async def start(self, bus: InvalidationBus) -> None:
+        self._bus = bus
+        self._loop = asyncio.get_running_loop()
+        self._outbox = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._listen(), name="invalidation-listen"),
+            asyncio.create_task(self._send_pending(), name="invalidation-notify"),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def send(self, message: Invalidation) -> None:
+        """Queue a NOTIFY (callable from any thread; commits happen on the threadpool)."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        payload = message.encode()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._outbox.put_nowait(payload)
+        else:
+            self._loop.call_soon_threadsafe(self._outbox.put_nowait, payload)
+
+    async def _send_pending(self) -> None:
+        while True:
+            payload = await self._outbox.get()
+            try:
+                async with self.engine.connect() as conn:
+                    await conn.execute(
+                        text("SELECT pg_notify(:channel, :payload)"),
+                        {"channel": self.channel, "payload": payload},
+                    )
+                    await conn.commit()
+            except Exception as exc:
+                # The other workers' caches expire on their TTLs
+                logger.warning(f"Could not publish invalidation: {exc}")
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            message = Invalidation.decode(payload)
+        except (ValueError, KeyError, TypeError) as exc:
+            logger.warning(f"Ignoring malformed invalidation payload: {exc}")
+            return
+        self._bus.receive(message)
+
+    async def _listen(self) -> None:
+        delay = 1.0
+        reconnecting = False
+        while True:
+            try:
+                async with self.engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection
+                    lost = asyncio.Event()
+                    driver.add_termination_listener(lambda _connection: lost.set())
+                    await driver.add_listener(self.channel, self._on_notify)
+                    self.connected.set()
+                    if reconnecting:
+                        self._bus.deliver(Invalidation(everything=True))
+                    logger.info(f"Listening for invalidations on {self.channel}")
+                    delay = 1.0
+                    try:
+                        await lost.wait()
+                    finally:
+                        self.connected.clear()
+                        if not driver.is_closed():
+                            await driver.remove_listener(self.channel, self._on_notify)
+                logger.warning("Invalidation listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"Invalidation listener failed: {exc}")
+            reconnecting = True
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max_seconds)
+
+
+invalidation_bus = InvalidationBus()
+
+
+# ==========================================
+# Session events: record written rows, publish on commit
+# ==========================================
+
+def written_tables(session: Session) -> dict[str, Optional[set[str]]]:
+    """Rows written by the session's current transaction, by table (None: any row)."""
+    return session.info.setdefault(WRITTEN, {})
+
+
+def _record(written: dict, table: str, row_id: Optional[str]) -> None:
+    ids = written.get(table, set())
+    if ids is None:
+        return
+    if row_id is None or len(ids) >= MAX_IDS_PER_TABLE:
+        written[table] = None
+    else:
+        ids.add(row_id)
+        written[table] = ids
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flush(session: Session, flush_context) -> None:
+    written = written_tables(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        mapper = inspect(obj).mapper
+        key = mapper.primary_key_from_instance(obj)
+        row_id = str(key[0]) if len(key) == 1 and key[0] is not None else None
+        for table in mapper.tables:
+            _record(written, table.name, row_id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_bulk_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _record(written_tables(orm_execute_state.session), table.name, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_on_commit(session: Session) -> None:
+    written = session.info.pop(WRITTEN, None)
+    if written:
+        invalidation_bus.publish({
+            table: frozenset(ids) if ids is not None else None
+            for table, ids in written.items()
+        })
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session: Session) -> None:
+    session.info.pop(WRITTEN, None)
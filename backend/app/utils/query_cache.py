@@ -0,0 +1,179 @@
+"""
+Query Cache
+Per-worker cache of SELECT results, invalidated by the tables a session writes.
+
+``query_cache.execute(db, statement, ttl=...)`` is a drop-in for
+``db.execute(statement)``. Results are keyed by the compiled SQL and its
+parameters, and tagged with every table the statement reads. Entries
+expire after their TTL (QUERY_CACHE_DEFAULT_TTL_SECONDS unless the query
+sets its own).
+
+The invalidation bus invalidates the tags of the tables each commit
+writes, in this worker and in the others. While a session has
+uncommitted writes to a table, its own queries on that table bypass the
+cache. Raw ``text()`` writes are not tracked.
+
+ORM entities are loaded in a scratch session on the caller's connection
+and frozen. They are then merged into the caller's session without a
+query, so cached instances are never shared between sessions. Tag
+generations are captured before the query runs. A result computed across
+a concurrent commit is therefore not stored.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from sqlalchemy import Table
+from sqlalchemy.engine import FrozenResult, Result
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.loading import merge_frozen_result
+from sqlalchemy.sql import Executable
+from sqlalchemy.sql.util import find_tables
+
+from app.config import settings
+from app.utils.invalidation_bus import Invalidation, invalidation_bus, written_tables
+
+logger = logging.getLogger(__name__)
+
+CacheKey = tuple[str, tuple]
+
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _hashable(item)) for key, item in value.items()))
+    return value
+
+
+def statement_tables(statement: Executable) -> frozenset[str]:
+    """Names of the tables a statement reads."""
+    return frozenset(
+        table.name
+        for table in find_tables(statement, check_columns=True, include_joins=True, include_selects=True)
+        if isinstance(table, Table)
+    )
+
+
+class _Entry:
+    __slots__ = ("expires_at", "frozen", "tags")
+
+    def __init__(self, expires_at: float, frozen: FrozenResult, tags: dict[str, int]):
+        self.expires_at = expires_at
+        self.frozen = frozen
+        self.tags = tags
+
+
+class QueryCache:
+    """Bounded LRU of frozen query results with table-tag invalidation."""
+
+    def __init__(self, maxsize: int, default_ttl_seconds: float, enabled: bool = True):
+        self.maxsize = maxsize
+        self.default_ttl_seconds = default_ttl_seconds
+        self.enabled = enabled
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._tag_generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def execute(self, db: Session, statement: Executable, ttl: Optional[float] = None) -> Result:
+        """
+        Execute a SELECT through the cache.
+
+        Args:
+            db: Session to return results in (cached entities are merged into it)
+            statement: SELECT statement (ORM entities or columns)
+            ttl: Seconds to keep the result (defaults to default_ttl_seconds)
+
+        Returns:
+            Result, as ``db.execute(statement)`` would return it
+        """
+        if not self.enabled or self.maxsize <= 0:
+            return db.execute(statement)
+        tags = statement_tables(statement)
+        if not tags.isdisjoint(written_tables(db)):
+            # The caller's own uncommitted writes must be visible to it
+            return db.execute(statement)
+
+        compiled = statement.compile(dialect=db.get_bind().dialect)
+        key = (str(compiled), _hashable(compiled.params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._fresh(entry):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                frozen = entry.frozen
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                frozen = None
+                generations = {tag: self._tag_generations.get(tag, 0) for tag in tags}
+
+        if frozen is None:
+            with Session(bind=db.connection()) as scratch:
+                frozen = scratch.execute(statement).freeze()
+            self._store(key, frozen, generations, ttl)
+        return merge_frozen_result(db, statement, frozen, load=False)()
+
+    def _fresh(self, entry: _Entry) -> bool:
+        if entry.expires_at <= time.monotonic():
+            return False
+        return all(self._tag_generations.get(tag, 0) == generation for tag, generation in entry.tags.items())
+
+    def _store(self, key: CacheKey, frozen: FrozenResult, generations: dict[str, int], ttl: Optional[float]) -> None:
+        ttl = self.default_ttl_seconds if ttl is None else ttl
+        with self._lock:
+            if any(self._tag_generations.get(tag, 0) != generation for tag, generation in generations.items()):
+                return  # a write to one of its tables committed meanwhile
+            self._entries[key] = _Entry(time.monotonic() + ttl, frozen, generations)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_tables(self, tables: set[str]) -> None:
+        """Invalidate every cached result that read any of these tables."""
+        if not tables:
+            return
+        with self._lock:
+            for table in tables:
+                self._tag_generations[table] = self._tag_generations.get(table, 0) + 1
+        logger.debug(f"Query cache invalidated for {sorted(tables)}")
+
+    def invalidate_all(self) -> None:
+        """Invalidate every cached result."""
+        with self._lock:
+            self._entries.clear()
+            for table in self._tag_generations:
+                self._tag_generations[table] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tag_generations.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+query_cache = QueryCache(
+    maxsize=settings.QUERY_CACHE_SIZE,
+    default_ttl_seconds=settings.QUERY_CACHE_DEFAULT_TTL_SECONDS,
+    enabled=settings.QUERY_CACHE_ENABLED,
+)
+
+
+def _on_invalidation(message: Invalidation) -> None:
+    if message.everything:
+        query_cache.invalidate_all()
+    else:
+        query_cache.invalidate_tables(set(message.tables))
+
+
+invalidation_bus.subscribe(_on_invalidation)
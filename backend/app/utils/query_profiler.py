@@ -0,0 +1,181 @@
+"""
+Query Profiler
+Per-request SQL statement recording with slow-query logging and N+1 detection.
+
+The profiler hooks into SQLAlchemy cursor events on the engines it is
+installed on and records every statement executed while a request profile
+is active. A profile is activated by ``QueryProfilerMiddleware`` when
+``QUERY_PROFILER_ENABLED`` is set, or (outside production) when the
+request carries the ``QUERY_PROFILER_HEADER`` header.
+"""
+
+import logging
+import time
+import traceback
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_APP_ROOT = str(Path(__file__).resolve().parent.parent)
+_THIS_FILE = str(Path(__file__).resolve())
+
+_current_profile: ContextVar[Optional["QueryProfile"]] = ContextVar(
+    "armentum_query_profile", default=None
+)
+
+
+@dataclass
+class QueryRecord:
+    statement: str
+    duration_ms: float
+    call_site: Optional[str]
+
+
+@dataclass
+class QueryProfile:
+    """Statements recorded during a single request."""
+
+    path: str = ""
+    queries: list[QueryRecord] = field(default_factory=list)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(q.duration_ms for q in self.queries)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    def repeated_statements(self, threshold: Optional[int] = None) -> dict[str, int]:
+        """Statements executed at least ``threshold`` times (likely N+1)."""
+        threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        counts = Counter(q.statement for q in self.queries)
+        return {stmt: n for stmt, n in counts.items() if n >= threshold}
+
+    def slow_queries(self, threshold_ms: Optional[int] = None) -> list[QueryRecord]:
+        threshold_ms = threshold_ms if threshold_ms is not None else settings.SLOW_QUERY_THRESHOLD_MS
+        return [q for q in self.queries if q.duration_ms >= threshold_ms]
+
+    def server_timing(self) -> str:
+        """Render the profile as a ``Server-Timing`` header value."""
+        parts = [f'db;dur={self.total_ms:.2f};desc="{self.count} queries"']
+        repeated = self.repeated_statements()
+        if repeated:
+            parts.append(f'n1;desc="{len(repeated)} repeated statements"')
+        return ", ".join(parts)
+
+
+def get_current_profile() -> Optional[QueryProfile]:
+    """Return the profile for the current request, if profiling is active."""
+    return _current_profile.get()
+
+
+def _find_call_site() -> Optional[str]:
+    """Innermost application frame outside the profiler itself."""
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if filename.startswith(_APP_ROOT) and filename != _THIS_FILE:
+            relative = filename[len(_APP_ROOT) - len("app"):]
+            return f"{relative}:{frame.lineno} in {frame.name}"
+    return None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is None:
+        return
+    conn.info.setdefault("armentum_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    starts = conn.info.get("armentum_query_start")
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+    record = QueryRecord(
+        statement=" ".join(statement.split()),
+        duration_ms=duration_ms,
+        call_site=_find_call_site(),
+    )
+    profile.queries.append(record)
+    if duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(
+            f"Slow query ({duration_ms:.1f}ms) on {profile.path} at {record.call_site}: "
+            f"{record.statement[:500]}"
+        )
+
+
+def install_query_profiler(*engines: Engine) -> None:
+    """
+    Attach the profiler cursor hooks to the given engines.
+
+    For an ``AsyncEngine`` pass ``async_engine.sync_engine``.
+    Installing twice on the same engine is a no-op.
+    """
+    for engine in engines:
+        if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            continue
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _report(profile: QueryProfile) -> None:
+    repeated = profile.repeated_statements()
+    for statement, count in repeated.items():
+        sites = sorted({q.call_site for q in profile.queries if q.statement == statement and q.call_site})
+        logger.warning(
+            f"Possible N+1 on {profile.path}: statement executed {count} times "
+            f"from {', '.join(sites) or 'unknown'}: {statement[:300]}"
+        )
+    logger.debug(f"{profile.path}: {profile.count} queries in {profile.total_ms:.1f}ms")
+
+
+class QueryProfilerMiddleware:
+    """
+    ASGI middleware that profiles the SQL executed by each request and
+    appends a ``Server-Timing`` header to the response.
+    """
+
+    def __init__(self, app, enabled: Optional[bool] = None, header_name: Optional[str] = None):
+        self.app = app
+        self.enabled = settings.QUERY_PROFILER_ENABLED if enabled is None else enabled
+        self.header_name = (header_name or settings.QUERY_PROFILER_HEADER).lower().encode("latin-1")
+
+    def _should_profile(self, scope) -> bool:
+        if self.enabled:
+            return True
+        if settings.is_production:
+            return False
+        return any(name == self.header_name for name, _ in scope.get("headers", []))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile(path=scope.get("path", ""))
+        token = _current_profile.set(profile)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+                _report(profile)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
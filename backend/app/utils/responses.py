@@ -0,0 +1,57 @@
+"""
+JSON Responses
+orjson-backed default response class with a fast path for pydantic models.
+
+FastAPI validates a handler's return value against ``response_model`` and
+serializes it again even when the handler already built that schema. Hot
+list and report endpoints instead build their schema objects once and
+return ``FastJSONResponse(content)`` directly: pydantic models (and lists
+of one model) go straight through pydantic-core's serializer, everything
+else through orjson. orjson handles UUID, date and datetime natively, so
+dict payloads don't need hand-stringified values.
+
+As the app's ``default_response_class`` it also replaces the stdlib
+encoder for every endpoint still serialized by FastAPI.
+"""
+
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+# OPT_UTC_Z writes UTC offsets as "Z", like pydantic
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, Decimal):
+        return str(value)  # same as pydantic's JSON mode
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize response content to JSON bytes without validating it."""
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content, by_alias=True)
+    if isinstance(content, list) and content and isinstance(content[0], BaseModel):
+        model = type(content[0])
+        if all(type(item) is model for item in content):
+            return _list_adapter(model).dump_json(content, by_alias=True)
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """JSON response for pre-built schemas, dicts and lists (see module docstring)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
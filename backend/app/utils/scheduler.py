@@ -0,0 +1,108 @@
+"""
+Scheduler
+Daily background jobs run inside the API process.
+
+Every worker schedules the jobs; a transaction-scoped PostgreSQL advisory
+lock elects one of them per run and the others skip. Jobs must be
+idempotent, since a worker that starts later the same day runs them again.
+"""
+
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _lock_key(name: str) -> int:
+    """Stable signed 64-bit advisory lock key for a job name."""
+    return int.from_bytes(hashlib.sha256(name.encode("utf-8")).digest()[:8], "big", signed=True)
+
+
+def try_leader_lock(db: Session, name: str) -> bool:
+    """
+    Try to become the leader for ``name`` until the session's transaction ends.
+
+    Non-PostgreSQL databases (SQLite in tests/dev) always grant the lock.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    return bool(db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _lock_key(name)}).scalar())
+
+
+def run_locked(name: str, job: Callable[[Session], int], session_factory=SessionLocal) -> Optional[int]:
+    """
+    Run ``job(db)`` in its own transaction under the leader lock.
+
+    Returns:
+        The job's result, or None if another worker holds the lock
+    """
+    db = session_factory()
+    try:
+        if not try_leader_lock(db, name):
+            logger.info(f"Job {name} is running on another worker, skipping")
+            return None
+        result = job(db)
+        db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+class DailyJob:
+    """Runs a blocking job once a day at a fixed UTC hour (and once at startup)."""
+
+    def __init__(self, name: str, job: Callable[[], object], hour_utc: int, run_on_start: bool = True):
+        self.name = name
+        self.job = job
+        self.hour_utc = hour_utc
+        self.run_on_start = run_on_start
+        self.last_run_at: Optional[datetime] = None
+        self.last_result: object = None
+        self._task: Optional[asyncio.Task] = None
+
+    def seconds_until_next_run(self, now: Optional[datetime] = None) -> float:
+        now = now or datetime.utcnow()
+        next_run = now.replace(hour=self.hour_utc, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    async def run_once(self) -> None:
+        try:
+            self.last_result = await run_in_threadpool(self.job)
+            self.last_run_at = datetime.utcnow()
+            logger.info(f"Job {self.name} finished: {self.last_result}")
+        except Exception:
+            logger.exception(f"Job {self.name} failed")
+
+    async def _loop(self) -> None:
+        if self.run_on_start:
+            await self.run_once()
+        while True:
+            await asyncio.sleep(self.seconds_until_next_run())
+            await self.run_once()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name=f"job:{self.name}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
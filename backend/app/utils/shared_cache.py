@@ -0,0 +1,360 @@
+"""
+Shared Cache
+Host-local cache shared by every worker process on the machine.
+
+Entries live in one SQLite file (in ``/dev/shm`` when available, so it is
+memory-backed). Every uvicorn worker on the host reads and writes the same
+entries, which means:
+- cached data is stored once per host rather than once per worker;
+- a freshly started worker finds the cache already warm.
+
+Values are bytes with a per-entry TTL. The file is bounded by
+SHARED_CACHE_MAX_BYTES and SHARED_CACHE_MAX_ENTRIES. Past either bound,
+expired entries go first, then the least recently used. Triggers keep
+running totals, so checking the bounds costs one row read. Reads refresh
+an entry's recency at most once per second, so hot keys don't turn every
+hit into a write. The WAL is truncated back to WAL_SIZE_LIMIT_BYTES after
+each checkpoint, so the files stay well inside Docker's default 64 MiB
+/dev/shm.
+
+``shared_limits`` is a second store, in its own file, for rate-limiter
+state. It never evicts live entries: a flood of new cache keys must not
+reset a login counter. Entries there only expire, and when the store is
+full new keys are not stored until some expire.
+
+``add`` (set if absent), ``get_or_set`` and ``update`` (read-modify-write)
+run in ``BEGIN IMMEDIATE`` transactions. They are therefore atomic
+across processes.
+
+The cache never fails a request. SQLite errors (a locked or full file)
+are logged and treated as misses. Every operation is blocking file I/O
+that may wait on another process's write lock, so async code must call
+it through ``run_in_threadpool``.
+"""
+
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Callable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Recency updates on read are skipped for entries touched this recently
+TOUCH_INTERVAL_SECONDS = 1.0
+
+# Entries dropped per eviction step when over the byte limit
+EVICTION_BATCH = 16
+
+# The WAL is truncated to this size after a checkpoint
+WAL_SIZE_LIMIT_BYTES = 4 * 1024 * 1024
+
+# Connections a forked child inherited. Closing one in the child would
+# release SQLite's locks and could delete the WAL the parent still uses,
+# so they are kept open and never used.
+_inherited: list[sqlite3.Connection] = []
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    entries INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals VALUES (0, 0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_inserted AFTER INSERT ON entries BEGIN
+    UPDATE totals SET entries = entries + 1, bytes = bytes + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_deleted AFTER DELETE ON entries BEGIN
+    UPDATE totals SET entries = entries - 1, bytes = bytes - OLD.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_resized AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET bytes = bytes + NEW.size - OLD.size;
+END;
+"""
+
+UPSERT = """
+INSERT INTO entries (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    value = excluded.value,
+    size = excluded.size,
+    expires_at = excluded.expires_at,
+    accessed_at = excluded.accessed_at
+"""
+
+
+def default_path(filename: str = "armentum-cache.sqlite3") -> str:
+    """SQLite file in /dev/shm (memory-backed) if present, else the temp dir."""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, filename)
+
+
+class SharedCache:
+    """
+    Cross-process bytes cache with TTLs, size limits and LRU eviction.
+
+    With ``evict_live=False`` only expired entries are ever dropped; a write
+    of a new key into a full store is skipped instead.
+    """
+
+    def __init__(
+        self, path: str, max_bytes: int, max_entries: int, enabled: bool = True, evict_live: bool = True
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.evict_live = evict_live
+        self._local = threading.local()
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejected = 0
+        self.errors = 0
+
+    # ------------------------------------------
+    # Connections (one per thread, reopened after fork or close)
+    # ------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "conn", None) is not None and local.pid != os.getpid():
+            _inherited.append(local.conn)
+            local.conn = None
+        if getattr(local, "conn", None) is None or local.epoch != self._epoch:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")  # a cache: losing it on power loss is fine
+            conn.execute(f"PRAGMA journal_size_limit={WAL_SIZE_LIMIT_BYTES}")
+            conn.executescript(SCHEMA)
+            local.conn, local.pid, local.epoch = conn, os.getpid(), self._epoch
+        return local.conn
+
+    def close(self) -> None:
+        """Drop this process's connections (each thread reopens on next use)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+            self._local.conn = None
+        self._epoch += 1
+
+    def _failed(self, operation: str, exc: sqlite3.Error) -> None:
+        self.errors += 1
+        logger.warning(f"Shared cache {operation} failed: {exc}")
+
+    # ------------------------------------------
+    # Operations
+    # ------------------------------------------
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at, accessed_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                self.misses += 1
+                return None
+            if now - row[2] > TOUCH_INTERVAL_SECONDS:
+                conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as exc:
+            self._failed("get", exc)
+            return None
+        self.hits += 1
+        return row[0]
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        if not self.enabled:
+            return
+        try:
+            with self._transaction() as conn:
+                self._write(conn, key, value, ttl_seconds)
+        except sqlite3.Error as exc:
+            self._failed("set", exc)
+
+    def add(self, key: str, value: bytes, ttl_seconds: float) -> bytes:
+        """
+        Store ``value`` unless a live entry exists.
+
+        Returns:
+            The stored value: ``value``, or the entry another process stored first
+        """
+        if not self.enabled:
+            return value
+        now = time.time()
+        try:
+            with self._transaction() as conn:
+                row = conn.execute(
+                    "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    return row[0]
+                self._write(conn, key, value, ttl_seconds)
+        except sqlite3.Error as exc:
+            self._failed("add", exc)
+        return value
+
+    def get_or_set(self, key: str, compute: Callable[[], bytes], ttl_seconds: float) -> bytes:
+        """
+        The cached value, or ``compute()`` stored with ``add``.
+
+        Processes that miss at the same time may each compute, but all of them
+        return the one value that was stored.
+        """
+        value = self.get(key)
+        if value is None:
+            value = self.add(key, compute(), ttl_seconds)
+        return value
+
+    def update(
+        self, key: str, change: Callable[[Optional[bytes]], Optional[bytes]], ttl_seconds: float
+    ) -> Optional[bytes]:
+        """
+        Atomically replace an entry with ``change(current)`` (None deletes it).
+
+        ``change`` receives None for a missing or expired entry. It runs while
+        the cache is write-locked, so it must be quick.
+        """
+        if not self.enabled:
+            return change(None)
+        now = time.time()
+        try:
+            with self._transaction() as conn:
+                row = conn.execute(
+                    "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                value = change(row[0] if row is not None else None)
+                if value is None:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                else:
+                    self._write(conn, key, value, ttl_seconds)
+                return value
+        except sqlite3.Error as exc:
+            self._failed("update", exc)
+            return None
+
+    def delete(self, key: str) -> None:
+        if not self.enabled:
+            return
+        try:
+            self._connection().execute("DELETE FROM entries WHERE key = ?", (key,))
+        except sqlite3.Error as exc:
+            self._failed("delete", exc)
+
+    def clear(self, prefix: str = "") -> None:
+        """Delete every entry whose key starts with ``prefix`` (all entries by default)."""
+        if not self.enabled:
+            return
+        try:
+            self._connection().execute(
+                "DELETE FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+            )
+        except sqlite3.Error as exc:
+            self._failed("clear", exc)
+
+    def stats(self) -> dict:
+        stats = {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "rejected": self.rejected,
+            "errors": self.errors,
+        }
+        if self.enabled:
+            try:
+                entries, size = self._connection().execute("SELECT entries, bytes FROM totals").fetchone()
+                stats.update(entries=entries, bytes=size)
+            except sqlite3.Error as exc:
+                self._failed("stats", exc)
+        return stats
+
+    # ------------------------------------------
+    # Helpers
+    # ------------------------------------------
+
+    def _transaction(self):
+        return _ImmediateTransaction(self._connection())
+
+    def _write(self, conn: sqlite3.Connection, key: str, value: bytes, ttl_seconds: float) -> None:
+        now = time.time()
+        if not self.evict_live and not self._has_room(conn, key, len(value), now):
+            self.rejected += 1
+            logger.warning(f"Shared store {self.path} is full, not storing {key}")
+            return
+        conn.execute(UPSERT, (key, value, len(value), now + ttl_seconds, now))
+        self._evict(conn, now)
+
+    def _has_room(self, conn: sqlite3.Connection, key: str, size: int, now: float) -> bool:
+        """Whether ``key`` fits, after dropping expired entries if needed."""
+        if conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is not None:
+            return True  # replacing an entry keeps the count (and a counter's size is bounded)
+        entries, total = conn.execute("SELECT entries, bytes FROM totals").fetchone()
+        if entries < self.max_entries and total + size <= self.max_bytes:
+            return True
+        self.evictions += conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,)).rowcount
+        entries, total = conn.execute("SELECT entries, bytes FROM totals").fetchone()
+        return entries < self.max_entries and total + size <= self.max_bytes
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        entries, size = conn.execute("SELECT entries, bytes FROM totals").fetchone()
+        if entries <= self.max_entries and size <= self.max_bytes:
+            return
+        dropped = conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,)).rowcount
+        entries, size = conn.execute("SELECT entries, bytes FROM totals").fetchone()
+        while self.evict_live and (entries > self.max_entries or size > self.max_bytes):
+            batch = max(entries - self.max_entries, EVICTION_BATCH if size > self.max_bytes else 1)
+            deleted = conn.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed_at LIMIT ?)",
+                (batch,),
+            ).rowcount
+            if not deleted:
+                break
+            dropped += deleted
+            entries, size = conn.execute("SELECT entries, bytes FROM totals").fetchone()
+        self.evictions += dropped
+
+
+class _ImmediateTransaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT`` (or ``ROLLBACK`` on error)."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+
+
+shared_cache = SharedCache(
+    path=settings.SHARED_CACHE_PATH or default_path(),
+    max_bytes=settings.SHARED_CACHE_MAX_BYTES,
+    max_entries=settings.SHARED_CACHE_MAX_ENTRIES,
+    enabled=settings.SHARED_CACHE_ENABLED,
+)
+
+shared_limits = SharedCache(
+    path=settings.SHARED_LIMITS_PATH or default_path("armentum-limits.sqlite3"),
+    max_bytes=settings.SHARED_LIMITS_MAX_BYTES,
+    max_entries=settings.SHARED_LIMITS_MAX_ENTRIES,
+    enabled=settings.SHARED_CACHE_ENABLED,
+    evict_live=False,
+)
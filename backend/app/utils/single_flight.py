@@ -0,0 +1,101 @@
+"""
+Single Flight
+Per-worker coalescing of identical concurrent computations.
+
+When many requests miss the same public read model entry at once (a shared
+album link, the events feed expiring), only the first one (the leader)
+runs the queries. The others wait for its result instead of each taking a
+connection from the small pool. If the leader raises, every waiter gets
+the same exception. A waiter that is still waiting after
+SINGLE_FLIGHT_TIMEOUT_SECONDS gives up with a 503 instead of holding its
+worker thread indefinitely.
+
+Public endpoints are sync and run on the threadpool, so waiters block on a
+``threading.Event``.
+"""
+
+import logging
+import threading
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+from app.config import settings
+from app.exceptions import ServiceBusyError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time; concurrent callers share it."""
+
+    def __init__(self, timeout_seconds: float):
+        self.timeout_seconds = timeout_seconds
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._leaders = 0
+        self._coalesced = 0
+        self._timeouts = 0
+
+    def do(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """
+        Return ``compute()``, sharing one run among concurrent callers with the same key.
+
+        Raises:
+            Whatever ``compute`` raised (for the leader and every waiter)
+            ServiceBusyError: If the leader doesn't finish within the timeout
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._leaders += 1
+            else:
+                call.waiters += 1
+                self._coalesced += 1
+
+        if leader:
+            try:
+                call.result = compute()
+            except BaseException as exc:
+                call.error = exc
+                raise
+            finally:
+                # Later callers start a new flight (and see fresh data)
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+            return call.result
+
+        if not call.done.wait(self.timeout_seconds):
+            with self._lock:
+                self._timeouts += 1
+            logger.warning(f"Timed out waiting for in-flight computation of {key!r}")
+            raise ServiceBusyError("Timed out waiting for an identical request, retry shortly")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self._leaders,
+                "coalesced": self._coalesced,
+                "timeouts": self._timeouts,
+            }
+
+
+# Shared by the public read endpoints; keys are namespaced by endpoint
+public_reads = SingleFlight(timeout_seconds=settings.SINGLE_FLIGHT_TIMEOUT_SECONDS)
@@ -0,0 +1,78 @@
+"""
+TTL Cache
+Bounded, thread-safe LRU whose entries expire after a fixed time.
+
+Used by the per-worker read models. Callers that compute a value from the
+database read ``generation`` first and pass it to ``set``. If an
+invalidation happened in between, the (possibly stale) value is not
+stored.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """LRU of at most ``maxsize`` entries, each valid for ``ttl_seconds`` (0 size disables)."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: K, value: V, generation: Optional[int] = None) -> None:
+        """Store a value unless the cache was invalidated since ``generation`` was read."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: K) -> None:
+        """Invalidate one entry."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def invalidate(self) -> None:
+        """Invalidate every entry."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit/miss counters."""
+        self.invalidate()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,76 @@
+"""
+JWT Microbenchmark
+Compares token signing and verification across JWT backends, with and
+without the verified-token cache.
+
+Usage:
+    python -m benchmarks.jwt_benchmark [--iterations 20000]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.auth import jwt as jwt_module
+from app.auth.jwt import JWT_BACKENDS, TokenCache, get_jwt_backend
+
+
+PAYLOAD = {
+    "sub": "4f6c1a2e-8d1b-4c3e-9a57-2d7e1f0b9c11",
+    "roles": ["corista"],
+}
+
+
+def _report(label: str, seconds: float, iterations: int) -> None:
+    per_call_us = seconds / iterations * 1_000_000
+    print(f"  {label:<32} {per_call_us:9.2f} µs/op  ({iterations / seconds:,.0f} ops/s)")
+
+
+def run(iterations: int) -> None:
+    original_backend = jwt_module.jwt_backend
+    original_cache = jwt_module.token_cache
+    try:
+        for name in JWT_BACKENDS:
+            try:
+                backend = get_jwt_backend(name)
+            except ImportError:
+                print(f"{name}: not installed, skipping")
+                continue
+
+            jwt_module.jwt_backend = backend
+            token = jwt_module.create_access_token(dict(PAYLOAD))
+            print(f"{name}:")
+
+            seconds = timeit.timeit(lambda: jwt_module.create_access_token(dict(PAYLOAD)), number=iterations)
+            _report("create_access_token", seconds, iterations)
+
+            seconds = timeit.timeit(lambda: backend.decode(token), number=iterations)
+            _report("decode (no cache)", seconds, iterations)
+
+            jwt_module.token_cache = TokenCache(maxsize=0)
+            seconds = timeit.timeit(lambda: jwt_module.verify_token(token), number=iterations)
+            _report("verify_token (cache disabled)", seconds, iterations)
+
+            jwt_module.token_cache = TokenCache(maxsize=1024)
+            jwt_module.verify_token(token)
+            seconds = timeit.timeit(lambda: jwt_module.verify_token(token), number=iterations)
+            _report("verify_token (cache hit)", seconds, iterations)
+    finally:
+        jwt_module.jwt_backend = original_backend
+        jwt_module.token_cache = original_cache
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark JWT backends and token cache")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.iterations)
+
+
+if __name__ == "__main__":
+    main()
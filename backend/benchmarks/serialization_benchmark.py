@@ -0,0 +1,155 @@
+"""
+Response Serialization Benchmark
+Compares FastAPI's response_model path (re-validation + stdlib JSON) with
+returning pre-built schemas through FastJSONResponse, per endpoint shape.
+
+Usage:
+    python -m benchmarks.serialization_benchmark [--iterations 200]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.schemas import (
+    AdminAttendanceReportRecord,
+    AdminAttendanceReportResponse,
+    AdminFinanceReportResponse,
+    CuotaResponse,
+    GalleryImageListResponse,
+    GalleryImageResponse,
+)
+from app.utils.responses import FastJSONResponse
+
+
+def _gallery_page(size: int) -> GalleryImageListResponse:
+    now = datetime.utcnow()
+    images = [
+        GalleryImageResponse(
+            id=uuid.uuid4(), titulo=f"Concierto {i}", descripcion="Temporada de otoño",
+            fecha=date.today() - timedelta(days=i), tags=["concierto", "2024"],
+            image_url=f"https://cdn.example.com/gallery/{i}.webp",
+            thumbnail_url=f"https://cdn.example.com/gallery/{i}_thumb.webp",
+            created_by=uuid.uuid4(), created_at=now, updated_at=now,
+        )
+        for i in range(size)
+    ]
+    return GalleryImageListResponse(total=size, limit=size, offset=0, images=images)
+
+
+def _cuotas(size: int) -> list[CuotaResponse]:
+    return [
+        CuotaResponse(
+            id=uuid.uuid4(), miembro_id=uuid.uuid4(), monto=Decimal("25.00"), descripcion="Cuota mensual",
+            tipo="regular", fecha_vencimiento=date.today(), estado="pendiente", periodo="2024-05",
+            created_by=uuid.uuid4(), created_at=datetime.utcnow(),
+        )
+        for _ in range(size)
+    ]
+
+
+def _attendance_report(size: int) -> AdminAttendanceReportResponse:
+    records = [
+        AdminAttendanceReportRecord(
+            id=uuid.uuid4(), miembro_id=uuid.uuid4(), miembro_nombre=f"Corista {i}", ensayo_id=uuid.uuid4(),
+            ensayo_nombre="Ensayo general", presente=i % 4 != 0, justificacion=None,
+            registrado_en=datetime.utcnow(),
+        )
+        for i in range(size)
+    ]
+    return AdminAttendanceReportResponse(
+        total=size, presentes=size, ausentes=0, porcentaje_presencia=75.0, records=records
+    )
+
+
+def _admin_cuotas_page(size: int) -> tuple[dict, dict]:
+    """The list_cuotas payload with hand-stringified values (before) and native ones (after)."""
+    native = []
+    for _ in range(size):
+        native.append({
+            "id": uuid.uuid4(), "userId": uuid.uuid4(), "miembro_id": uuid.uuid4(),
+            "miembro_nombre": "Corista", "monto": 25.0, "descripcion": None, "tipo": "regular",
+            "vencimiento": date.today(), "fecha_vencimiento": date.today(), "estado": "pendiente",
+            "fecha_pago": None, "created_at": datetime.utcnow(),
+        })
+    stringified = [
+        {key: (value.isoformat() if isinstance(value, (date, datetime)) else
+               str(value) if isinstance(value, uuid.UUID) else value)
+         for key, value in row.items()}
+        for row in native
+    ]
+    return {"cuotas": stringified, "total": size}, {"cuotas": native, "total": size}
+
+
+async def _time(fn: Callable[[], Any], iterations: int) -> float:
+    for _ in range(3):
+        await fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await fn()
+    return time.perf_counter() - start
+
+
+def _report(label: str, seconds: float, iterations: int, body_size: int) -> None:
+    per_call_ms = seconds / iterations * 1000
+    print(f"  {label:<26} {per_call_ms:8.3f} ms/response  ({body_size:,} bytes)")
+
+
+async def _compare(label: str, response_model: Any, before: Any, after: Any, iterations: int) -> None:
+    field = create_response_field(name="response", type_=response_model, mode="serialization")
+
+    async def fastapi_path():
+        content = await serialize_response(field=field, response_content=before)
+        return JSONResponse(content).body
+
+    async def fast_path():
+        return FastJSONResponse(after).body
+
+    print(f"{label}:")
+    baseline = await _time(fastapi_path, iterations)
+    _report("response_model + json", baseline, iterations, len(await fastapi_path()))
+    fast = await _time(fast_path, iterations)
+    _report("FastJSONResponse", fast, iterations, len(await fast_path()))
+    print(f"  speedup: {baseline / fast:.1f}x")
+
+
+async def run(iterations: int) -> None:
+    gallery = _gallery_page(200)
+    await _compare("admin gallery page (200 images)", GalleryImageListResponse, gallery, gallery, iterations)
+
+    cuotas = _cuotas(500)
+    report = AdminFinanceReportResponse(total_ingresos=0, total_pendiente=0, total_vencido=0, cuotas=cuotas)
+    await _compare("finance report (500 cuotas)", AdminFinanceReportResponse, report, report, iterations)
+
+    await _compare("member fees (500 cuotas)", list[CuotaResponse], cuotas, cuotas, iterations)
+
+    attendance = _attendance_report(500)
+    await _compare("attendance report (500 records)", AdminAttendanceReportResponse, attendance, attendance, iterations)
+
+    before, after = _admin_cuotas_page(100)
+    await _compare("admin cuotas page (100 dict rows)", dict, before, after, iterations)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark response serialization paths")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,21 +15,16 @@ CREATE INDEX IF NOT EXISTS ix_miembros_fecha_ingreso ON miembros (fecha_ingreso)
 
 -- Eventos_publicos - partial indexes
 CREATE INDEX IF NOT EXISTS ix_eventos_publicos_tipo ON eventos_publicos (tipo);
-CREATE INDEX IF NOT EXISTS ix_eventos_publicos_activos ON eventos_publicos (fecha, estado) 
-    WHERE estado IN ('planificado', 'confirmado');
-CREATE INDEX IF NOT EXISTS ix_eventos_publicos_proximos ON eventos_publicos (fecha) 
-    WHERE fecha >= CURRENT_DATE;
+-- Upcoming-event lists use ix_eventos_publicos_visibles_fecha (migration 009)
 
 -- Ensayos - partial indexes for upcoming rehearsals
 CREATE INDEX IF NOT EXISTS ix_ensayos_tipo ON ensayos (tipo);
-CREATE INDEX IF NOT EXISTS ix_ensayos_proximos ON ensayos (fecha) 
-    WHERE fecha >= CURRENT_DATE;
 CREATE INDEX IF NOT EXISTS ix_ensayos_cuerdas ON ensayos (cuerdas) 
     WHERE cuerdas IS NOT NULL;
 
 -- Asistencias - composite indexes for reporting
 CREATE INDEX IF NOT EXISTS ix_asistencias_presente ON asistencias (presente);
-CREATE INDEX IF NOT EXISTS ix_asistencias_ensayo_presente ON asistencias (ensayo_id, presente);
+-- Roster lookups use ix_asistencias_ensayo_miembro INCLUDE (presente) (migration 009)
 CREATE INDEX IF NOT EXISTS ix_asistencias_registrado_en ON asistencias (registrado_en);
 
 -- Cuotas - indexes for financial reporting
@@ -37,8 +32,8 @@ CREATE INDEX IF NOT EXISTS ix_cuotas_tipo ON cuotas (tipo);
 CREATE INDEX IF NOT EXISTS ix_cuotas_fecha_pago ON cuotas (fecha_pago) WHERE fecha_pago IS NOT NULL;
 CREATE INDEX IF NOT EXISTS ix_cuotas_pendientes ON cuotas (fecha_vencimiento, estado) 
     WHERE estado = 'pendiente';
-CREATE INDEX IF NOT EXISTS ix_cuotas_vencidas ON cuotas (fecha_vencimiento, estado) 
-    WHERE estado = 'pendiente' AND fecha_vencimiento < CURRENT_DATE;
+-- Overdue cuotas are marked estado = 'vencida' by the daily overdue job
+CREATE INDEX IF NOT EXISTS ix_cuotas_estado_fecha_vencimiento ON cuotas (estado, fecha_vencimiento);
 
 -- Comunicados - indexes for filtering
 CREATE INDEX IF NOT EXISTS ix_comunicados_dirigido_a ON comunicados (dirigido_a) 
@@ -0,0 +1,43 @@
+"""Add token_sessions table for refresh-token rotation and revocation
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'token_sessions',
+        sa.Column('jti', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('family_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('roles', sa.JSON(), server_default='[]'),
+        sa.Column('issued_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('replaced_by', postgresql.UUID(as_uuid=True)),
+        sa.Column('revoked_at', sa.DateTime()),
+    )
+    op.create_index('ix_token_sessions_family_id', 'token_sessions', ['family_id'])
+    op.create_index('ix_token_sessions_user_id', 'token_sessions', ['user_id'])
+    # Denylist sync reads recently revoked, still-valid families
+    op.create_index(
+        'ix_token_sessions_revoked_at', 'token_sessions', ['revoked_at', 'expires_at'],
+        postgresql_where=sa.text('revoked_at IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('token_sessions')
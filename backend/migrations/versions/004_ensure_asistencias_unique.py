@@ -0,0 +1,51 @@
+"""Ensure one attendance row per member and rehearsal
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 12:00:00.000000
+
+Bulk roll-call upserts with ON CONFLICT (miembro_id, ensayo_id), which
+requires uq_asistencias_miembro_ensayo. 001 creates it, but databases built
+with scripts/init_db.py (metadata.create_all) before the model declared it
+do not have it. Duplicate rows are collapsed to the most recent record
+before the constraint is added.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONSTRAINT_NAME = 'uq_asistencias_miembro_ensayo'
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = {c['name'] for c in inspector.get_unique_constraints('asistencias')}
+    if CONSTRAINT_NAME in existing:
+        return
+
+    # Keep the latest record of each (miembro_id, ensayo_id) pair
+    op.execute("""
+        DELETE FROM asistencias a
+        USING (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY miembro_id, ensayo_id
+                ORDER BY registrado_en DESC NULLS LAST, id
+            ) AS rn
+            FROM asistencias
+        ) ranked
+        WHERE a.id = ranked.id AND ranked.rn > 1
+    """)
+    op.create_unique_constraint(CONSTRAINT_NAME, 'asistencias', ['miembro_id', 'ensayo_id'])
+
+
+def downgrade() -> None:
+    # The constraint belongs to 001 on most databases; leave it in place.
+    pass
@@ -0,0 +1,50 @@
+"""Add estadisticas_asistencia table with per-member attendance counters
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'estadisticas_asistencia',
+        sa.Column('miembro_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('miembros.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('temporada', sa.Integer(), primary_key=True),
+        sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('presentes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+    # Choir-wide ranking by attendance rate within a season
+    op.create_index('ix_estadisticas_asistencia_temporada', 'estadisticas_asistencia', ['temporada'])
+
+    # Backfill from existing attendance (temporada 0 = all seasons)
+    op.execute("""
+        INSERT INTO estadisticas_asistencia (miembro_id, temporada, total, presentes)
+        SELECT a.miembro_id, EXTRACT(YEAR FROM e.fecha)::int, COUNT(*),
+               COUNT(*) FILTER (WHERE a.presente)
+        FROM asistencias a JOIN ensayos e ON e.id = a.ensayo_id
+        GROUP BY a.miembro_id, EXTRACT(YEAR FROM e.fecha)
+    """)
+    op.execute("""
+        INSERT INTO estadisticas_asistencia (miembro_id, temporada, total, presentes)
+        SELECT a.miembro_id, 0, COUNT(*), COUNT(*) FILTER (WHERE a.presente)
+        FROM asistencias a JOIN ensayos e ON e.id = a.ensayo_id
+        GROUP BY a.miembro_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('estadisticas_asistencia')
@@ -0,0 +1,73 @@
+"""Add balance ledger (movimientos_saldo) and cached cuota totals (saldos_cuotas)
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 16:00:00.000000
+
+Backfills saldos_cuotas from cuotas (per member, plus the choir-wide row
+keyed by the nil UUID) and resets miembros.saldo_actual to each member's
+outstanding cuotas, since it was never maintained before.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'movimientos_saldo',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('miembro_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('miembros.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('cuota_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('cuotas.id', ondelete='SET NULL')),
+        sa.Column('tipo', sa.String(50), nullable=False),
+        sa.Column('monto', sa.Numeric(10, 2), nullable=False),
+        sa.Column('estado_origen', sa.String(50)),
+        sa.Column('estado_destino', sa.String(50)),
+        sa.Column('created_by', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='SET NULL')),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+    op.create_index('ix_movimientos_saldo_miembro_id', 'movimientos_saldo', ['miembro_id'])
+    op.create_index('ix_movimientos_saldo_cuota_id', 'movimientos_saldo', ['cuota_id'])
+
+    op.create_table(
+        'saldos_cuotas',
+        sa.Column('miembro_id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('total_pagado', sa.Numeric(12, 2), nullable=False, server_default='0'),
+        sa.Column('total_pendiente', sa.Numeric(12, 2), nullable=False, server_default='0'),
+        sa.Column('total_vencido', sa.Numeric(12, 2), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+
+    totals = """
+        COALESCE(SUM(monto) FILTER (WHERE estado = 'pagada'), 0),
+        COALESCE(SUM(monto) FILTER (WHERE estado = 'pendiente'), 0),
+        COALESCE(SUM(monto) FILTER (WHERE estado = 'vencida'), 0)
+    """
+    op.execute(f"""
+        INSERT INTO saldos_cuotas (miembro_id, total_pagado, total_pendiente, total_vencido)
+        SELECT miembro_id, {totals} FROM cuotas GROUP BY miembro_id
+    """)
+    op.execute(f"""
+        INSERT INTO saldos_cuotas (miembro_id, total_pagado, total_pendiente, total_vencido)
+        SELECT '00000000-0000-0000-0000-000000000000'::uuid, {totals} FROM cuotas
+    """)
+    op.execute("""
+        UPDATE miembros m SET saldo_actual = COALESCE((
+            SELECT SUM(c.monto) FROM cuotas c
+            WHERE c.miembro_id = m.id AND c.estado IN ('pendiente', 'vencida')
+        ), 0)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('saldos_cuotas')
+    op.drop_table('movimientos_saldo')
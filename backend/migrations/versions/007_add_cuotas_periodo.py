@@ -0,0 +1,30 @@
+"""Add cuotas.periodo and natural key for generated recurring dues
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('cuotas', sa.Column('periodo', sa.String(7)))
+    # periodo is NULL for one-off cuotas, which never conflict
+    op.create_unique_constraint(
+        'uq_cuotas_miembro_tipo_periodo', 'cuotas', ['miembro_id', 'tipo', 'periodo']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_cuotas_miembro_tipo_periodo', 'cuotas', type_='unique')
+    op.drop_column('cuotas', 'periodo')
@@ -0,0 +1,33 @@
+"""Index cuotas on (estado, fecha_vencimiento) for the overdue job
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 20:00:00.000000
+
+Overdue cuotas are now stored as estado = 'vencida' by a daily job, so
+finance queries filter on a single estado. ix_cuotas_vencidas (from
+indexes_constraints.sql) used CURRENT_DATE in its predicate and is
+replaced by this index. The model declares it too, so databases built
+with scripts/init_db.py (metadata.create_all) may already have it.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_cuotas_vencidas")
+    op.create_index(
+        'ix_cuotas_estado_fecha_vencimiento', 'cuotas', ['estado', 'fecha_vencimiento'], if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_cuotas_estado_fecha_vencimiento', table_name='cuotas', if_exists=True)
@@ -0,0 +1,95 @@
+"""Add composite, partial and covering indexes for the hot query shapes
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 22:00:00.000000
+
+Each index matches a filter + ORDER BY of the public, member and admin
+routers so the planner can read rows in order instead of scanning and
+sorting. Single-column indexes that became a prefix of a new composite
+(or of an existing unique constraint) are dropped.
+
+Databases built with scripts/init_db.py (metadata.create_all) never had
+the single-column indexes from 001 and may already have the new ones, so
+every create and drop is conditional.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Roster / roll-call (ensayo_id, miembro_id) and member history
+    op.create_index(
+        'ix_asistencias_ensayo_miembro', 'asistencias', ['ensayo_id', 'miembro_id'],
+        postgresql_include=['presente'], if_not_exists=True,
+    )
+    op.create_index(
+        'ix_asistencias_miembro_registrado_en', 'asistencias', ['miembro_id', 'registrado_en'],
+        if_not_exists=True,
+    )
+    op.drop_index('ix_asistencias_ensayo_id', table_name='asistencias', if_exists=True)
+    op.drop_index('ix_asistencias_miembro_id', table_name='asistencias', if_exists=True)
+
+    # Member fees by estado and payment history
+    op.create_index(
+        'ix_cuotas_miembro_estado_vencimiento', 'cuotas', ['miembro_id', 'estado', 'fecha_vencimiento'],
+        if_not_exists=True,
+    )
+    op.create_index(
+        'ix_cuotas_pagadas_miembro_fecha_pago', 'cuotas', ['miembro_id', 'fecha_pago'],
+        postgresql_where=sa.text("estado = 'pagada'"), if_not_exists=True,
+    )
+    op.drop_index('ix_cuotas_miembro_id', table_name='cuotas', if_exists=True)
+
+    # Public event list: explicit estado, and the default visible estados
+    op.create_index(
+        'ix_eventos_publicos_estado_fecha', 'eventos_publicos', ['estado', 'fecha'], if_not_exists=True,
+    )
+    op.create_index(
+        'ix_eventos_publicos_visibles_fecha', 'eventos_publicos', ['fecha'],
+        postgresql_where=sa.text("estado IN ('planificado', 'en_curso')"), if_not_exists=True,
+    )
+
+    # Public news
+    op.create_index(
+        'ix_comunicados_dirigido_a_created_at', 'comunicados', ['dirigido_a', 'created_at'], if_not_exists=True,
+    )
+
+    # Admin member list
+    op.create_index('ix_miembros_estado_fecha_ingreso', 'miembros', ['estado', 'fecha_ingreso'], if_not_exists=True)
+
+    # Role lookup on every authenticated request
+    op.create_index(
+        'ix_users_roles_user_id_role_id', 'users_roles', ['user_id'],
+        postgresql_include=['role_id'], if_not_exists=True,
+    )
+    op.drop_index('ix_users_roles_user_id', table_name='users_roles', if_exists=True)
+
+    # Superseded partial indexes from indexes_constraints.sql, if present
+    op.execute("DROP INDEX IF EXISTS ix_eventos_publicos_activos")
+    op.execute("DROP INDEX IF EXISTS ix_asistencias_ensayo_presente")
+
+
+def downgrade() -> None:
+    op.create_index('ix_users_roles_user_id', 'users_roles', ['user_id'], if_not_exists=True)
+    op.drop_index('ix_users_roles_user_id_role_id', table_name='users_roles', if_exists=True)
+    op.drop_index('ix_miembros_estado_fecha_ingreso', table_name='miembros', if_exists=True)
+    op.drop_index('ix_comunicados_dirigido_a_created_at', table_name='comunicados', if_exists=True)
+    op.drop_index('ix_eventos_publicos_visibles_fecha', table_name='eventos_publicos', if_exists=True)
+    op.drop_index('ix_eventos_publicos_estado_fecha', table_name='eventos_publicos', if_exists=True)
+    op.create_index('ix_cuotas_miembro_id', 'cuotas', ['miembro_id'], if_not_exists=True)
+    op.drop_index('ix_cuotas_pagadas_miembro_fecha_pago', table_name='cuotas', if_exists=True)
+    op.drop_index('ix_cuotas_miembro_estado_vencimiento', table_name='cuotas', if_exists=True)
+    op.create_index('ix_asistencias_miembro_id', 'asistencias', ['miembro_id'], if_not_exists=True)
+    op.create_index('ix_asistencias_ensayo_id', 'asistencias', ['ensayo_id'], if_not_exists=True)
+    op.drop_index('ix_asistencias_miembro_registrado_en', table_name='asistencias', if_exists=True)
+    op.drop_index('ix_asistencias_ensayo_miembro', table_name='asistencias', if_exists=True)
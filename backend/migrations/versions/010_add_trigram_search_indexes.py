@@ -0,0 +1,41 @@
+"""Add pg_trgm GIN indexes for admin member and gallery search
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-20 09:00:00.000000
+
+Trigram indexes serve both ILIKE '%term%' and the word-similarity
+operator (term <% column) used by app/services/search_service.py.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = (
+    ('ix_users_nombre_trgm', 'users', 'nombre'),
+    ('ix_users_email_trgm', 'users', 'email'),
+    ('ix_gallery_images_titulo_trgm', 'gallery_images', 'titulo'),
+    ('ix_gallery_images_descripcion_trgm', 'gallery_images', 'descripcion'),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name, table, [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    for name, table, _column in TRIGRAM_INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,74 @@
+"""
+Dues Generation Script
+Creates the recurring cuota of a period for every targeted member.
+
+Safe to re-run: cuotas already generated for the period are skipped.
+
+Usage:
+    python scripts/generate_dues.py --periodo 2026-11 --monto 5000 --admin-email admin@armentum.local
+"""
+
+import sys
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.models import User
+from app.services.dues_service import dues_service
+
+
+def generate(args) -> None:
+    """Generate the period's dues in one transaction."""
+    db = SessionLocal()
+    try:
+        admin = db.query(User).filter(User.email == args.admin_email).first()
+        if not admin:
+            raise ValueError(f"User {args.admin_email} not found")
+        result = dues_service.generate(
+            db,
+            args.periodo,
+            Decimal(args.monto),
+            admin.id,
+            tipo=args.tipo,
+            descripcion=args.descripcion,
+            fecha_vencimiento=date.fromisoformat(args.vencimiento) if args.vencimiento else None,
+            estado_miembro=args.estado,
+            voces=args.voz or None,
+        )
+        db.commit()
+        print(f"Period {result.periodo}: {result.creadas} cuotas created, {result.omitidas} already present.")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate recurring dues for a period")
+    parser.add_argument("--periodo", required=True, help="Period as YYYY-MM")
+    parser.add_argument("--monto", required=True, help="Amount of each cuota")
+    parser.add_argument("--admin-email", required=True, help="Admin recorded as creator")
+    parser.add_argument("--tipo", default="regular", choices=["regular", "extraordinaria"])
+    parser.add_argument("--descripcion", default=None)
+    parser.add_argument("--vencimiento", default=None, help="Due date (YYYY-MM-DD), defaults to end of period")
+    parser.add_argument("--estado", default="activo", help="Member estado to target")
+    parser.add_argument("--voz", action="append", help="Restrict to a voice (repeatable)")
+    args = parser.parse_args()
+
+    try:
+        generate(args)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
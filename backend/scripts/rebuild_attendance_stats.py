@@ -0,0 +1,47 @@
+"""
+Attendance Stats Rebuild Script
+Recomputes the estadisticas_asistencia counters from asistencias.
+
+Run after a backfill, a manual data fix or any write that bypassed the
+attendance service.
+
+Usage:
+    python scripts/rebuild_attendance_stats.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.services.attendance_service import attendance_service
+
+
+def rebuild():
+    """Rebuild all attendance counters in one transaction."""
+    print("Rebuilding attendance stats...")
+    db = SessionLocal()
+    try:
+        written = attendance_service.rebuild_stats(db)
+        db.commit()
+        print(f"  {written} counter rows written.")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def main():
+    """Main entry point."""
+    try:
+        rebuild()
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Balance Reconciliation Script
+Verifies cached member balances against the raw cuotas.
+
+Exits with status 2 when drift is found (and not fixed), so it can run
+from cron and alert.
+
+Usage:
+    python scripts/reconcile_balances.py [--fix]
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.services.ledger_service import ledger_service
+
+
+def reconcile(fix: bool) -> int:
+    """Compare cached balances with cuotas, optionally repairing them."""
+    db = SessionLocal()
+    try:
+        mismatches = ledger_service.reconcile(db, fix=fix)
+        for mismatch in mismatches:
+            print(
+                f"  {mismatch['miembro_id']} {mismatch['campo']}: "
+                f"cached {mismatch['cached']}, expected {mismatch['expected']}"
+            )
+        if fix:
+            db.commit()
+        print(f"{len(mismatches)} mismatches{' fixed' if fix and mismatches else ''}.")
+        return len(mismatches)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reconcile cached member balances")
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="Overwrite drifted cached balances with recomputed values"
+    )
+    args = parser.parse_args()
+
+    mismatches = reconcile(fix=args.fix)
+    if mismatches and not args.fix:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
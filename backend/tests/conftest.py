@@ -8,8 +8,16 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.config import settings
 from app.main import app
 from app.database import Base, get_db
+from app.auth.throttle import login_throttle
+from app.auth.token_store import revocation_list
+from app.routers.members import member_home_cache
+from app.services.events_feed_service import events_feed_service
+from app.services.public_gallery_service import public_gallery_service
+from app.utils.query_cache import query_cache
+from app.utils.shared_cache import shared_cache, shared_limits
 
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -20,6 +28,17 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 
+# Background jobs and the invalidation listener would connect to the configured database
+settings.SCHEDULER_ENABLED = False
+settings.INVALIDATION_BUS_ENABLED = False
+
+# Tests see every write immediately; opt in with the enable_query_cache fixture
+query_cache.enabled = False
+
+# Keep tests off the host's shared cache files; opt in with enable_shared_cache
+shared_cache.enabled = False
+shared_limits.enabled = False
+
 TestingSessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -49,11 +68,43 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    login_throttle.clear()
+    revocation_list.clear()
+    public_gallery_service.clear()
+    events_feed_service.clear()
+    member_home_cache.clear()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def enable_query_cache():
+    """Turn the query result cache on (empty) for one test."""
+    query_cache.clear()
+    query_cache.enabled = True
+    try:
+        yield query_cache
+    finally:
+        query_cache.enabled = False
+        query_cache.clear()
+
+
+@pytest.fixture
+def enable_shared_cache(tmp_path):
+    """Point the shared cache at a fresh file for one test."""
+    path = shared_cache.path
+    shared_cache.close()
+    shared_cache.path = str(tmp_path / "shared-cache.sqlite3")
+    shared_cache.enabled = True
+    try:
+        yield shared_cache
+    finally:
+        shared_cache.close()
+        shared_cache.enabled = False
+        shared_cache.path = path
+
+
 @pytest.fixture
 def sample_user_data():
     """Sample user data for testing."""
@@ -11,8 +11,10 @@ from app.models import (
     Asistencia,
     Cuota,
     Ensayo,
+    EstadisticaAsistencia,
     EventoPublico,
     Miembro,
+    MovimientoSaldo,
     Role,
     User,
     UserRole,
@@ -177,6 +179,62 @@ def test_admin_can_list_members(client, db_session, admin_token):
     assert estado_filter.json()["members"][0]["estado"] == "inactivo"
 
 
+def test_admin_member_search_ranks_and_escapes(client, db_session, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    create_member(db_session, "maria@example.com", nombre="Maria Lopez")
+    create_member(db_session, "contacto@example.com", nombre="Ana Maria")
+    create_member(db_session, "otro@example.com", nombre="Pedro")
+
+    response = client.get("/api/admin/members?search=maria", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    # Matching both nombre and email ranks first
+    assert data["members"][0]["email"] == "maria@example.com"
+
+    # LIKE wildcards in the term are matched literally
+    wildcard = client.get("/api/admin/members?search=%25", headers=headers)
+    assert wildcard.json()["total"] == 0
+
+
+def test_admin_list_members_sparse_fields(client, db_session, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    member = create_member(db_session, "a@example.com", nombre="Alicia")
+
+    full = client.get("/api/admin/members", headers=headers).json()["members"][0]
+    assert set(full) == {"id", "nombre", "email", "voz", "estado", "fecha_ingreso", "telefono", "saldo_actual"}
+
+    data = client.get("/api/admin/members?fields=nombre,estado", headers=headers).json()
+    assert data["total"] == 1
+    assert data["members"] == [{"id": str(member.id), "nombre": "Alicia", "estado": "activo"}]
+
+    # Without user columns the users join is skipped, unless searching
+    voces = client.get("/api/admin/members?fields=voz&search=Alicia", headers=headers).json()
+    assert voces["members"] == [{"id": str(member.id), "voz": "Soprano"}]
+
+    unknown = client.get("/api/admin/members?fields=nombre,password_hash", headers=headers)
+    assert unknown.status_code == 400
+    assert "password_hash" in unknown.json()["detail"]
+
+
+def test_admin_list_cuotas_sparse_fields(client, db_session, admin_token, admin_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    member = create_member(db_session, "a@example.com", nombre="Alicia")
+    cuota = create_cuota(db_session, member, admin_user, monto=Decimal("12.50"))
+
+    full = client.get("/api/admin/finance/cuotas", headers=headers).json()
+    assert full["total"] == 1
+    row = full["cuotas"][0]
+    assert row["miembro_nombre"] == "Alicia"
+    assert row["monto"] == 12.5
+    assert row["userId"] == row["miembro_id"] == str(member.id)
+    assert row["vencimiento"] == row["fecha_vencimiento"] == date.today().isoformat()
+    assert row["fecha_pago"] is None
+
+    sparse = client.get("/api/admin/finance/cuotas?fields=monto,estado&status=pendiente", headers=headers).json()
+    assert sparse == {"cuotas": [{"id": str(cuota.id), "monto": 12.5, "estado": "pendiente"}], "total": 1}
+
+
 def test_admin_can_create_member(client, db_session, admin_token):
     headers = {"Authorization": f"Bearer {admin_token}"}
     payload = {
@@ -222,6 +280,19 @@ def test_admin_can_delete_member(client, db_session, admin_token):
     assert member.estado == "inactivo"
 
 
+def test_admin_delete_member_revokes_sessions(client, db_session, admin_token):
+    from app.auth.token_store import issue_token_pair
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    member = create_member(db_session, "leaving@example.com")
+    _, refresh_token, _ = issue_token_pair(db_session, member.user, ["corista"])
+    db_session.commit()
+
+    assert client.delete(f"/api/admin/members/{member.id}", headers=headers).status_code == 200
+    response = client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 401
+
+
 def test_admin_can_create_event(client, admin_token):
     headers = {"Authorization": f"Bearer {admin_token}"}
     payload = {
@@ -316,10 +387,198 @@ def test_admin_can_register_attendance(client, db_session, admin_token, admin_us
     assert second.json()["presente"] is True
 
 
+def test_admin_bulk_attendance_upserts_roster(client, db_session, admin_token, admin_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    soprano = create_member(db_session, "bulk1@example.com", nombre="Soprano", voz="Soprano")
+    tenor = create_member(db_session, "bulk2@example.com", nombre="Tenor", voz="Tenor")
+    rehearsal = create_rehearsal(db_session, admin_user)
+    db_session.add(Asistencia(
+        miembro_id=soprano.id,
+        ensayo_id=rehearsal.id,
+        presente=True,
+        registrado_por=admin_user.id,
+    ))
+    db_session.commit()
+
+    payload = {"registros": [
+        {"miembro_id": str(soprano.id), "presente": False, "justificacion": "Enfermo"},
+        {"miembro_id": str(tenor.id), "presente": True},
+    ]}
+    response = client.put(f"/api/admin/rehearsals/{rehearsal.id}/attendance", json=payload, headers=headers)
+    assert response.status_code == 200
+    roster = {row["miembro_id"]: row for row in response.json()}
+    assert roster[str(soprano.id)]["presente"] is False
+    assert roster[str(soprano.id)]["justificacion"] == "Enfermo"
+    assert roster[str(tenor.id)]["presente"] is True
+
+    db_session.expire_all()
+    assert db_session.query(Asistencia).filter(Asistencia.ensayo_id == rehearsal.id).count() == 2
+
+
+def test_bulk_attendance_locks_rehearsal_before_reading(client, db_session, admin_token, admin_user, monkeypatch):
+    from app.services import attendance_service as attendance_module
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    member = create_member(db_session, "lock@example.com")
+    rehearsal = create_rehearsal(db_session, admin_user)
+    locked = []
+    lock = attendance_module.lock_rehearsal
+
+    def record_lock(db, ensayo_id):
+        locked.append(ensayo_id)
+        lock(db, ensayo_id)
+
+    monkeypatch.setattr(attendance_module, "lock_rehearsal", record_lock)
+    payload = {"registros": [{"miembro_id": str(member.id), "presente": True}]}
+    response = client.put(f"/api/admin/rehearsals/{rehearsal.id}/attendance", json=payload, headers=headers)
+    assert response.status_code == 200
+    assert locked == [rehearsal.id]
+
+
+def test_admin_bulk_attendance_unknown_member(client, db_session, admin_token, admin_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    rehearsal = create_rehearsal(db_session, admin_user)
+    payload = {"registros": [{"miembro_id": "00000000-0000-0000-0000-000000000001", "presente": True}]}
+    response = client.put(f"/api/admin/rehearsals/{rehearsal.id}/attendance", json=payload, headers=headers)
+    assert response.status_code == 404
+    assert db_session.query(Asistencia).count() == 0
+
+
+def test_admin_rehearsal_roster(client, db_session, admin_token, admin_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    soprano = create_member(db_session, "roster1@example.com", nombre="Ana", voz="Soprano")
+    create_member(db_session, "roster2@example.com", nombre="Bea", voz="Soprano")
+    create_member(db_session, "roster3@example.com", nombre="Carlos", voz="Tenor")
+    create_member(db_session, "roster4@example.com", nombre="Dora", voz="Tenor", estado="inactivo")
+    rehearsal = create_rehearsal(db_session, admin_user)
+    db_session.add(Asistencia(
+        miembro_id=soprano.id,
+        ensayo_id=rehearsal.id,
+        presente=True,
+        registrado_por=admin_user.id,
+    ))
+    db_session.commit()
+
+    response = client.get(f"/api/admin/rehearsals/{rehearsal.id}/attendance", headers=headers)
+    assert response.status_code == 200
+    roster = response.json()
+    assert [row["nombre"] for row in roster] == ["Ana", "Bea", "Carlos"]
+    assert [row["presente"] for row in roster] == [True, False, False]
+
+    response = client.get(
+        f"/api/admin/rehearsals/{rehearsal.id}/attendance",
+        params={"agrupar_por_voz": True},
+        headers=headers,
+    )
+    groups = {group["voz"]: group for group in response.json()}
+    assert groups["Soprano"]["total"] == 2
+    assert groups["Soprano"]["presentes"] == 1
+    assert groups["Soprano"]["ausentes"] == 1
+    assert groups["Tenor"]["total"] == 1
+    assert groups["Tenor"]["presentes"] == 0
+    assert [m["nombre"] for m in groups["Tenor"]["miembros"]] == ["Carlos"]
+
+
+def test_admin_rehearsal_roster_unknown_rehearsal(client, db_session, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    create_member(db_session, "roster5@example.com")
+    response = client.get(
+        "/api/admin/rehearsals/00000000-0000-0000-0000-000000000001/attendance",
+        headers=headers,
+    )
+    assert response.status_code == 404
+
+
+def test_attendance_stats_follow_attendance_writes(client, db_session, admin_token, admin_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    member = create_member(db_session, "stats@example.com")
+    rehearsal = create_rehearsal(db_session, admin_user, fecha=date(2025, 3, 1))
+    other = create_rehearsal(db_session, admin_user, fecha=date(2026, 3, 1))
+
+    def counters(temporada):
+        db_session.expire_all()
+        stats = db_session.get(EstadisticaAsistencia, (member.id, temporada))
+        return (stats.total, stats.presentes) if stats else (0, 0)
+
+    payload = {"miembro_id": str(member.id), "ensayo_id": str(rehearsal.id), "presente": True}
+    client.post("/api/admin/attendance", json=payload, headers=headers)
+    assert counters(0) == (1, 1)
+    assert counters(2025) == (1, 1)
+
+    client.put(
+        f"/api/admin/rehearsals/{rehearsal.id}/attendance/{member.id}",
+        json={"presente": False, "justificacion": "Viaje"},
+        headers=headers,
+    )
+    assert counters(0) == (1, 0)
+
+    client.put(
+        f"/api/admin/rehearsals/{other.id}/attendance",
+        json={"registros": [{"miembro_id": str(member.id), "presente": True}]},
+        headers=headers,
+    )
+    assert counters(0) == (2, 1)
+    assert counters(2026) == (1, 1)
+
+    client.delete(f"/api/admin/rehearsals/{rehearsal.id}", headers=headers)
+    assert counters(0) == (1, 1)
+    assert counters(2025) == (0, 0)
+
+
+def test_attendance_stats_rebuild_matches_incremental(client, db_session, admin_token, admin_user):
+    from app.services.attendance_service import attendance_service
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    member = create_member(db_session, "rebuild@example.com")
+    for presente in (True, False, True):
+        rehearsal = create_rehearsal(db_session, admin_user)
+        payload = {"miembro_id": str(member.id), "ensayo_id": str(rehearsal.id), "presente": presente}
+        client.post("/api/admin/attendance", json=payload, headers=headers)
+
+    def snapshot():
+        db_session.expire_all()
+        return sorted(
+            (row.temporada, row.total, row.presentes)
+            for row in db_session.query(EstadisticaAsistencia).all()
+        )
+
+    incremental = snapshot()
+    attendance_service.rebuild_stats(db_session)
+    db_session.commit()
+    assert snapshot() == incremental
+
+
+def test_admin_attendance_stats_ranking(client, db_session, admin_token, admin_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    regular = create_member(db_session, "regular@example.com", nombre="Regular")
+    irregular = create_member(db_session, "irregular@example.com", nombre="Irregular")
+    for presente in (True, False):
+        rehearsal = create_rehearsal(db_session, admin_user)
+        client.put(
+            f"/api/admin/rehearsals/{rehearsal.id}/attendance",
+            json={"registros": [
+                {"miembro_id": str(regular.id), "presente": True},
+                {"miembro_id": str(irregular.id), "presente": presente},
+            ]},
+            headers=headers,
+        )
+
+    response = client.get("/api/admin/attendance/stats", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert [r["miembro_nombre"] for r in data["records"]] == ["Regular", "Irregular"]
+    assert data["records"][1]["porcentaje"] == 50.0
+
+    response = client.get("/api/admin/attendance/stats", params={"orden": "asc"}, headers=headers)
+    assert response.json()["records"][0]["miembro_nombre"] == "Irregular"
+
+
 def test_admin_attendance_reports(client, db_session, admin_token, admin_user):
     headers = {"Authorization": f"Bearer {admin_token}"}
     member = create_member(db_session, "report@example.com")
     rehearsal = create_rehearsal(db_session, admin_user)
+    second_rehearsal = create_rehearsal(db_session, admin_user, nombre="Ensayo 2")
     asistencia_1 = Asistencia(
         miembro_id=member.id,
         ensayo_id=rehearsal.id,
@@ -328,7 +587,7 @@ def test_admin_attendance_reports(client, db_session, admin_token, admin_user):
     )
     asistencia_2 = Asistencia(
         miembro_id=member.id,
-        ensayo_id=rehearsal.id,
+        ensayo_id=second_rehearsal.id,
         presente=False,
         registrado_por=admin_user.id,
     )
@@ -358,6 +617,25 @@ def test_admin_can_create_due(client, db_session, admin_token, admin_user):
     assert response.json()["estado"] == "pendiente"
 
 
+def test_create_due_ledger_row_references_cuota(client, db_session, admin_token, admin_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    member = create_member(db_session, "due-fk@example.com")
+    db_session.connection().exec_driver_sql("PRAGMA foreign_keys=ON")
+    try:
+        response = client.post("/api/admin/finance/dues", json={
+            "miembro_id": str(member.id),
+            "monto": 40,
+            "tipo": "regular",
+            "fecha_vencimiento": str(date.today()),
+        }, headers=headers)
+    finally:
+        db_session.rollback()
+        db_session.connection().exec_driver_sql("PRAGMA foreign_keys=OFF")
+    assert response.status_code == 201
+    movimiento = db_session.query(MovimientoSaldo).filter(MovimientoSaldo.miembro_id == member.id).one()
+    assert movimiento.cuota_id == UUID(response.json()["id"])
+
+
 def test_admin_can_register_payment(client, db_session, admin_token, admin_user):
     headers = {"Authorization": f"Bearer {admin_token}"}
     member = create_member(db_session, "payment@example.com")
@@ -372,6 +650,94 @@ def test_admin_can_register_payment(client, db_session, admin_token, admin_user)
     assert response.json()["fecha_pago"] == payload["fecha_pago"]
 
 
+def test_ledger_tracks_dues_and_payments(client, db_session, admin_token, admin_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    member = create_member(db_session, "ledger@example.com")
+    other = create_member(db_session, "ledger2@example.com")
+    for target, monto in ((member, 100), (member, 50), (other, 30)):
+        response = client.post("/api/admin/finance/dues", json={
+            "miembro_id": str(target.id),
+            "monto": monto,
+            "tipo": "regular",
+            "fecha_vencimiento": str(date.today()),
+        }, headers=headers)
+        assert response.status_code == 201
+    cuota_id = response.json()["id"]
+
+    summary = client.get("/api/admin/finance/summary", headers=headers).json()
+    assert summary == {"totalIngresos": 0.0, "totalPendiente": 180.0, "totalVencido": 0.0}
+
+    assert client.post(f"/api/admin/finance/cuotas/{cuota_id}/pay", headers=headers).status_code == 200
+    # Paying twice must not be counted twice
+    client.put("/api/admin/finance/payments", json={
+        "cuota_id": cuota_id,
+        "fecha_pago": str(date.today()),
+    }, headers=headers)
+
+    summary = client.get("/api/admin/dashboard/stats", headers=headers).json()["finance"]
+    assert summary == {"totalIngresos": 30.0, "totalPendiente": 150.0, "totalVencido": 0.0}
+
+    db_session.expire_all()
+    assert db_session.get(Miembro, member.id).saldo_actual == Decimal("150.00")
+    assert db_session.get(Miembro, other.id).saldo_actual == Decimal("0.00")
+    assert db_session.query(MovimientoSaldo).count() == 4
+
+
+def test_ledger_reconcile_detects_and_fixes_drift(db_session, admin_user):
+    from app.services.ledger_service import ALL_MEMBERS, ledger_service
+
+    member = create_member(db_session, "drift@example.com")
+    # Written directly, bypassing the ledger
+    create_cuota(db_session, member, admin_user, monto=Decimal("40.00"))
+    ledger_service.adjust_balance(db_session, member.id, Decimal("10.00"), created_by=admin_user.id)
+    db_session.commit()
+
+    mismatches = ledger_service.reconcile(db_session)
+    assert {(m["campo"], m["expected"]) for m in mismatches if m["miembro_id"] == member.id} == {
+        ("total_pendiente", Decimal("40.00")),
+        ("saldo_actual", Decimal("50.00")),
+    }
+
+    ledger_service.reconcile(db_session, fix=True)
+    db_session.commit()
+    assert ledger_service.reconcile(db_session) == []
+    assert ledger_service.get_summary(db_session, ALL_MEMBERS)["totalPendiente"] == 40.0
+
+
+def test_admin_generate_dues_is_idempotent_per_period(client, db_session, admin_token, admin_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    soprano = create_member(db_session, "dues1@example.com", voz="Soprano")
+    create_member(db_session, "dues2@example.com", voz="Tenor")
+    create_member(db_session, "dues3@example.com", voz="Soprano", estado="inactivo")
+    payload = {"periodo": "2026-02", "monto": 25, "voces": ["Soprano"]}
+
+    response = client.post("/api/admin/finance/dues/bulk", json=payload, headers=headers)
+    assert response.status_code == 201
+    assert response.json() == {"periodo": "2026-02", "creadas": 1, "omitidas": 0}
+
+    payload.pop("voces")
+    response = client.post("/api/admin/finance/dues/bulk", json=payload, headers=headers)
+    assert response.json() == {"periodo": "2026-02", "creadas": 1, "omitidas": 1}
+
+    cuotas = db_session.query(Cuota).filter(Cuota.periodo == "2026-02").all()
+    assert len(cuotas) == 2
+    assert {c.fecha_vencimiento for c in cuotas} == {date(2026, 2, 28)}
+    summary = client.get("/api/admin/finance/summary", headers=headers).json()
+    assert summary["totalPendiente"] == 50.0
+    db_session.expire_all()
+    assert db_session.get(Miembro, soprano.id).saldo_actual == Decimal("25.00")
+
+
+def test_admin_generate_dues_rejects_bad_period(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = client.post(
+        "/api/admin/finance/dues/bulk",
+        json={"periodo": "2026-13", "monto": 25},
+        headers=headers,
+    )
+    assert response.status_code == 422
+
+
 def test_admin_finance_report(client, db_session, admin_token, admin_user):
     headers = {"Authorization": f"Bearer {admin_token}"}
     member = create_member(db_session, "reportfinance@example.com")
@@ -0,0 +1,138 @@
+"""
+Tests for admission control by route class
+"""
+
+import asyncio
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.utils.admission import (
+    ADMIN_HEAVY,
+    ADMIN_READ,
+    MEMBER_READ,
+    PUBLIC_READ,
+    UPLOAD,
+    AdmissionClass,
+    AdmissionControlMiddleware,
+    AdmissionController,
+    classify,
+)
+
+
+async def ok(request):
+    return JSONResponse({"ok": True})
+
+
+def _client(limit: int, queue_timeout: float = 0.01) -> tuple[TestClient, AdmissionController]:
+    controller = AdmissionController([AdmissionClass(PUBLIC_READ, limit, queue_timeout)])
+    app = Starlette(routes=[Route("/api/gallery", ok), Route("/api/auth/me", ok)])
+    app.add_middleware(AdmissionControlMiddleware, controller=controller)
+    return TestClient(app), controller
+
+
+class TestClassify:
+    """Tests for route classification."""
+
+    @pytest.mark.parametrize("method,path,expected", [
+        ("GET", "/api/gallery", PUBLIC_READ),
+        ("GET", "/api/events/123", PUBLIC_READ),
+        ("GET", "/api/members/me/home", MEMBER_READ),
+        ("GET", "/api/rehearsals", MEMBER_READ),
+        ("GET", "/api/admin/members", ADMIN_READ),
+        ("GET", "/api/admin/finance/reports", ADMIN_HEAVY),
+        ("GET", "/api/admin/dashboard/stats", ADMIN_HEAVY),
+        ("POST", "/api/admin/finance/dues/bulk", ADMIN_HEAVY),
+        ("POST", "/api/admin/gallery", UPLOAD),
+        ("PUT", "/api/admin/gallery/abc/replace", UPLOAD),
+        ("PUT", "/api/admin/gallery/abc", None),
+        ("POST", "/api/auth/login", None),
+        ("GET", "/health/ready", None),
+        ("GET", "/api/eventsfeed", None),
+    ])
+    def test_classes(self, method, path, expected):
+        assert classify(method, path) == expected
+
+
+class TestAdmissionClass:
+    """Tests for slot accounting."""
+
+    def test_queued_request_gets_released_slot(self):
+        async def scenario():
+            admission = AdmissionClass("test", limit=1, queue_timeout_seconds=5)
+            assert await admission.acquire()
+            waiter = asyncio.ensure_future(admission.acquire())
+            await asyncio.sleep(0)
+            assert (admission.active, admission.queued) == (1, 1)
+            admission.release()
+            assert await waiter
+            assert (admission.active, admission.queued) == (1, 0)
+            admission.release()
+            return admission
+
+        admission = asyncio.run(scenario())
+        assert admission.active == 0
+        assert admission.stats()["admitted"] == 2
+        assert admission.stats()["max_queued"] == 1
+
+    def test_sheds_after_queue_timeout(self):
+        async def scenario():
+            admission = AdmissionClass("test", limit=1, queue_timeout_seconds=0.01)
+            await admission.acquire()
+            assert not await admission.acquire()
+            admission.release()
+            return admission
+
+        admission = asyncio.run(scenario())
+        assert admission.stats()["shed"] == 1
+        assert (admission.active, admission.queued) == (0, 0)
+
+    def test_cancelled_waiter_leaves_queue(self):
+        async def scenario():
+            admission = AdmissionClass("test", limit=1, queue_timeout_seconds=5)
+            await admission.acquire()
+            waiter = asyncio.ensure_future(admission.acquire())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            assert admission.queued == 0
+            admission.release()
+            return admission
+
+        assert asyncio.run(scenario()).active == 0
+
+    def test_retry_after(self):
+        assert AdmissionClass("test", 1, 0.5).retry_after == 1
+        assert AdmissionClass("test", 1, 15).retry_after == 15
+
+
+class TestAdmissionControlMiddleware:
+    """Tests for the middleware."""
+
+    def test_admits_and_releases(self):
+        client, controller = _client(limit=1)
+        for _ in range(3):
+            assert client.get("/api/gallery").status_code == 200
+        stats = controller.stats()[PUBLIC_READ]
+        assert (stats["active"], stats["admitted"], stats["shed"]) == (0, 3, 0)
+
+    def test_saturated_class_is_shed(self):
+        client, controller = _client(limit=0)
+        response = client.get("/api/gallery")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert response.json() == {"detail": "Service busy, retry shortly"}
+        assert controller.stats()[PUBLIC_READ]["shed"] == 1
+
+    def test_unclassified_routes_bypass(self):
+        client, _ = _client(limit=0)
+        assert client.get("/api/auth/me").status_code == 200
+
+
+def test_readiness_reports_admission(client):
+    data = client.get("/health/ready").json()
+    assert set(data["admission"]) == {PUBLIC_READ, MEMBER_READ, ADMIN_READ, ADMIN_HEAVY, UPLOAD}
@@ -44,6 +44,49 @@ class TestPasswordHashing:
         assert verify_password("wrongpassword", hashed) is False
 
 
+class TestPasswordHasherExecutor:
+    """Tests for the dedicated password-hashing executor."""
+    
+    def test_hash_and_verify_on_executor(self):
+        """Test hashing and verification through the executor."""
+        import asyncio
+        from app.auth.password_hasher import PasswordHasher
+        hasher = PasswordHasher(max_workers=1, max_pending=4)
+        
+        async def run():
+            hashed = await hasher.hash("testpassword123")
+            return await hasher.verify("testpassword123", hashed)
+        
+        try:
+            assert asyncio.run(run()) is True
+            stats = hasher.stats()
+            assert stats["completed"] == 2
+            assert stats["queued"] == 0
+        finally:
+            hasher.shutdown()
+    
+    def test_rejects_when_backlog_full(self):
+        """Test that requests beyond the pending limit are shed."""
+        import asyncio
+        from app.auth.password_hasher import PasswordHasher
+        from app.exceptions import ServiceBusyError
+        hasher = PasswordHasher(max_workers=1, max_pending=1)
+        
+        async def run():
+            return await asyncio.gather(
+                hasher.hash("one-password"),
+                hasher.hash("two-password"),
+                return_exceptions=True,
+            )
+        
+        try:
+            results = asyncio.run(run())
+            assert any(isinstance(r, ServiceBusyError) for r in results)
+            assert hasher.stats()["rejected"] == 1
+        finally:
+            hasher.shutdown()
+
+
 class TestJWTTokens:
     """Tests for JWT token creation and validation."""
     
@@ -95,6 +138,112 @@ class TestJWTTokens:
         assert payload["type"] == "verification"
 
 
+class TestTokenVerificationCache:
+    """Tests for the verified-token cache and JWT backends."""
+    
+    def test_verify_token_is_cached(self):
+        """Test that a token is only decoded once."""
+        from app.auth.jwt import token_cache, verify_token, TokenCache
+        token = create_access_token({"sub": "cache-user", "roles": ["corista"]})
+        token_cache.clear()
+        
+        first = verify_token(token)
+        second = verify_token(token)
+        
+        assert first.user_id == second.user_id == "cache-user"
+        assert token_cache.hits == 1
+        assert token_cache.get(TokenCache.key(token)) is not None
+    
+    def test_cached_token_still_checks_type(self):
+        """Test that a cached access token is rejected as refresh token."""
+        from app.auth.jwt import verify_token
+        from app.exceptions import InvalidTokenError
+        token = create_access_token({"sub": "cache-user"})
+        verify_token(token, token_type="access")
+        
+        with pytest.raises(InvalidTokenError):
+            verify_token(token, token_type="refresh")
+    
+    def test_expired_entries_are_evicted(self):
+        """Test that cache entries do not outlive the token."""
+        from app.auth.jwt import TokenCache, VerifiedToken
+        from app.schemas import TokenData
+        cache = TokenCache(maxsize=10)
+        key = TokenCache.key("token")
+        cache.set(key, VerifiedToken(TokenData(user_id="u"), {"exp": 0}))
+        
+        assert cache.get(key) is None
+        assert len(cache) == 0
+    
+    def test_cache_is_bounded(self):
+        """Test LRU eviction when the cache is full."""
+        from app.auth.jwt import TokenCache, VerifiedToken
+        from app.schemas import TokenData
+        cache = TokenCache(maxsize=2)
+        entry = VerifiedToken(TokenData(user_id="u"), {"exp": 9999999999})
+        for token in ("a", "b", "c"):
+            cache.set(TokenCache.key(token), entry)
+        
+        assert len(cache) == 2
+        assert cache.get(TokenCache.key("a")) is None
+    
+    def test_verified_token_parses_subject_uuid(self):
+        """Test that the subject UUID is parsed once and exposed."""
+        from uuid import uuid4
+        from app.auth.jwt import verify_token_cached
+        user_id = uuid4()
+        token = create_access_token({"sub": str(user_id)})
+        
+        assert verify_token_cached(token).subject_uuid == user_id
+    
+    def test_pyjwt_backend_interoperates_with_jose(self):
+        """Test that tokens signed by one backend verify with the other."""
+        from app.auth.jwt import get_jwt_backend
+        jose_backend = get_jwt_backend("jose")
+        pyjwt_backend = get_jwt_backend("pyjwt")
+        payload = {"sub": "interop", "type": "access", "exp": datetime.utcnow() + timedelta(minutes=5)}
+        
+        assert pyjwt_backend.decode(jose_backend.encode(payload))["sub"] == "interop"
+        assert jose_backend.decode(pyjwt_backend.encode(payload))["sub"] == "interop"
+    
+    def test_pyjwt_backend_expired_token(self):
+        """Test that PyJWT backend maps expiry to TokenExpiredError."""
+        from app.auth.jwt import get_jwt_backend
+        from app.exceptions import TokenExpiredError
+        backend = get_jwt_backend("pyjwt")
+        token = backend.encode({"sub": "x", "exp": datetime.utcnow() - timedelta(minutes=1)})
+        
+        with pytest.raises(TokenExpiredError):
+            backend.decode(token)
+
+
+class TestRevocationList:
+    """Tests for the in-memory revoked-family denylist."""
+    
+    def test_bloom_filter_membership(self):
+        """Test that added keys are always reported present."""
+        from app.auth.token_store import BloomFilter
+        bloom = BloomFilter(size_bits=1024)
+        keys = [f"family-{i}" for i in range(50)]
+        for key in keys:
+            bloom.add(key)
+        
+        assert all(key in bloom for key in keys)
+    
+    def test_revoked_family_expires(self):
+        """Test that revocations are dropped once the tokens have expired."""
+        import time
+        from app.auth.token_store import RevocationList
+        revocations = RevocationList(sync_interval_seconds=60)
+        revocations.add("live", time.time() + 60)
+        revocations.add("expired", time.time() - 1)
+        
+        assert revocations.is_revoked("live") is True
+        assert revocations.is_revoked("expired") is False
+        assert revocations.is_revoked("unknown") is False
+        assert revocations.is_revoked(None) is False
+
+
 class TestRegisterEndpoint:
     """Tests for POST /api/auth/register endpoint."""
     
@@ -222,6 +371,77 @@ class TestLoginEndpoint:
         
         assert response.status_code == 401
     
+    def test_login_throttled_after_repeated_failures(self, client, registered_user):
+        """Test that repeated failures for an email are rejected with 429."""
+        for _ in range(settings.LOGIN_MAX_FAILURES_PER_EMAIL):
+            response = client.post("/api/auth/login", json={
+                "email": "login@example.com",
+                "password": "wrongpassword"
+            })
+            assert response.status_code == 401
+        
+        response = client.post("/api/auth/login", json={
+            "email": "login@example.com",
+            "password": "correctpassword"
+        })
+        
+        assert response.status_code == 429
+        assert "retry-after" in response.headers
+
+    def test_login_throttled_per_forwarded_ip(self, client, monkeypatch):
+        """Test that clients behind the proxy are throttled by their forwarded IP."""
+        from app.auth.throttle import login_throttle
+        monkeypatch.setattr(login_throttle.by_ip, "limit", 2)
+        monkeypatch.setattr(settings, "TRUSTED_PROXY_HOPS", 1)
+
+        def login(forwarded_for, attempt):
+            return client.post(
+                "/api/auth/login",
+                json={"email": f"nobody{attempt}@example.com", "password": "wrongpassword"},
+                headers={"X-Forwarded-For": forwarded_for},
+            )
+
+        assert login("203.0.113.7", 1).status_code == 401
+        # A client-supplied entry left of the proxy's does not change the key
+        assert login("198.51.100.1, 203.0.113.7", 2).status_code == 401
+        assert login("203.0.113.7", 3).status_code == 429
+        assert login("203.0.113.8", 4).status_code == 401
+
+    def test_forwarded_for_ignored_without_trusted_proxy(self, client, monkeypatch):
+        """Test that X-Forwarded-For cannot rotate the IP key when no proxy is trusted."""
+        from app.auth.throttle import login_throttle
+        monkeypatch.setattr(login_throttle.by_ip, "limit", 2)
+        monkeypatch.setattr(settings, "TRUSTED_PROXY_HOPS", 0)
+        
+        for attempt, forwarded_for in enumerate(["203.0.113.7", "203.0.113.8"]):
+            response = client.post(
+                "/api/auth/login",
+                json={"email": f"nobody{attempt}@example.com", "password": "wrongpassword"},
+                headers={"X-Forwarded-For": forwarded_for},
+            )
+            assert response.status_code == 401
+        response = client.post(
+            "/api/auth/login",
+            json={"email": "nobody2@example.com", "password": "wrongpassword"},
+            headers={"X-Forwarded-For": "203.0.113.9"},
+        )
+        assert response.status_code == 429
+
+    def test_login_rehashes_outdated_cost(self, client, db_session, registered_user):
+        """Test that a hash with a different bcrypt cost is upgraded on login."""
+        from passlib.hash import bcrypt
+        registered_user.password_hash = bcrypt.using(rounds=4).hash("correctpassword")
+        db_session.commit()
+        
+        response = client.post("/api/auth/login", json={
+            "email": "login@example.com",
+            "password": "correctpassword"
+        })
+        
+        assert response.status_code == 200
+        db_session.refresh(registered_user)
+        assert registered_user.password_hash.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+    
     def test_login_inactive_user(self, client, db_session):
         """Test login with inactive user fails."""
         role = Role(nombre="corista", descripcion="Default role")
@@ -270,7 +490,9 @@ class TestRefreshTokenEndpoint:
         db_session.add(user_role)
         db_session.commit()
         
-        refresh_token = create_refresh_token(data={"sub": str(user.id)})
+        from app.auth.token_store import issue_token_pair
+        _, refresh_token, _ = issue_token_pair(db_session, user, ["corista"])
+        db_session.commit()
         
         return user, refresh_token
     
@@ -287,6 +509,56 @@ class TestRefreshTokenEndpoint:
         assert "access_token" in data
         assert "refresh_token" in data
     
+    def test_refresh_token_is_rotated(self, client, user_with_tokens):
+        """Test that a refresh token can only be used once."""
+        user, refresh_token = user_with_tokens
+        
+        first = client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+        assert first.status_code == 200
+        
+        reused = client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+        assert reused.status_code == 401
+    
+    def test_refresh_token_reuse_revokes_family(self, client, user_with_tokens):
+        """Test that reusing a rotated token revokes the tokens issued from it."""
+        user, refresh_token = user_with_tokens
+        
+        rotated = client.post("/api/auth/refresh", json={"refresh_token": refresh_token}).json()
+        client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+        
+        response = client.post("/api/auth/refresh", json={"refresh_token": rotated["refresh_token"]})
+        assert response.status_code == 401
+        response = client.get(
+            "/api/auth/me",
+            headers={"Authorization": f"Bearer {rotated['access_token']}"}
+        )
+        assert response.status_code == 401
+    
+    def test_expired_sessions_are_pruned(self, client, db_session, user_with_tokens):
+        """Test that pruning deletes only token sessions past their expiry."""
+        from app.auth.token_store import prune_token_sessions
+        from app.models import TokenSession
+        user, refresh_token = user_with_tokens
+        expired = TokenSession(
+            family_id=user.id, user_id=user.id, expires_at=datetime.utcnow() - timedelta(seconds=1)
+        )
+        db_session.add(expired)
+        db_session.commit()
+        
+        assert prune_token_sessions(db_session) == 1
+        db_session.commit()
+        assert db_session.query(TokenSession).count() == 1
+        response = client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+        assert response.status_code == 200
+    
+    def test_unrecorded_refresh_token_rejected(self, client, user_with_tokens):
+        """Test that refresh tokens not in the token store are rejected."""
+        user, _ = user_with_tokens
+        token = create_refresh_token(data={"sub": str(user.id)})
+        
+        response = client.post("/api/auth/refresh", json={"refresh_token": token})
+        assert response.status_code == 401
+    
     def test_refresh_token_invalid(self, client):
         """Test refresh with invalid token fails."""
         response = client.post("/api/auth/refresh", json={
@@ -464,6 +736,31 @@ class TestLogoutEndpoint:
         
         assert response.status_code == 200
         assert "logged out" in response.json()["message"].lower()
+    
+    def test_logout_revokes_tokens(self, client, db_session):
+        """Test that logout invalidates the access and refresh tokens of the session."""
+        role = Role(nombre="corista", descripcion="Default role")
+        db_session.add(role)
+        db_session.commit()
+        db_session.add(User(
+            email="logout@example.com",
+            password_hash=get_password_hash("password123"),
+            nombre="Logout User",
+            is_active=True,
+            email_verified=True,
+        ))
+        db_session.commit()
+        
+        tokens = client.post("/api/auth/login", json={
+            "email": "logout@example.com",
+            "password": "password123",
+        }).json()
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        
+        assert client.post("/api/auth/logout", headers=headers).status_code == 200
+        assert client.get("/api/auth/me", headers=headers).status_code == 401
+        response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert response.status_code == 401
 
 
 class TestProtectedEndpoints:
@@ -0,0 +1,147 @@
+"""
+Tests for response compression and precompressed bodies
+"""
+
+import gzip
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.services.public_gallery_service import public_gallery_service
+from app.utils import compression
+from app.utils.compression import (
+    CompressionMiddleware,
+    PrecompressedBody,
+    PrecompressedResponse,
+    negotiate,
+)
+
+LARGE = {"items": ["x" * 40] * 100}
+PRECOMPRESSED = PrecompressedBody(b'{"data":"' + b"y" * 4000 + b'"}')
+
+
+async def large(request):
+    return JSONResponse(LARGE)
+
+
+async def small(request):
+    return JSONResponse({"ok": True})
+
+
+async def image(request):
+    return Response(b"\x89PNG" + b"0" * 4000, media_type="image/png")
+
+
+async def stream(request):
+    async def chunks():
+        for i in range(5):
+            yield f"line {i}\n".encode() * 50
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+async def cached(request):
+    return PrecompressedResponse(PRECOMPRESSED)
+
+
+app = Starlette(routes=[
+    Route("/large", large),
+    Route("/small", small),
+    Route("/image", image),
+    Route("/stream", stream),
+    Route("/cached", cached),
+])
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+test_client = TestClient(app)
+
+
+class TestNegotiate:
+    """Tests for Accept-Encoding negotiation."""
+
+    def test_prefers_server_order_on_ties(self):
+        assert negotiate("gzip, br", encodings=("br", "gzip")) == "br"
+        assert negotiate("gzip, br", encodings=("gzip",)) == "gzip"
+
+    def test_q_values(self):
+        assert negotiate("br;q=0.5, gzip", encodings=("br", "gzip")) == "gzip"
+        assert negotiate("gzip;q=0", encodings=("gzip",)) is None
+        assert negotiate("*;q=0.1", encodings=("gzip",)) == "gzip"
+        assert negotiate("GZIP ; q = 0.8", encodings=("gzip",)) == "gzip"
+
+    def test_identity(self):
+        assert negotiate("", encodings=("br", "gzip")) is None
+        assert negotiate("deflate, identity", encodings=("br", "gzip")) is None
+
+
+class TestCompressionMiddleware:
+    """Tests for the compression middleware."""
+
+    def test_compresses_large_json(self):
+        response = test_client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < 4000
+        assert response.json() == LARGE
+
+    def test_skips_small_and_binary_responses(self):
+        response = test_client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        response = test_client.get("/image", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert "vary" not in response.headers
+
+    def test_identity_when_not_accepted(self):
+        response = test_client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json() == LARGE
+
+    def test_streams_chunks(self):
+        response = test_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.text == "".join(f"line {i}\n" * 50 for i in range(5))
+
+
+class TestPrecompressed:
+    """Tests for reusable precompressed bodies."""
+
+    def test_variant_built_once(self, monkeypatch):
+        calls = []
+        original = compression.compress
+        monkeypatch.setattr(compression, "compress", lambda body, encoding: calls.append(encoding) or original(body, encoding))
+        body = PrecompressedBody(b"z" * 2000)
+
+        first, encoding = body.encoded("gzip")
+        assert encoding == "gzip"
+        assert gzip.decompress(first) == body.body
+        assert body.encoded("gzip")[0] is first
+        assert calls == ["gzip"]
+        assert body.encoded(None) == (body.body, None)
+
+    def test_small_body_sent_as_is(self):
+        body = PrecompressedBody(b"{}")
+        assert body.encoded("gzip") == (b"{}", None)
+
+    def test_response_not_recompressed_by_middleware(self):
+        response = test_client.get("/cached", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.content == PRECOMPRESSED.body
+        plain = test_client.get("/cached", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.content == PRECOMPRESSED.body
+
+    def test_public_gallery_page_keeps_its_variant(self, client, test_gallery_image, monkeypatch):
+        monkeypatch.setattr(compression.settings, "COMPRESSION_MINIMUM_SIZE", 10)
+        headers = {"Accept-Encoding": "gzip"}
+        first = client.get("/api/gallery", headers=headers)
+        assert first.headers["content-encoding"] == "gzip"
+
+        page = public_gallery_service.get_page(None, [], 0, 100)  # cached by the request above
+        variant = page.encoded("gzip")[0]
+        second = client.get("/api/gallery", headers=headers)
+        assert second.json() == first.json()
+        assert page.encoded("gzip")[0] is variant
@@ -0,0 +1,128 @@
+"""
+Tests for the cross-worker invalidation bus
+"""
+
+import asyncio
+
+from sqlalchemy import update
+
+from app.models import GalleryImage, Role
+from app.services.public_gallery_service import public_gallery_service
+from app.utils import invalidation_bus as bus_module
+from app.utils.invalidation_bus import (
+    Invalidation,
+    InvalidationBus,
+    LoopbackTransport,
+    PostgresNotifyTransport,
+    invalidation_bus,
+)
+
+
+def _capture_published(monkeypatch) -> list:
+    published = []
+    monkeypatch.setattr(invalidation_bus, "publish", published.append)
+    return published
+
+
+class TestInvalidation:
+    """Tests for the Invalidation message."""
+
+    def test_round_trip(self):
+        message = Invalidation(tables={"roles": frozenset({"a", "b"}), "users": None}, origin="w1")
+        assert Invalidation.decode(message.encode()) == message
+
+    def test_oversized_payload_drops_ids(self, monkeypatch):
+        monkeypatch.setattr(bus_module, "MAX_PAYLOAD_BYTES", 100)
+        message = Invalidation(tables={"users": frozenset(str(i) * 10 for i in range(10))}, origin="w1")
+        assert Invalidation.decode(message.encode()).tables == {"users": None}
+
+    def test_affects(self):
+        message = Invalidation(tables={"roles": None})
+        assert message.affects(frozenset({"roles", "users"}))
+        assert not message.affects(frozenset({"users"}))
+        assert message.affects(None)
+        assert Invalidation(everything=True).affects(frozenset({"users"}))
+
+
+class TestInvalidationBus:
+    """Tests for InvalidationBus and the loopback transport."""
+
+    def test_subscribers_filtered_by_table(self):
+        bus = InvalidationBus()
+        seen = []
+        bus.subscribe(lambda message: seen.append("roles"), tables=["roles"])
+        bus.subscribe(lambda message: seen.append("any"))
+        bus.publish({"users": None})
+        assert seen == ["any"]
+
+    def test_failing_handler_does_not_stop_others(self):
+        bus = InvalidationBus()
+        seen = []
+        bus.subscribe(lambda message: 1 / 0)
+        bus.subscribe(lambda message: seen.append(message))
+        bus.publish({"roles": None})
+        assert len(seen) == 1
+        assert bus.stats()["errors"] == 1
+
+    def test_loopback_reaches_other_workers_once(self):
+        transport = LoopbackTransport()
+        workers = [InvalidationBus() for _ in range(3)]
+        seen = {index: [] for index in range(3)}
+        for index, bus in enumerate(workers):
+            bus.subscribe(lambda message, index=index: seen[index].append(message.tables), tables=["roles"])
+            asyncio.run(bus.start(transport))
+
+        workers[0].publish({"roles": frozenset({"r1"})})
+        assert all(tables == [{"roles": frozenset({"r1"})}] for tables in seen.values())
+        assert [bus.stats()["received"] for bus in workers] == [0, 1, 1]
+
+    def test_notify_payload_delivered(self):
+        bus = InvalidationBus()
+        seen = []
+        bus.subscribe(seen.append)
+        transport = PostgresNotifyTransport(engine=None, channel="test")
+        transport._bus = bus
+        transport._on_notify(None, 1, "test", Invalidation(tables={"roles": None}, origin="other").encode())
+        transport._on_notify(None, 1, "test", "not json")
+        transport._on_notify(None, 1, "test", Invalidation(tables={"roles": None}, origin=bus.origin).encode())
+        assert [message.tables for message in seen] == [{"roles": None}]
+
+
+class TestSessionPublishing:
+    """Commits publish the rows they wrote."""
+
+    def test_commit_publishes_row_ids(self, db_session, monkeypatch):
+        published = _capture_published(monkeypatch)
+        role = Role(nombre="corista")
+        db_session.add(role)
+        db_session.commit()
+        assert published == [{"roles": frozenset({str(role.id)})}]
+
+    def test_bulk_write_publishes_whole_table(self, db_session, monkeypatch):
+        published = _capture_published(monkeypatch)
+        db_session.execute(update(Role).values(descripcion="x"))
+        db_session.commit()
+        assert published == [{"roles": None}]
+
+    def test_rollback_publishes_nothing(self, db_session, monkeypatch):
+        published = _capture_published(monkeypatch)
+        db_session.add(Role(nombre="corista"))
+        db_session.flush()
+        db_session.rollback()
+        db_session.commit()
+        assert published == []
+
+
+def test_remote_gallery_write_evicts_local_pages(client, test_gallery_image):
+    assert client.get("/api/gallery").json()["total"] == 1
+    assert len(public_gallery_service.pages) == 1
+
+    transport = LoopbackTransport()
+    other_worker = InvalidationBus()
+    asyncio.run(invalidation_bus.start(transport))
+    try:
+        asyncio.run(other_worker.start(transport))
+        other_worker.publish({GalleryImage.__tablename__: frozenset({str(test_gallery_image.id)})})
+    finally:
+        asyncio.run(invalidation_bus.stop())
+    assert len(public_gallery_service.pages) == 0
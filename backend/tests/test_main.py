@@ -85,3 +85,71 @@ class TestOpenAPI:
         assert response.status_code == 200
         data = response.json()
         assert data["info"]["title"] == "Armentum API"
+
+
+class TestHealthProbes:
+    """Tests for the /health/live and /health/ready probes."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_probe_cache(self):
+        from app.utils.health_checks import probe_cache
+        probe_cache.clear()
+        yield
+        probe_cache.clear()
+
+    def test_liveness(self, client):
+        response = client.get("/health/live")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ok"
+
+    def test_readiness_ok(self, client, monkeypatch):
+        from app.utils import health_checks
+
+        async def healthy():
+            return {"status": "healthy", "details": {}}
+
+        monkeypatch.setitem(health_checks.PROBES, "database", healthy)
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ready"] is True
+        assert data["checks"]["database"]["status"] == "healthy"
+        assert "sync" in data["pool"]
+
+    def test_readiness_unavailable_when_database_down(self, client, monkeypatch):
+        from app.utils import health_checks
+
+        async def unhealthy():
+            return {"status": "unhealthy", "details": {"error": "down"}}
+
+        monkeypatch.setitem(health_checks.PROBES, "database", unhealthy)
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "unavailable"
+
+    def test_readiness_results_are_cached(self, client, monkeypatch):
+        from app.utils import health_checks
+        calls = []
+
+        async def counting():
+            calls.append(1)
+            return {"status": "healthy", "details": {}}
+
+        monkeypatch.setitem(health_checks.PROBES, "database", counting)
+        client.get("/health/ready")
+        client.get("/health/ready")
+        assert len(calls) == 1
+
+    def test_probe_timeout_marks_unhealthy(self, client, monkeypatch):
+        import asyncio
+        from app.utils import health_checks
+
+        async def slow():
+            await asyncio.sleep(1)
+            return {"status": "healthy", "details": {}}
+
+        monkeypatch.setitem(health_checks.PROBES, "database", slow)
+        monkeypatch.setattr(health_checks.settings, "HEALTH_PROBE_TIMEOUT_SECONDS", 0.05)
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert "Timed out" in response.json()["checks"]["database"]["details"]["error"]
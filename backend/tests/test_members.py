@@ -4,6 +4,11 @@ from datetime import date, timedelta
 
 from app.models import User, Role, UserRole, Miembro, Cuota, Ensayo, Asistencia
 from app.auth.jwt import create_access_token
+from tests.conftest import engine
+from app.routers.members import member_home_cache
+from app.utils.query_profiler import install_query_profiler
+from app.services.attendance_service import attendance_service
+from app.services.ledger_service import ledger_service
 
 
 def create_member_with_fees(db_session):
@@ -150,6 +155,37 @@ def test_update_member_profile_success(client, db_session):
     assert data["voz"] == "Alto"
 
 
+def test_member_profile_resolved_in_one_query(client, db_session):
+    install_query_profiler(engine)
+    token, member, _ = create_member_with_fees(db_session)
+    headers = {"Authorization": f"Bearer {token}", "X-Query-Profile": "1"}
+    client.get("/api/members/me", headers=headers)  # first request syncs the revocation list
+    response = client.get("/api/members/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == "member@example.com"
+    assert response.headers["server-timing"].endswith('desc="1 queries"')
+
+
+def test_update_member_profile_keeps_unset_fields(client, db_session):
+    token, member, _ = create_member_with_fees(db_session)
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.put("/api/members/me", json={"voz": "Alto"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["telefono"] == "123456789"
+    db_session.refresh(member)
+    assert member.voz == "Alto"
+    assert member.telefono == "123456789"
+
+
+def test_member_endpoints_without_profile(client, db_session, admin_user):
+    token = create_access_token(data={"sub": str(admin_user.id), "roles": ["admin"]})
+    headers = {"Authorization": f"Bearer {token}"}
+    for path in ("/api/members/me", "/api/attendance/me", "/api/finance/me/summary"):
+        response = client.get(path, headers=headers)
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Member profile not found"
+
+
 def test_update_member_profile_forbidden_field(client, db_session):
     token, member, _ = create_member_with_fees(db_session)
     headers = {"Authorization": f"Bearer {token}"}
@@ -158,6 +194,43 @@ def test_update_member_profile_forbidden_field(client, db_session):
     assert response.status_code == 422
 
 
+def test_member_home_aggregates_and_caches(client, db_session):
+    token, member, _ = create_member_with_fees(db_session)
+    headers = {"Authorization": f"Bearer {token}"}
+    today = date.today()
+    for offset in range(4):
+        db_session.add(Ensayo(tipo="general", nombre=f"R{offset}", fecha=today + timedelta(days=offset),
+                              hora="19:00", lugar="Sala", created_by=member.user_id))
+    db_session.add(Ensayo(tipo="general", nombre="Pasado", fecha=today - timedelta(days=1),
+                          hora="19:00", lugar="Sala", created_by=member.user_id))
+    db_session.commit()
+    # fees were written directly, bypassing the ledger
+    ledger_service.reconcile(db_session, fix=True)
+    db_session.commit()
+
+    response = client.get("/api/members/me/home?ensayos=3", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["perfil"]["id"] == str(member.id)
+    assert [r["nombre"] for r in data["proximos_ensayos"]] == ["R0", "R1", "R2"]
+    assert data["asistencia"]["total_ensayos"] == 0
+    assert data["finanzas"] == {"totalIngresos": 200.0, "totalPendiente": 100.0, "totalVencido": 300.0}
+
+    # Served from the per-member cache, sliced to the requested count
+    assert len(client.get("/api/members/me/home?ensayos=4", headers=headers).json()["proximos_ensayos"]) == 4
+    assert member_home_cache.hits == 1
+
+    # The member's own profile update is visible immediately
+    client.put("/api/members/me", json={"telefono": "555"}, headers=headers)
+    assert client.get("/api/members/me/home", headers=headers).json()["perfil"]["telefono"] == "555"
+
+
+def test_member_home_without_profile(client, db_session, admin_user):
+    token = create_access_token(data={"sub": str(admin_user.id), "roles": ["admin"]})
+    response = client.get("/api/members/me/home", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 404
+
+
 # ==========================================
 # Rehearsals endpoints (T039-T040)
 # ==========================================
@@ -243,6 +316,9 @@ def test_list_attendance_and_stats(client, db_session):
     a2 = Asistencia(miembro_id=member.id, ensayo_id=rehearsal2.id, presente=False, registrado_por=member.user_id)
     db_session.add_all([a1, a2])
     db_session.commit()
+    # rows were written directly, bypassing the incremental counters
+    attendance_service.rebuild_stats(db_session)
+    db_session.commit()
 
     # list attendance
     response = client.get("/api/attendance/me", headers=headers)
@@ -1,5 +1,5 @@
 from uuid import uuid4
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 
 from app.models import EventoPublico, Comunicado
 
@@ -80,3 +80,114 @@ def test_get_page_valid_slugs(client):
 def test_get_page_invalid_slug(client):
     response = client.get("/api/pages/invalid_slug")
     assert response.status_code == 404
+
+
+def test_public_gallery_compact_and_cached(client, db_session, test_gallery_image):
+    from app.services.public_gallery_service import public_gallery_service
+
+    response = client.get("/api/gallery")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    image = data["images"][0]
+    assert image["titulo"] == test_gallery_image.titulo
+    assert "created_by" not in image and "updated_at" not in image
+
+    # Served from the snapshot until a commit writes gallery_images
+    assert client.get("/api/gallery").json() == data
+    assert public_gallery_service.pages.hits == 1
+
+    test_gallery_image.titulo = "Renombrada"
+    db_session.commit()
+    assert client.get("/api/gallery").json()["images"][0]["titulo"] == "Renombrada"
+
+
+def test_public_gallery_invalidated_by_admin_update(client, test_gallery_image, auth_headers):
+    client.get("/api/gallery")
+    response = client.put(
+        f"/api/admin/gallery/{test_gallery_image.id}",
+        data={"titulo": "Nuevo titulo"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert client.get("/api/gallery").json()["images"][0]["titulo"] == "Nuevo titulo"
+
+
+def test_public_gallery_past_last_page_keeps_total(client, test_gallery_image):
+    data = client.get("/api/gallery?offset=10").json()
+    assert data["images"] == []
+    assert data["total"] == 1
+
+
+def test_public_gallery_sparse_fields(client, test_gallery_image):
+    data = client.get("/api/gallery?fields=thumbnail_url,titulo").json()
+    assert data["total"] == 1
+    assert data["images"] == [{
+        "id": str(test_gallery_image.id),
+        "titulo": test_gallery_image.titulo,
+        "thumbnail_url": test_gallery_image.thumbnail_url,
+    }]
+    # Each fieldset is cached as its own page
+    assert set(client.get("/api/gallery").json()["images"][0]) == {
+        "id", "titulo", "descripcion", "fecha", "tags", "image_url", "thumbnail_url",
+    }
+
+    assert client.get("/api/gallery?fields=created_by").status_code == 400
+
+
+def _upcoming_event_payload(**overrides):
+    payload = {
+        "nombre": "Concierto de Navidad",
+        "fecha": (date.today() + timedelta(days=7)).isoformat(),
+        "hora": "20:00",
+        "lugar": "Catedral",
+        "tipo": "concierto",
+        "estado": "planificado",
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_events_feed_follows_admin_writes(client, auth_headers):
+    created = client.post("/api/admin/events", json=_upcoming_event_payload(), headers=auth_headers)
+    assert created.status_code == 201
+    event_id = created.json()["id"]
+    soon = client.post(
+        "/api/admin/events",
+        json=_upcoming_event_payload(nombre="Misa", fecha=date.today().isoformat(), hora="9:00"),
+        headers=auth_headers,
+    )
+    assert [e["nombre"] for e in client.get("/api/events").json()] == ["Misa", "Concierto de Navidad"]
+    assert client.get("/api/admin/dashboard/stats", headers=auth_headers).json()["upcomingEvents"] == 2
+
+    client.put(f"/api/admin/events/{event_id}", json={"estado": "cancelado"}, headers=auth_headers)
+    assert [e["nombre"] for e in client.get("/api/events").json()] == ["Misa"]
+    assert [e["id"] for e in client.get("/api/events?estado=cancelado").json()] == [event_id]
+
+    client.delete(f"/api/admin/events/{soon.json()['id']}", headers=auth_headers)
+    assert client.get("/api/events").json() == []
+    assert client.get("/api/admin/dashboard/stats", headers=auth_headers).json()["upcomingEvents"] == 0
+
+
+def test_events_feed_rolls_over_at_midnight(db_session, admin_user, monkeypatch):
+    from app.services import events_feed_service as feed_module
+
+    db_session.add(EventoPublico(**_upcoming_event_payload(fecha=date.today()), created_by=admin_user.id))
+    db_session.add(EventoPublico(
+        **_upcoming_event_payload(nombre="Mañana", fecha=date.today() + timedelta(days=1)),
+        created_by=admin_user.id,
+    ))
+    db_session.commit()
+    feed = feed_module.EventsFeedService(refresh_seconds=3600)
+    assert len(feed.list_events(db_session)) == 2
+
+    tomorrow = date.today() + timedelta(days=1)
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return tomorrow
+
+    monkeypatch.setattr(feed_module, "date", Tomorrow)
+    # Rolled over in memory: no session needed
+    assert [e.nombre for e in feed.list_events(None)] == ["Mañana"]
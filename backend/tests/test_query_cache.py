@@ -0,0 +1,111 @@
+"""
+Tests for the query result cache
+"""
+
+from sqlalchemy import func, select, update
+
+from app.models import Role
+from app.utils.query_cache import QueryCache, statement_tables
+from tests.conftest import TestingSessionLocal
+
+CORISTA = select(Role).where(Role.nombre == "corista")
+
+
+def _add_role(db, nombre="corista", descripcion="Rol corista"):
+    role = Role(nombre=nombre, descripcion=descripcion)
+    db.add(role)
+    db.commit()
+    return role
+
+
+class TestQueryCache:
+    """Tests for QueryCache."""
+
+    def test_hit_merges_into_each_session(self, db_session, enable_query_cache):
+        role = _add_role(db_session)
+        first = enable_query_cache.execute(db_session, CORISTA).scalars().first()
+        assert first is role
+
+        other = TestingSessionLocal()
+        try:
+            cached = enable_query_cache.execute(other, CORISTA).scalars().first()
+            assert cached is not role
+            assert cached in other
+            assert cached.id == role.id
+        finally:
+            other.close()
+        assert (enable_query_cache.hits, enable_query_cache.misses) == (1, 1)
+
+    def test_parameters_are_part_of_the_key(self, db_session, enable_query_cache):
+        _add_role(db_session)
+        _add_role(db_session, nombre="admin")
+        admin = select(Role).where(Role.nombre == "admin")
+        assert enable_query_cache.execute(db_session, CORISTA).scalars().one().nombre == "corista"
+        assert enable_query_cache.execute(db_session, admin).scalars().one().nombre == "admin"
+        assert enable_query_cache.misses == 2
+
+    def test_commit_invalidates_tables_written(self, db_session, enable_query_cache):
+        count = select(func.count(Role.id))
+        assert enable_query_cache.execute(db_session, count).scalar() == 0
+        _add_role(db_session)
+        assert enable_query_cache.execute(db_session, count).scalar() == 1
+        assert enable_query_cache.hits == 0
+
+    def test_bulk_update_invalidates(self, db_session, enable_query_cache):
+        _add_role(db_session)
+        enable_query_cache.execute(db_session, CORISTA)
+        db_session.execute(update(Role).values(descripcion="Coro"))
+        db_session.commit()
+        db_session.expire_all()
+        role = enable_query_cache.execute(db_session, CORISTA).scalars().one()
+        assert role.descripcion == "Coro"
+        assert enable_query_cache.hits == 0
+
+    def test_own_uncommitted_writes_bypass_cache(self, db_session, enable_query_cache):
+        count = select(func.count(Role.id))
+        assert enable_query_cache.execute(db_session, count).scalar() == 0
+        db_session.add(Role(nombre="corista"))
+        db_session.flush()
+        assert enable_query_cache.execute(db_session, count).scalar() == 1
+        db_session.rollback()
+        assert enable_query_cache.execute(db_session, count).scalar() == 0
+        assert enable_query_cache.hits == 1
+
+    def test_per_query_ttl(self, db_session, enable_query_cache, monkeypatch):
+        _add_role(db_session)
+        now = [1000.0]
+        monkeypatch.setattr("app.utils.query_cache.time.monotonic", lambda: now[0])
+        enable_query_cache.execute(db_session, CORISTA, ttl=5)
+        now[0] += 4
+        enable_query_cache.execute(db_session, CORISTA, ttl=5)
+        now[0] += 2
+        enable_query_cache.execute(db_session, CORISTA, ttl=5)
+        assert (enable_query_cache.hits, enable_query_cache.misses) == (1, 2)
+
+    def test_lru_bound(self, db_session):
+        cache = QueryCache(maxsize=1, default_ttl_seconds=60)
+        _add_role(db_session)
+        cache.execute(db_session, CORISTA)
+        cache.execute(db_session, select(func.count(Role.id)))
+        assert len(cache) == 1
+
+    def test_disabled_passes_through(self, db_session):
+        cache = QueryCache(maxsize=10, default_ttl_seconds=60, enabled=False)
+        _add_role(db_session)
+        assert cache.execute(db_session, CORISTA).scalars().one().nombre == "corista"
+        assert len(cache) == 0 and cache.misses == 0
+
+    def test_statement_tables(self):
+        assert statement_tables(CORISTA) == {"roles"}
+
+
+def test_register_uses_cached_role(client, db_session, enable_query_cache):
+    _add_role(db_session)
+    for i in range(2):
+        response = client.post("/api/auth/register", json={
+            "email": f"cached{i}@test.com",
+            "password": "password123",
+            "nombre": "Cached",
+        })
+        assert response.status_code in (200, 201)
+    assert enable_query_cache.hits >= 1
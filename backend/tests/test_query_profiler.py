@@ -0,0 +1,91 @@
+"""
+Tests for the per-request query profiler
+"""
+
+import re
+from datetime import date
+
+from app.models import Ensayo
+from app.utils import query_profiler
+from app.utils.query_profiler import (
+    QueryProfile,
+    QueryRecord,
+    _current_profile,
+    install_query_profiler,
+)
+from tests.conftest import engine
+
+
+class TestQueryProfile:
+    """Tests for the QueryProfile aggregation helpers."""
+
+    def test_repeated_statements_flagged(self):
+        profile = QueryProfile(path="/api/admin/members")
+        for _ in range(6):
+            profile.queries.append(QueryRecord("SELECT * FROM users WHERE id = ?", 1.0, None))
+        profile.queries.append(QueryRecord("SELECT count(*) FROM miembros", 2.0, None))
+
+        repeated = profile.repeated_statements(threshold=5)
+        assert repeated == {"SELECT * FROM users WHERE id = ?": 6}
+        assert profile.count == 7
+        assert profile.total_ms == 8.0
+
+    def test_server_timing_header(self):
+        profile = QueryProfile(queries=[QueryRecord("SELECT 1", 1.5, None)])
+        assert profile.server_timing() == 'db;dur=1.50;desc="1 queries"'
+
+    def test_slow_queries(self):
+        profile = QueryProfile(queries=[
+            QueryRecord("SELECT 1", 10.0, None),
+            QueryRecord("SELECT 2", 500.0, None),
+        ])
+        assert [q.statement for q in profile.slow_queries(threshold_ms=100)] == ["SELECT 2"]
+
+
+class TestQueryProfilerHooks:
+    """Tests for the engine hooks and the middleware."""
+
+    def test_records_statements_with_call_site(self, db_session):
+        install_query_profiler(engine)
+        profile = QueryProfile(path="test")
+        token = _current_profile.set(profile)
+        try:
+            db_session.query(Ensayo).filter(Ensayo.fecha >= date.today()).all()
+        finally:
+            _current_profile.reset(token)
+
+        assert profile.count == 1
+        assert "FROM ensayos" in profile.queries[0].statement
+
+    def test_no_recording_without_profile(self, db_session, monkeypatch):
+        install_query_profiler(engine)
+
+        def fail():
+            raise AssertionError("statement recorded outside a profile")
+
+        monkeypatch.setattr(query_profiler, "_find_call_site", fail)
+        assert _current_profile.get() is None
+        db_session.query(Ensayo).all()
+        assert not db_session.connection().info.get("armentum_query_start")
+        assert _current_profile.get() is None
+
+    def test_server_timing_header_on_request(self, client, auth_headers, monkeypatch):
+        install_query_profiler(engine)
+        reported = []
+        monkeypatch.setattr(query_profiler, "_report", reported.append)
+        response = client.get("/api/admin/members", headers={**auth_headers, "X-Query-Profile": "1"})
+        assert response.status_code == 200
+
+        timing = re.match(r'db;dur=[0-9.]+;desc="(\d+) queries"', response.headers["server-timing"])
+        assert timing is not None
+        (profile,) = reported
+        assert int(timing.group(1)) == profile.count > 0
+        assert any(
+            q.call_site.startswith("app/routers/admin.py:") and q.call_site.endswith(" in list_members")
+            for q in profile.queries
+            if q.call_site
+        )
+
+    def test_no_header_without_opt_in(self, client):
+        response = client.get("/api/events")
+        assert "server-timing" not in response.headers
@@ -0,0 +1,70 @@
+"""
+Tests for the orjson response class and its pydantic fast path
+"""
+
+import json
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from app.schemas import AdminMemberResponse, CuotaResponse, Message
+from app.utils.responses import FastJSONResponse, dumps
+
+
+def _cuota() -> CuotaResponse:
+    return CuotaResponse(
+        id=uuid.uuid4(),
+        miembro_id=uuid.uuid4(),
+        monto=Decimal("12.50"),
+        tipo="regular",
+        fecha_vencimiento=date(2024, 5, 1),
+        estado="pendiente",
+        created_at=datetime(2024, 4, 1, 10, 30, 0, 123456),
+    )
+
+
+class TestDumps:
+    """dumps matches pydantic's JSON output without re-validating."""
+
+    def test_model(self):
+        cuota = _cuota()
+        assert dumps(cuota) == cuota.model_dump_json().encode()
+
+    def test_list_of_models(self):
+        cuotas = [_cuota(), _cuota()]
+        assert json.loads(dumps(cuotas)) == [json.loads(cuota.model_dump_json()) for cuota in cuotas]
+
+    def test_mixed_list_and_nested_models(self):
+        payload = {"items": [_cuota(), Message(message="ok")], "empty": []}
+        data = json.loads(dumps(payload))
+        assert data["items"][1] == {"message": "ok"}
+        assert data["items"][0]["monto"] == 12.5
+        assert data["empty"] == []
+
+    def test_native_values_match_hand_stringified(self):
+        value_id = uuid.uuid4()
+        created = datetime(2024, 4, 1, 10, 30, 0, 5)
+        payload = {"id": value_id, "fecha": date(2024, 5, 1), "created_at": created, "pago": None}
+        assert json.loads(dumps(payload)) == {
+            "id": str(value_id),
+            "fecha": "2024-05-01",
+            "created_at": created.isoformat(),
+            "pago": None,
+        }
+
+    def test_decimal_and_utc_like_pydantic(self):
+        member = AdminMemberResponse(
+            id=uuid.uuid4(), nombre="Ana", email="ana@example.com", voz="alto", estado="activo",
+            fecha_ingreso=date(2024, 1, 1), telefono=None, saldo_actual=Decimal("3.10"),
+        )
+        aware = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        data = json.loads(dumps({"saldo": Decimal("3.10"), "at": aware, "member": member}))
+        assert data["saldo"] == "3.10"
+        assert data["at"] == "2024-01-01T00:00:00Z"
+        assert data["member"] == json.loads(member.model_dump_json())
+
+    def test_response_body(self):
+        response = FastJSONResponse([Message(message="ok")], status_code=201)
+        assert response.status_code == 201
+        assert response.body == b'[{"message":"ok"}]'
+        assert response.headers["content-type"] == "application/json"
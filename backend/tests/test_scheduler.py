@@ -0,0 +1,116 @@
+"""
+Tests for the daily job scheduler and the overdue-cuota transition
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.auth.jwt import get_password_hash
+from app.models import Cuota, Miembro, MovimientoSaldo, User
+from app.services.dues_service import dues_service
+from app.services.ledger_service import CuotaTransition, ledger_service
+from app.utils.scheduler import DailyJob, run_locked, try_leader_lock
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def member_with_dues(db_session):
+    """A member with one overdue, one current and one paid cuota recorded in the ledger."""
+    user = User(
+        email="overdue@example.com",
+        password_hash=get_password_hash("password123"),
+        nombre="Overdue",
+    )
+    db_session.add(user)
+    db_session.flush()
+    member = Miembro(user_id=user.id, voz="Alto", fecha_ingreso=date.today())
+    db_session.add(member)
+    db_session.flush()
+
+    today = date.today()
+    cuotas = [
+        Cuota(miembro_id=member.id, monto=Decimal("10.00"), fecha_vencimiento=today - timedelta(days=1), created_by=user.id),
+        Cuota(miembro_id=member.id, monto=Decimal("20.00"), fecha_vencimiento=today, created_by=user.id),
+        Cuota(miembro_id=member.id, monto=Decimal("40.00"), fecha_vencimiento=today - timedelta(days=5),
+              estado="pagada", fecha_pago=today, created_by=user.id),
+    ]
+    db_session.add_all(cuotas)
+    db_session.flush()
+    ledger_service.record_transitions(db_session, [
+        CuotaTransition(c.id, member.id, c.monto, None, c.estado) for c in cuotas
+    ])
+    db_session.commit()
+    return member
+
+
+class TestOverdueTransition:
+    """Tests for dues_service.mark_overdue"""
+
+    def test_marks_only_past_due_pendientes(self, db_session, member_with_dues):
+        """Only pendiente cuotas with a past due date become vencida."""
+        assert dues_service.mark_overdue(db_session) == 1
+        db_session.commit()
+
+        estados = sorted(
+            (c.monto, c.estado) for c in db_session.query(Cuota).filter(Cuota.miembro_id == member_with_dues.id)
+        )
+        assert estados == [
+            (Decimal("10.00"), "vencida"),
+            (Decimal("20.00"), "pendiente"),
+            (Decimal("40.00"), "pagada"),
+        ]
+
+    def test_updates_ledger_and_is_idempotent(self, db_session, member_with_dues):
+        """The transition moves totals to vencido once and leaves the balance unchanged."""
+        dues_service.mark_overdue(db_session)
+        db_session.commit()
+        assert dues_service.mark_overdue(db_session) == 0
+        db_session.commit()
+
+        assert ledger_service.get_summary(db_session, member_with_dues.id) == {
+            "totalIngresos": 40.0,
+            "totalPendiente": 20.0,
+            "totalVencido": 10.0,
+        }
+        db_session.expire_all()
+        assert db_session.get(Miembro, member_with_dues.id).saldo_actual == Decimal("30.00")
+        assert db_session.query(MovimientoSaldo).filter(MovimientoSaldo.tipo == "vencimiento").count() == 1
+        assert ledger_service.reconcile(db_session) == []
+
+
+class TestScheduler:
+    """Tests for the leader lock and daily job timing"""
+
+    def test_leader_lock_granted_without_postgres(self, db_session):
+        """SQLite has no advisory locks, every run is the leader."""
+        assert try_leader_lock(db_session, "overdue-cuotas") is True
+
+    def test_run_locked_commits(self, db_session, member_with_dues):
+        """run_locked runs the job in its own committed transaction."""
+        assert run_locked("overdue-cuotas", dues_service.mark_overdue, session_factory=TestingSessionLocal) == 1
+        db_session.expire_all()
+        assert db_session.query(Cuota).filter(Cuota.estado == "vencida").count() == 1
+
+    def test_seconds_until_next_run(self):
+        """The next run is later today before the hour, tomorrow after it."""
+        job = DailyJob("test", lambda: None, hour_utc=3)
+        assert job.seconds_until_next_run(datetime(2026, 1, 1, 1, 0)) == 2 * 3600
+        assert job.seconds_until_next_run(datetime(2026, 1, 1, 3, 0)) == 24 * 3600
+        assert job.seconds_until_next_run(datetime(2026, 1, 1, 4, 30)) == 22.5 * 3600
+
+    def test_run_once_records_result_and_swallows_errors(self):
+        """A failing job is logged and does not stop the scheduler."""
+        job = DailyJob("ok", lambda: 3, hour_utc=3)
+        asyncio.run(job.run_once())
+        assert job.last_result == 3
+        assert job.last_run_at is not None
+
+        def fail():
+            raise RuntimeError("boom")
+
+        failing = DailyJob("fail", fail, hour_utc=3)
+        asyncio.run(failing.run_once())
+        assert failing.last_run_at is None
@@ -0,0 +1,194 @@
+"""
+Tests for the host-local shared cache
+"""
+
+import asyncio
+import multiprocessing
+from types import SimpleNamespace
+
+from app.auth.throttle import SlidingWindowCounter, login_throttle
+from app.services.public_gallery_service import GENERATION_KEY, public_gallery_service
+from app.services.storage_service import StorageService
+from app.utils import shared_cache as shared_cache_module
+from app.utils.shared_cache import SharedCache, shared_limits
+
+
+def _cache(tmp_path, **overrides) -> SharedCache:
+    options = {"max_bytes": 1 << 20, "max_entries": 100, **overrides}
+    return SharedCache(path=str(tmp_path / "cache.sqlite3"), **options)
+
+
+def _increment(path: str, times: int) -> None:
+    cache = SharedCache(path=path, max_bytes=1 << 20, max_entries=100)
+    for _ in range(times):
+        cache.update("counter", lambda value: str(int(value or 0) + 1).encode(), 60)
+
+
+class TestSharedCache:
+    """Tests for SharedCache."""
+
+    def test_get_set_delete(self, tmp_path):
+        cache = _cache(tmp_path)
+        assert cache.get("a") is None
+        cache.set("a", b"1", 60)
+        assert cache.get("a") == b"1"
+        cache.delete("a")
+        assert cache.get("a") is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_ttl(self, tmp_path, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(shared_cache_module.time, "time", lambda: now[0])
+        cache = _cache(tmp_path)
+        cache.set("a", b"1", 10)
+        now[0] += 9
+        assert cache.get("a") == b"1"
+        now[0] += 2
+        assert cache.get("a") is None
+        assert cache.add("a", b"2", 10) == b"2"
+
+    def test_workers_share_entries(self, tmp_path):
+        first, second = _cache(tmp_path), _cache(tmp_path)
+        calls = []
+        assert first.get_or_set("page", lambda: calls.append(1) or b"body", 60) == b"body"
+        assert second.get_or_set("page", lambda: calls.append(1) or b"other", 60) == b"body"
+        assert calls == [1]
+
+    def test_add_keeps_first_value(self, tmp_path):
+        cache = _cache(tmp_path)
+        assert cache.add("url", b"first", 60) == b"first"
+        assert cache.add("url", b"second", 60) == b"first"
+
+    def test_update_is_atomic_across_processes(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        _cache(tmp_path).set("counter", b"0", 60)
+        context = multiprocessing.get_context("spawn")  # as uvicorn starts its workers
+        workers = [context.Process(target=_increment, args=(path, 50)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+        assert _cache(tmp_path).get("counter") == b"200"
+
+    def test_lru_eviction_by_entries(self, tmp_path, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(shared_cache_module.time, "time", lambda: now[0])
+        cache = _cache(tmp_path, max_entries=2)
+        for key in ("a", "b"):
+            cache.set(key, b"x", 60)
+            now[0] += 5
+        assert cache.get("a") == b"x"  # now more recent than b
+        cache.set("c", b"x", 60)
+        assert cache.get("b") is None
+        assert cache.get("a") == b"x" and cache.get("c") == b"x"
+        assert cache.stats()["entries"] == 2
+
+    def test_eviction_by_bytes(self, tmp_path):
+        cache = _cache(tmp_path, max_bytes=1000)
+        for index in range(5):
+            cache.set(f"k{index}", b"x" * 300, 60)
+        stats = cache.stats()
+        assert stats["bytes"] <= 1000
+        assert cache.get("k4") is not None
+        assert stats["evictions"] >= 2
+
+    def test_clear_prefix(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.set("gallery:1", b"x", 60)
+        cache.set("login-ip:1", b"x", 60)
+        cache.clear("gallery:")
+        assert cache.get("gallery:1") is None
+        assert cache.get("login-ip:1") == b"x"
+
+    def test_store_without_live_eviction(self, tmp_path, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(shared_cache_module.time, "time", lambda: now[0])
+        store = _cache(tmp_path, max_entries=2, evict_live=False)
+        store.set("login-email:a", b"1", 10)
+        store.set("login-email:b", b"1", 60)
+        store.set("gallery:flood", b"1", 60)
+        assert store.get("gallery:flood") is None
+        assert store.get("login-email:a") == b"1" and store.get("login-email:b") == b"1"
+        store.set("login-email:a", b"2", 10)  # existing keys can still be updated
+        assert store.get("login-email:a") == b"2"
+        assert store.stats()["rejected"] == 1
+
+        now[0] += 11  # a expired: its slot is reused
+        store.set("login-email:c", b"1", 60)
+        assert store.get("login-email:c") == b"1"
+        assert store.get("login-email:b") == b"1"
+
+    def test_disabled(self, tmp_path):
+        cache = _cache(tmp_path, enabled=False)
+        cache.set("a", b"1", 60)
+        assert cache.get("a") is None
+        assert cache.add("a", b"2", 60) == b"2"
+        assert not (tmp_path / "cache.sqlite3").exists()
+
+
+class TestSharedUsers:
+    """Callers backed by the shared cache."""
+
+    def test_throttle_limit_holds_across_workers(self, tmp_path):
+        store = _cache(tmp_path)
+        workers = [SlidingWindowCounter(3, 60, store=store, namespace="ip:") for _ in range(2)]
+        workers[0].hit("1.2.3.4")
+        workers[1].hit("1.2.3.4")
+        assert workers[0].retry_after("1.2.3.4") is None
+        workers[1].hit("1.2.3.4")
+        assert workers[0].retry_after("1.2.3.4") > 0
+        workers[1].reset("1.2.3.4")
+        assert workers[0].retry_after("1.2.3.4") is None
+
+    def test_login_throttle_uses_limits_store(self):
+        assert login_throttle.by_ip.store is shared_limits
+        assert login_throttle.by_email.store is shared_limits
+        assert shared_limits.evict_live is False
+
+    def test_signed_url_reused(self, enable_shared_cache):
+        calls = []
+
+        def create_signed_url(path, expires_in):
+            calls.append(path)
+            return {"signedURL": f"https://storage/{path}?token={len(calls)}"}
+
+        bucket = SimpleNamespace(create_signed_url=create_signed_url)
+        workers = [StorageService() for _ in range(2)]
+        for service in workers:
+            service._client = SimpleNamespace(storage=SimpleNamespace(from_=lambda name: bucket))
+
+        urls = [asyncio.run(service.get_signed_url("images", "a.jpg")) for service in workers]
+        assert urls == ["https://storage/a.jpg?token=1"] * 2
+        assert calls == ["a.jpg"]
+        asyncio.run(workers[0].get_signed_url("images", "a.jpg", expires_in=30))
+        assert len(calls) == 2  # too short-lived to cache
+
+    def test_gallery_page_rendered_once_per_host(self, client, test_gallery_image, enable_shared_cache, monkeypatch):
+        renders = []
+        render = public_gallery_service._render
+        monkeypatch.setattr(public_gallery_service, "_render", lambda db, key: renders.append(key) or render(db, key))
+
+        first = client.get("/api/gallery").json()
+        public_gallery_service.pages.clear()  # another worker: empty local cache
+        assert client.get("/api/gallery").json() == first
+        assert len(renders) == 1
+
+        public_gallery_service.invalidate()
+        client.get("/api/gallery")
+        assert len(renders) == 2
+
+    def test_gallery_invalidation_is_memory_only(self, client, test_gallery_image, enable_shared_cache, monkeypatch):
+        renders = []
+        render = public_gallery_service._render
+        monkeypatch.setattr(public_gallery_service, "_render", lambda db, key: renders.append(key) or render(db, key))
+        client.get("/api/gallery")
+
+        writes = []
+        set_entry = enable_shared_cache.set
+        monkeypatch.setattr(enable_shared_cache, "set", lambda *args: writes.append(args[0]) or set_entry(*args))
+        public_gallery_service.invalidate()  # as delivered by the invalidation bus
+        assert writes == []
+
+        client.get("/api/gallery")  # the token is rotated on the next load
+        assert writes == [GENERATION_KEY]
+        assert len(renders) == 2
@@ -0,0 +1,98 @@
+"""
+Tests for single-flight coalescing of public reads
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.exceptions import ServiceBusyError
+from app.utils.single_flight import SingleFlight
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def _run_concurrently(flight: SingleFlight, key, compute, callers: int):
+    """Start one leader and ``callers - 1`` waiters; return their futures."""
+    pool = ThreadPoolExecutor(max_workers=callers)
+    futures = [pool.submit(flight.do, key, compute)]
+    _wait_for(lambda: flight.stats()["in_flight"] == 1)
+    futures += [pool.submit(flight.do, key, compute) for _ in range(callers - 1)]
+    _wait_for(lambda: flight.stats()["coalesced"] == callers - 1)
+    pool.shutdown(wait=False)
+    return futures
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    def test_concurrent_callers_share_one_computation(self):
+        flight = SingleFlight(timeout_seconds=5)
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return ["page"]
+
+        futures = _run_concurrently(flight, "gallery", compute, callers=8)
+        release.set()
+        results = [future.result(timeout=5) for future in futures]
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 7, "timeouts": 0}
+
+    def test_error_reaches_every_waiter(self):
+        flight = SingleFlight(timeout_seconds=5)
+        release = threading.Event()
+
+        def compute():
+            release.wait(5)
+            raise RuntimeError("database down")
+
+        futures = _run_concurrently(flight, "events", compute, callers=4)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="database down"):
+                future.result(timeout=5)
+
+        # The failed flight is not remembered
+        assert flight.do("events", lambda: "ok") == "ok"
+
+    def test_waiter_times_out(self):
+        flight = SingleFlight(timeout_seconds=0.05)
+        release = threading.Event()
+        futures = _run_concurrently(flight, "news", lambda: release.wait(5) and "late", callers=2)
+
+        with pytest.raises(ServiceBusyError):
+            futures[1].result(timeout=5)
+        release.set()
+        assert futures[0].result(timeout=5) == "late"
+        assert flight.stats()["timeouts"] == 1
+
+    def test_sequential_calls_recompute(self):
+        flight = SingleFlight(timeout_seconds=5)
+        values = iter([1, 2])
+        assert flight.do("k", lambda: next(values)) == 1
+        assert flight.do("k", lambda: next(values)) == 2
+
+    def test_keys_do_not_share(self):
+        flight = SingleFlight(timeout_seconds=5)
+        release = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=1)
+        blocked = pool.submit(flight.do, "a", lambda: release.wait(5) and "a")
+        _wait_for(lambda: flight.stats()["in_flight"] == 1)
+
+        assert flight.do("b", lambda: "b") == "b"
+        release.set()
+        assert blocked.result(timeout=5) == "a"
+        pool.shutdown()
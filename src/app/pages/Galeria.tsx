@@ -1,12 +1,12 @@
 import { useState, useMemo } from "react";
 import { X, ZoomIn } from "lucide-react";
 import { useGallery } from "../../hooks/useGallery";
-import type { GalleryImage } from "../../types";
+import type { PublicGalleryImage } from "../../types";
 
 export function Galeria(): JSX.Element {
   const { images, isLoading, filterByTags } = useGallery(true);
   const [selectedTags, setSelectedTags] = useState<string[]>([]);
-  const [lightboxImage, setLightboxImage] = useState<GalleryImage | null>(null);
+  const [lightboxImage, setLightboxImage] = useState<PublicGalleryImage | null>(null);
 
   // Extract unique tags from all images
   const availableTags = useMemo(() => {
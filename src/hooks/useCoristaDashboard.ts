@@ -1,14 +1,21 @@
 import { useState, useEffect } from "react";
 import { apiGet } from "../services/api";
-import type { Rehearsal } from "../types";
+import type { FinanceSummary, Rehearsal } from "../types";
 
 interface AttendanceStats {
-  total: number;
-  presentes: number;
-  ausentes: number;
+  total_ensayos: number;
+  asistencias: number;
+  inasistencias: number;
   porcentaje: number;
 }
 
+interface MemberHome {
+  perfil: Record<string, unknown>;
+  proximos_ensayos: Rehearsal[];
+  asistencia: AttendanceStats;
+  finanzas: FinanceSummary;
+}
+
 interface UseCoristaDashboardReturn {
   nextRehearsal: Rehearsal | null;
   upcomingRehearsals: Rehearsal[];
@@ -30,17 +37,12 @@ export function useCoristaDashboard(): UseCoristaDashboardReturn {
       setError(null);
 
       try {
-        // Fetch rehearsals
-        const rehearsalsResponse = await apiGet<Rehearsal[]>("/rehearsals?limit=5");
-        if (rehearsalsResponse.data) {
-          setUpcomingRehearsals(rehearsalsResponse.data);
-          setNextRehearsal(rehearsalsResponse.data[0] || null);
-        }
-
-        // Fetch attendance stats
-        const statsResponse = await apiGet<AttendanceStats>("/attendance/me/stats");
-        if (statsResponse.data) {
-          setAttendanceStats(statsResponse.data);
+        // Profile, rehearsals, stats and finance in one request
+        const homeResponse = await apiGet<MemberHome>("/members/me/home?ensayos=5");
+        if (homeResponse.data) {
+          setUpcomingRehearsals(homeResponse.data.proximos_ensayos);
+          setNextRehearsal(homeResponse.data.proximos_ensayos[0] || null);
+          setAttendanceStats(homeResponse.data.asistencia);
         }
       } catch (err) {
         setError(err instanceof Error ? err.message : "Error al cargar datos");
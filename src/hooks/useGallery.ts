@@ -1,10 +1,10 @@
 import { useState, useCallback, useEffect } from "react";
 import * as galleryService from "../services/gallery";
-import type { GalleryImage } from "../types";
+import type { PublicGalleryImage } from "../types";
 import { toast } from "sonner";
 
 interface UseGalleryState {
-  images: GalleryImage[];
+  images: PublicGalleryImage[];
   total: number;
   isLoading: boolean;
   error: string | null;
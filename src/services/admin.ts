@@ -1,10 +1,12 @@
 import { apiCall } from "./api";
 import type {
   MemberProfile,
+  MemberField,
   Event,
   Rehearsal,
   Attendance,
   Cuota,
+  CuotaField,
   FinanceHistory,
   ApiResponse,
 } from "../types";
@@ -15,13 +17,15 @@ export async function getAllMembers(
   search?: string,
   status?: string,
   page = 1,
-  limit = 10
+  limit = 10,
+  fields?: MemberField[]
 ): Promise<ApiResponse<{ members: MemberProfile[]; total: number }>> {
   const params = new URLSearchParams();
   if (search) params.append("search", search);
   if (status) params.append("status", status);
   params.append("page", page.toString());
   params.append("limit", limit.toString());
+  if (fields && fields.length > 0) params.append("fields", fields.join(","));
 
   return apiCall<{ members: MemberProfile[]; total: number }>(
     `/admin/members?${params.toString()}`
@@ -152,13 +156,15 @@ export async function getAllCuotas(
   status?: string,
   memberId?: string,
   page = 1,
-  limit = 10
+  limit = 10,
+  fields?: CuotaField[]
 ): Promise<ApiResponse<{ cuotas: Cuota[]; total: number }>> {
   const params = new URLSearchParams();
   if (status) params.append("status", status);
   if (memberId) params.append("memberId", memberId);
   params.append("page", page.toString());
   params.append("limit", limit.toString());
+  if (fields && fields.length > 0) params.append("fields", fields.join(","));
 
   return apiCall<{ cuotas: Cuota[]; total: number }>(`/admin/finance/cuotas?${params.toString()}`);
 }
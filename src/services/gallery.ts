@@ -7,6 +7,8 @@ import type {
   GalleryImage,
   GalleryImageListResponse,
   GalleryImageUpdate,
+  PublicGalleryImage,
+  PublicGalleryListResponse,
   ApiResponse,
 } from "../types";
 
@@ -205,8 +207,9 @@ export async function getAllGalleryTags(): Promise<ApiResponse<string[]>> {
  */
 export async function getPublicGallery(
   tags?: string[],
-  limit: number = 100
-): Promise<ApiResponse<GalleryImageListResponse>> {
+  limit: number = 100,
+  fields?: (keyof PublicGalleryImage)[]
+): Promise<ApiResponse<PublicGalleryListResponse>> {
   const params = new URLSearchParams();
   params.append("limit", limit.toString());
 
@@ -214,6 +217,11 @@ export async function getPublicGallery(
     params.append("tags", tags.join(","));
   }
 
+  // Sparse fieldset: only these image fields (plus id) are returned
+  if (fields && fields.length > 0) {
+    params.append("fields", fields.join(","));
+  }
+
   const response = await fetch(`${API_BASE_URL}/gallery?${params.toString()}`, {
     method: "GET",
   });
@@ -142,6 +142,21 @@ export interface Cuota {
   updatedAt?: string;
 }
 
+// Fields accepted by ?fields= on /admin/finance/cuotas (backend CUOTA_FIELDS)
+export type CuotaField =
+  | "id"
+  | "userId"
+  | "miembro_id"
+  | "miembro_nombre"
+  | "monto"
+  | "descripcion"
+  | "tipo"
+  | "vencimiento"
+  | "fecha_vencimiento"
+  | "estado"
+  | "fecha_pago"
+  | "created_at";
+
 export interface FinanceHistory {
   id: string;
   miembro_id: string;
@@ -186,6 +201,17 @@ export interface MemberProfile extends User {
   saldo_actual?: number;
 }
 
+// Fields accepted by ?fields= on /admin/members (backend MEMBER_FIELDS)
+export type MemberField =
+  | "id"
+  | "nombre"
+  | "email"
+  | "voz"
+  | "estado"
+  | "fecha_ingreso"
+  | "telefono"
+  | "saldo_actual";
+
 // ============ Gallery Types ============
 
 export interface GalleryImage {
@@ -222,3 +248,13 @@ export interface GalleryImageListResponse {
   offset: number;
   images: GalleryImage[];
 }
+
+// Public gallery omits the audit columns
+export type PublicGalleryImage = Omit<GalleryImage, "created_by" | "created_at" | "updated_at">;
+
+export interface PublicGalleryListResponse {
+  total: number;
+  limit: number;
+  offset: number;
+  images: PublicGalleryImage[];
+}